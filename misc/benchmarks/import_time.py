@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the startup time of ObsPy.
+
+Every measurement runs in a fresh interpreter and reports the time needed to
+``import obspy`` (and to read a first file), the number of imported plug-in
+modules and whether :mod:`pkg_resources` had to be imported. The entry point
+cache is either removed before each run (cold) or kept (warm).
+
+Usage::
+
+    python import_time.py [-n REPEAT] [FILE]
+
+:copyright:
+    The ObsPy Development Team (devs@obspy.org)
+:license:
+    GNU Lesser General Public License, Version 3
+    (http://www.gnu.org/copyleft/lesser.html)
+"""
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from future.builtins import *  # NOQA
+
+from argparse import ArgumentParser
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+
+CHILD = """
+import json, sys, time
+t = time.time()
+import obspy
+t_import = time.time() - t
+if %(filename)r:
+    obspy.read(%(filename)r)
+t_total = time.time() - t
+modules = set(name.split('.')[1] for name in sys.modules
+              if name.startswith('obspy.') and name.count('.') > 1)
+print(json.dumps([t_import, t_total, len(modules),
+                  'pkg_resources' in sys.modules]))
+"""
+
+
+def run(filename, cache_file, cold):
+    if cold and os.path.exists(cache_file):
+        os.remove(cache_file)
+    env = dict(os.environ, OBSPY_ENTRY_POINT_CACHE=cache_file)
+    code = CHILD % {'filename': filename or ''}
+    output = subprocess.check_output([sys.executable, '-c', code], env=env)
+    return json.loads(output.decode().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('-n', '--repeat', type=int, default=10,
+                        help='number of interpreters started per scenario')
+    parser.add_argument('filename', nargs='?',
+                        help='file read after importing obspy')
+    args = parser.parse_args(argv)
+
+    directory = tempfile.mkdtemp()
+    cache_file = os.path.join(directory, 'entry_points.json')
+    try:
+        print("%-12s %10s %10s %8s %14s" % (
+            'cache', 'import [s]', 'total [s]', 'modules', 'pkg_resources'))
+        for label, cold in (('cold', True), ('warm', False)):
+            # populate the cache for the warm runs
+            run(None, cache_file, cold)
+            results = [run(args.filename, cache_file, cold)
+                       for _i in range(args.repeat)]
+            t_import = min(r[0] for r in results)
+            t_total = min(r[1] for r in results)
+            print("%-12s %10.3f %10.3f %8d %14s" % (
+                label, t_import, t_total, results[-1][2], results[-1][3]))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark of parsing ISO8601 date time strings with UTCDateTime.
+
+All date time strings of the given StationXML/QuakeML documents (by default
+the ones shipped with the ObsPy test suite) are parsed with the legacy
+parser and the fast parser with a cold and a warm cache. Additionally the
+time to read the complete documents is measured with and without the fast
+parser.
+
+Usage::
+
+    python iso8601_parsing.py [-n REPEAT] [FILE [FILE ...]]
+
+:copyright:
+    The ObsPy Development Team (devs@obspy.org)
+:license:
+    GNU Lesser General Public License, Version 3
+    (http://www.gnu.org/copyleft/lesser.html)
+"""
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from future.builtins import *  # NOQA
+
+from argparse import ArgumentParser
+import glob
+import os
+import re
+import time
+
+import obspy
+from obspy import UTCDateTime, readEvents, read_inventory
+from obspy.core import utcdatetime
+from obspy.core.compatibility import mock
+
+
+PATTERN = re.compile(r'>\s*(\d{4}-\d\d-\d\dT[^<]*?)\s*<')
+
+
+def default_files():
+    path = os.path.dirname(obspy.__file__)
+    files = glob.glob(os.path.join(path, 'core', 'tests', 'data',
+                                   'quakeml_1.2_*.xml'))
+    files += glob.glob(os.path.join(path, 'core', 'tests', 'data',
+                                    '*_events.xml'))
+    files += glob.glob(os.path.join(path, 'station', 'tests', 'data',
+                                    '*.xml'))
+    return sorted(files)
+
+
+def legacy_parser():
+    """
+    Context manager disabling the fast parser.
+    """
+    return mock.patch.object(UTCDateTime, '_parseISO8601Fast',
+                             staticmethod(lambda value: None))
+
+
+def best_of(func, repeat, setup=None):
+    times = []
+    for _i in range(repeat):
+        if setup:
+            setup()
+        start = time.time()
+        func()
+        times.append(time.time() - start)
+    return min(times)
+
+
+def read_document(filename):
+    try:
+        return read_inventory(filename, format='STATIONXML')
+    except Exception:
+        return readEvents(filename, format='QUAKEML')
+
+
+def main(argv=None):
+    parser = ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('-n', '--repeat', type=int, default=5,
+                        help='number of repetitions, the best one is shown')
+    parser.add_argument('files', nargs='*', help='StationXML/QuakeML files')
+    args = parser.parse_args(argv)
+    files = args.files or default_files()
+
+    strings = []
+    documents = []
+    for filename in files:
+        with open(filename, 'rb') as fh:
+            text = fh.read().decode('utf-8', 'replace')
+        values = PATTERN.findall(text)
+        try:
+            read_document(filename)
+        except Exception:
+            continue
+        strings.extend(values)
+        documents.append(filename)
+    print("%d date time strings (%d unique) in %d documents" % (
+        len(strings), len(set(strings)), len(documents)))
+
+    def parse():
+        for value in strings:
+            UTCDateTime(value)
+
+    def read():
+        for filename in documents:
+            read_document(filename)
+
+    clear = utcdatetime._ISO8601_CACHE.clear
+    with legacy_parser():
+        t_legacy = best_of(parse, args.repeat)
+        t_read_legacy = best_of(read, args.repeat)
+    t_cold = best_of(parse, args.repeat, setup=clear)
+    t_warm = best_of(parse, args.repeat)
+    t_read = best_of(read, args.repeat, setup=clear)
+
+    print("%-24s %12s %10s" % ('', 'strings/s', 'speedup'))
+    for label, t in (('legacy parser', t_legacy),
+                     ('fast parser, cold cache', t_cold),
+                     ('fast parser, warm cache', t_warm)):
+        print("%-24s %12.0f %9.1fx" % (
+            label, len(strings) / t, t_legacy / t))
+    print("reading all documents: %.3f s (legacy parser: %.3f s)" % (
+        t_read, t_read_legacy))
+
+
+if __name__ == "__main__":
+    main()
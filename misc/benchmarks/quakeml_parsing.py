@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark of reading QuakeML documents.
+
+Small, medium and large catalogs are created by repeating the events of a
+QuakeML document (by default the QuakeML example with origins, magnitudes,
+picks, amplitudes and focal mechanisms shipped with the ObsPy test suite)
+with unique resource identifiers. The time to read the catalogs is measured
+with the child element lookup of the Unpickler and with the legacy lookup
+evaluating one XPath query per field.
+
+Usage::
+
+    python quakeml_parsing.py [-n REPEAT] [FILE] [-s SIZE [SIZE ...]]
+
+:copyright:
+    The ObsPy Development Team (devs@obspy.org)
+:license:
+    GNU Lesser General Public License, Version 3
+    (http://www.gnu.org/copyleft/lesser.html)
+"""
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from future.builtins import *  # NOQA
+
+from argparse import ArgumentParser
+import io
+import os
+import re
+import time
+import warnings
+
+import obspy
+from obspy.core.compatibility import mock
+from obspy.core.quakeml import Unpickler, readQuakeML
+
+
+ID_PATTERN = re.compile(br'(publicID|ID)="([^"]*)"')
+
+
+def default_file():
+    return os.path.join(os.path.dirname(obspy.__file__), 'core', 'tests',
+                        'data', 'qml-example-1.2-RC3.xml')
+
+
+def legacy_xpath(self, xpath, element=None, namespace=None):
+    """
+    Child element lookup of the Unpickler evaluating an XPath query.
+    """
+    if element is None:
+        element = self.xml_root
+    namespaces = None
+    if namespace:
+        xpath = "b:%s" % xpath
+        namespaces = {"b": namespace}
+    elif None in element.nsmap:
+        xpath = "b:%s" % xpath
+        namespaces = {"b": element.nsmap[None]}
+    return element.xpath(xpath, namespaces=namespaces)
+
+
+def legacy_lookup():
+    """
+    Context manager replacing the child element lookup by XPath queries.
+    """
+    return mock.patch.object(Unpickler, '_xpath', legacy_xpath)
+
+
+def create_catalog(template, count):
+    """
+    Returns a QuakeML document with the events of the template repeated
+    until the document has the given number of events.
+    """
+    start = template.index(b'<event ')
+    end = template.rindex(b'</event>') + len(b'</event>')
+    events = template[start:end]
+    per_copy = events.count(b'<event ')
+    parts = [template[:start]]
+    for i in range(-(-count // per_copy)):
+        suffix = ('_%d"' % i).encode('ascii')
+        parts.append(ID_PATTERN.sub(
+            lambda match: match.group(0)[:-1] + suffix, events))
+    parts.append(template[end:])
+    return b'\n'.join(parts)
+
+
+def best_of(func, repeat):
+    times = []
+    for _i in range(repeat):
+        start = time.time()
+        func()
+        times.append(time.time() - start)
+    return min(times)
+
+
+def main(argv=None):
+    parser = ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('-n', '--repeat', type=int, default=3,
+                        help='number of repetitions, the best one is shown')
+    parser.add_argument('-s', '--sizes', type=int, nargs='+',
+                        default=[10, 1000, 10000],
+                        help='number of events of the catalogs')
+    parser.add_argument('file', nargs='?', default=default_file(),
+                        help='QuakeML file with the events to repeat')
+    args = parser.parse_args(argv)
+
+    with open(args.file, 'rb') as fh:
+        template = fh.read()
+    warnings.simplefilter('ignore')
+
+    print("%10s %10s %12s %12s %10s" % (
+        'events', 'size [MB]', 'legacy [s]', 'read [s]', 'speedup'))
+    for size in args.sizes:
+        document = create_catalog(template, size)
+
+        def read():
+            return readQuakeML(io.BytesIO(document))
+
+        count = len(read())
+        with legacy_lookup():
+            t_legacy = best_of(read, args.repeat)
+        t_read = best_of(read, args.repeat)
+        print("%10d %10.1f %12.3f %12.3f %9.1fx" % (
+            count, len(document) / 1e6, t_legacy, t_read, t_legacy / t_read))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the trace headers of streams with many short traces.
+
+Creates the given number of traces with a typical MiniSEED header using
+:class:`~obspy.core.trace.Stats` and
+:class:`~obspy.core.trace.CompactStats` and reports the time to construct
+the traces, to change the start time of all traces and to copy the stream
+as well as the memory used per header (measured with :mod:`tracemalloc`,
+requires Python 3.4 or later).
+
+Usage::
+
+    python stats_memory.py [-n REPEAT] [-t TRACES] [-s SAMPLES]
+
+:copyright:
+    The ObsPy Development Team (devs@obspy.org)
+:license:
+    GNU Lesser General Public License, Version 3
+    (http://www.gnu.org/copyleft/lesser.html)
+"""
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from future.builtins import *  # NOQA
+
+from argparse import ArgumentParser
+import gc
+import time
+import tracemalloc
+
+import numpy as np
+
+from obspy import Stream, Trace, UTCDateTime
+from obspy.core.trace import Stats, CompactStats
+
+
+def best_of(func, repeat):
+    times = []
+    for _i in range(repeat):
+        start = time.time()
+        func()
+        times.append(time.time() - start)
+    return min(times)
+
+
+def headers(count):
+    starttime = UTCDateTime(2014, 1, 1)
+    for i in range(count):
+        yield {'network': 'BW', 'station': 'RJOB', 'location': '',
+               'channel': 'EHZ', 'starttime': starttime + i,
+               'sampling_rate': 100.0, '_format': 'MSEED',
+               'mseed': {'dataquality': 'D', 'record_length': 512,
+                         'encoding': 'STEIM2', 'byteorder': '>',
+                         'number_of_records': 1, 'filesize': 512}}
+
+
+def create_stream(stats_class, count, samples):
+    data = np.zeros(samples, dtype=np.int32)
+    return Stream([Trace(data=data, header=stats_class(header))
+                   for header in headers(count)])
+
+
+def header_memory(stats_class, count):
+    """
+    Returns the memory in bytes used per header.
+    """
+    all_headers = list(headers(count))
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects = [stats_class(header) for header in all_headers]
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del objects
+    return used / float(count)
+
+
+def main(argv=None):
+    parser = ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('-n', '--repeat', type=int, default=3,
+                        help='number of repetitions, the best one is shown')
+    parser.add_argument('-t', '--traces', type=int, default=100000,
+                        help='number of traces')
+    parser.add_argument('-s', '--samples', type=int, default=100,
+                        help='number of samples per trace')
+    args = parser.parse_args(argv)
+
+    print("%d traces with %d samples" % (args.traces, args.samples))
+    print("%-14s %12s %12s %12s %14s" % (
+        '', 'create [s]', 'shift [s]', 'copy [s]', 'bytes/header'))
+    for stats_class in (Stats, CompactStats):
+        st = create_stream(stats_class, args.traces, args.samples)
+
+        def create():
+            create_stream(stats_class, args.traces, args.samples)
+
+        def shift():
+            for tr in st:
+                tr.stats.starttime += 1.0
+
+        t_create = best_of(create, args.repeat)
+        t_shift = best_of(shift, args.repeat)
+        t_copy = best_of(st.copy, args.repeat)
+        memory = header_memory(stats_class, args.traces)
+        print("%-14s %12.3f %12.3f %12.3f %14.0f" % (
+            stats_class.__name__, t_create, t_shift, t_copy, memory))
+
+
+if __name__ == "__main__":
+    main()
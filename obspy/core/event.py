@@ -36,12 +36,11 @@ from obspy.core.utcdatetime import UTCDateTime
 from obspy.core.util import uncompressFile, _readFromPlugin, \
     NamedTemporaryFile, AttribDict
 from obspy.core.util.decorator import map_example_filename
-from obspy.core.util.base import ENTRY_POINTS
+from obspy.core.util.base import ENTRY_POINTS, _getPluginFunction
 from obspy.core.util.decorator import deprecated_keywords, deprecated
 
 
 import io
-from pkg_resources import load_entry_point
 from uuid import uuid4
 from copy import deepcopy
 import collections
@@ -3162,9 +3161,8 @@ class Catalog(object):
             # get format specific entry point
             format_ep = EVENT_ENTRY_POINTS_WRITE[format]
             # search writeFormat method for given entry point
-            writeFormat = load_entry_point(
-                format_ep.dist.key, 'obspy.plugin.event.%s' % (format_ep.name),
-                'writeFormat')
+            writeFormat = _getPluginFunction('event', format_ep,
+                                             'writeFormat')
         except (IndexError, ImportError):
             msg = "Format \"%s\" is not supported. Supported types: %s"
             raise TypeError(msg % (format, ', '.join(EVENT_ENTRY_POINTS)))
@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+"""
+Module for deferred processing of ObsPy Stream objects.
+
+:copyright:
+    The ObsPy Development Team (devs@obspy.org)
+:license:
+    GNU Lesser General Public License, Version 3
+    (http://www.gnu.org/copyleft/lesser.html)
+"""
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from future.builtins import *  # NOQA
+
+from obspy.core import compatibility
+from obspy.core.stream import Stream
+import functools
+
+
+# Stream methods recorded by LazyStream, accessing any other attribute
+# executes the recorded methods.
+LAZY_METHODS = ['detrend', 'taper', 'filter', 'differentiate', 'integrate',
+                'resample', 'decimate', 'interpolate', 'simulate',
+                'remove_response', 'trigger', 'trim', 'normalize']
+
+# Stream methods which call the Trace method of the same name for every
+# trace. Consecutive calls are executed in a single pass over the data.
+_TRACE_METHODS = ['detrend', 'taper', 'filter', 'differentiate', 'integrate',
+                  'resample', 'decimate', 'interpolate', 'simulate',
+                  'remove_response', 'trigger']
+
+# causal recursive filters, the output at a sample does not depend on later
+# samples
+_RECURSIVE_FILTERS = ['bandpass', 'bandstop', 'lowpass', 'highpass',
+                      'lowpasscheby2']
+
+
+class LazyStream(object):
+    """
+    Stream whose processing is deferred until the data is needed.
+
+    Calls of the processing methods listed in :const:`LAZY_METHODS` are
+    only recorded. Accessing the traces or any other attribute of the
+    stream executes the recorded calls on the underlying
+    :class:`~obspy.core.stream.Stream` in place and in order with the
+    following optimizations:
+
+    * Consecutive calls of methods which process every trace on its own
+      (e.g. ``detrend``, ``taper``, ``filter``, ``decimate``) are executed in
+      a single pass: the data of all traces with the same sampling rate and
+      number of samples is stacked once, processed by all steps and written
+      back once (see :meth:`~obspy.core.stream.Stream._processTraces`).
+    * A ``trim`` is additionally executed before preceding ``filter`` and
+      ``differentiate`` calls, keeping the data these need outside the time
+      window. The final result within the time window is the same. The
+      causal Butterworth and Cheby2 filters need all earlier data, so the
+      start of the traces is only cut if ``padding`` is set.
+
+    :type stream: :class:`~obspy.core.stream.Stream`
+    :param stream: The stream to process.
+    :type padding: float, optional
+    :param padding: Length in seconds of the data kept before the start (and
+        after the end for zero phase filters) of a trim window when it is
+        moved before a recursive filter. The filter response to the cut data
+        is assumed to have decayed after this time, choose it long compared
+        to the period of the lowest corner frequency. Defaults to ``None``,
+        i.e. trims are only moved before filters where this gives the exact
+        same result.
+    :type workers: int, optional
+    :param workers: Number of threads processing the traces concurrently.
+
+    .. rubric:: Example
+
+    >>> from obspy import read
+    >>> st = read()
+    >>> lazy = st.lazy()
+    >>> lazy = lazy.detrend('linear').taper(max_percentage=0.05)
+    >>> lazy = lazy.filter('lowpass', freq=5.0).decimate(4)
+    >>> print(lazy)  # doctest: +ELLIPSIS
+    3 Trace(s) in Stream:
+    BW.RJOB..EHZ | 2009-08-24T00:20:03.000000Z ... | 25.0 Hz, 750 samples
+    BW.RJOB..EHN | 2009-08-24T00:20:03.000000Z ... | 25.0 Hz, 750 samples
+    BW.RJOB..EHE | 2009-08-24T00:20:03.000000Z ... | 25.0 Hz, 750 samples
+    """
+    def __init__(self, stream, padding=None, workers=None):
+        self._stream = stream
+        self._steps = []
+        self.padding = padding
+        self.workers = workers
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        if name in LAZY_METHODS:
+            return functools.partial(self._record, name)
+        return getattr(self.execute(), name)
+
+    def __iter__(self):
+        return iter(self.execute())
+
+    def __len__(self):
+        return len(self.execute())
+
+    def __getitem__(self, index):
+        return self.execute()[index]
+
+    def __str__(self, *args, **kwargs):
+        return self.execute().__str__(*args, **kwargs)
+
+    def _record(self, method, *args, **kwargs):
+        """
+        Records the call of a Stream processing method.
+        """
+        kwargs.pop('workers', None)
+        self._steps.append((method, args, kwargs))
+        return self
+
+    def execute(self):
+        """
+        Executes all recorded processing steps.
+
+        :rtype: :class:`~obspy.core.stream.Stream`
+        :return: The processed stream.
+        """
+        steps = _optimize(self._steps, self.padding)
+        self._steps = []
+        run = []
+        for method, args, kwargs in steps:
+            if method in _TRACE_METHODS:
+                run.append((method, args, kwargs))
+                continue
+            if run:
+                self._stream._processTraces(run, self.workers)
+                run = []
+            if method == '_preTrim':
+                _preTrim(self._stream, *args, **kwargs)
+            elif method == '_trim':
+                _trim(self._stream, *args, **kwargs)
+            else:
+                getattr(self._stream, method)(*args, **kwargs)
+        if run:
+            self._stream._processTraces(run, self.workers)
+        return self._stream
+
+
+def _trimMargins(method, args, kwargs, padding=None):
+    """
+    Returns the data a processing step needs outside of a time window to
+    give the same result within the window as on the full data.
+
+    :return: ``None`` if the step needs the full data or a tuple of the
+        margins left and right of the window. The margins are given as tuple
+        ``(seconds, samples)`` or ``None`` if all data on this side is needed.
+    """
+    if method == 'differentiate':
+        if args and args[0] != 'gradient' or \
+                kwargs.get('type', 'gradient') != 'gradient' or \
+                set(kwargs) - set(['type']):
+            return None
+        # central differences
+        return (0.0, 1), (0.0, 1)
+    if method == 'filter':
+        type = args[0] if args else kwargs.get('type', '')
+        if type.lower() not in _RECURSIVE_FILTERS:
+            return None
+        margin = None if padding is None else (padding, 0)
+        if kwargs.get('zerophase'):
+            return margin, margin
+        return margin, (0.0, 0)
+    return None
+
+
+def _addMargins(margin, other):
+    """
+    Adds two margins as returned by :func:`_trimMargins`.
+    """
+    if margin is None or other is None:
+        return None
+    return margin[0] + other[0], margin[1] + other[1]
+
+
+def _optimize(steps, padding=None):
+    """
+    Returns the steps to execute for the recorded steps of a
+    :class:`LazyStream`.
+
+    Every ``trim`` without padding is preceded by a ``_preTrim`` step before
+    the preceding steps whose margins (see :func:`_trimMargins`) are known.
+    It is replaced by a ``_trim`` step using the same start and end time as
+    the ``_preTrim``.
+    """
+    steps = list(steps)
+    i = 0
+    while i < len(steps):
+        method, args, kwargs = steps[i]
+        if method != 'trim':
+            i += 1
+            continue
+        trim = compatibility.getcallargs(Stream.trim, None, *args, **kwargs)
+        trim.pop('self')
+        left = right = (0.0, 0)
+        j = i
+        while j > 0 and not trim['pad']:
+            margins = _trimMargins(*steps[j - 1], padding=padding)
+            if margins is None:
+                break
+            left = _addMargins(left, margins[0])
+            right = _addMargins(right, margins[1])
+            j -= 1
+        if j < i and (trim['starttime'] and left is not None or
+                      trim['endtime'] and right is not None):
+            steps[i] = ('_trim', (), dict(trim=trim))
+            steps.insert(j, ('_preTrim', (), dict(trim=trim, left=left,
+                                                  right=right)))
+            i += 1
+        i += 1
+    return steps
+
+
+def _preTrim(stream, trim, left, right):
+    """
+    Cuts all traces of the stream to the time window of the ``trim`` extended
+    by the given margins, see :func:`_optimize`.
+
+    The start and end time of the window are aligned as by
+    :meth:`~obspy.core.stream.Stream.trim` and stored in ``trim``.
+    """
+    if not stream:
+        return
+    starttime, endtime = trim['starttime'], trim['endtime']
+    if trim['nearest_sample']:
+        starttime, endtime = stream._alignTrimTimes(starttime, endtime)
+    trim.update(starttime=starttime, endtime=endtime, aligned=True)
+    for tr in stream:
+        # keep one sample more on each side to be safe from rounding
+        t1 = t2 = None
+        if starttime and left is not None:
+            t1 = starttime - left[0] - (left[1] + 1) * tr.stats.delta
+        if endtime and right is not None:
+            t2 = endtime + right[0] + (right[1] + 1) * tr.stats.delta
+        tr.trim(t1, t2, nearest_sample=False)
+    stream.traces = [tr for tr in stream if tr.stats.npts]
+
+
+def _trim(stream, trim):
+    """
+    Executes a ``trim`` whose time window was aligned by :func:`_preTrim`.
+    """
+    trim = dict(trim)
+    if not trim.pop('aligned', False):
+        stream.trim(**trim)
+        return
+    for tr in stream:
+        tr.trim(**trim)
+    stream.traces = [tr for tr in stream if tr.stats.npts]
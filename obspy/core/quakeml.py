@@ -32,14 +32,19 @@ from obspy.core.event import Catalog, Event, Origin, CreationInfo, Magnitude, \
     ResourceIdentifier, StationMagnitudeContribution, Amplitude, TimeWindow
 from obspy.core.utcdatetime import UTCDateTime
 from obspy.core.util import AttribDict
+from obspy.core.util.decorator import map_example_filename
 import warnings
 
 import inspect
 import io
 from lxml import etree
 import os
+import re
 
 
+# child element names looked up without XPath, see Unpickler._xpath
+_SIMPLE_TAG = re.compile(r"^[A-Za-z_][\w.-]*$")
+
 NSMAP_QUAKEML = {None: "http://quakeml.org/xmlns/bed/1.2",
                  'q': "http://quakeml.org/xmlns/quakeml/1.2"}
 
@@ -123,6 +128,7 @@ class Unpickler(object):
     """
     def __init__(self, xml_doc=None):
         self.xml_doc = xml_doc
+        self._child_index = {}
 
     @property
     def xml_root(self):
@@ -155,6 +161,120 @@ class Unpickler(object):
         self.xml_doc = etree.parse(io.BytesIO(string))
         return self._deserialize()
 
+    def iterload(self, file, starttime=None, endtime=None, minlatitude=None,
+                 maxlatitude=None, minlongitude=None, maxlongitude=None,
+                 minmagnitude=None, maxmagnitude=None):
+        """
+        Reads the events of a QuakeML file one at a time.
+
+        The file is parsed incrementally, every event is converted to an
+        :class:`~obspy.core.event.Event` as soon as its element is complete
+        and the element is freed afterwards. Events not matching the given
+        criteria are skipped before creating any objects. The criteria are
+        checked against the preferred origin and magnitude of an event (or
+        the first one if none is preferred), events without the value are
+        skipped.
+
+        :type file: str
+        :param file: File name or file like object to read.
+        :type starttime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+        :param starttime: Only events with origin time at or after given
+            time.
+        :type endtime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+        :param endtime: Only events with origin time at or before given time.
+        :type minlatitude: float
+        :param minlatitude: Only events with origin latitude of at least
+            given value.
+        :type maxlatitude: float
+        :param maxlatitude: Only events with origin latitude of at most given
+            value.
+        :type minlongitude: float
+        :param minlongitude: Only events with origin longitude of at least
+            given value.
+        :type maxlongitude: float
+        :param maxlongitude: Only events with origin longitude of at most
+            given value.
+        :type minmagnitude: float
+        :param minmagnitude: Only events with magnitude of at least given
+            value.
+        :type maxmagnitude: float
+        :param maxmagnitude: Only events with magnitude of at most given
+            value.
+        :rtype: generator of :class:`~obspy.core.event.Event`
+        """
+        limits = [('time', starttime, endtime),
+                  ('latitude', minlatitude, maxlatitude),
+                  ('longitude', minlongitude, maxlongitude),
+                  ('mag', minmagnitude, maxmagnitude)]
+        limits = [limit for limit in limits
+                  if limit[1] is not None or limit[2] is not None]
+        if isinstance(file, bytes):
+            file = io.BytesIO(file)
+        root = catalog_el = event_tag = None
+        for action, element in etree.iterparse(file, events=("start", "end")):
+            if action == "start":
+                if root is None:
+                    root = element
+                    self.xml_doc = root
+                    self._quakeml_namespaces = [
+                        ns for ns in root.nsmap.values()
+                        if ns.startswith(r"http://quakeml.org/xmlns/")]
+                elif catalog_el is None:
+                    # check node "quakeml/eventParameters" for global
+                    # namespace
+                    qname = etree.QName(element.tag)
+                    if qname.localname != "eventParameters":
+                        break
+                    catalog_el = element
+                    event_tag = "{%s}event" % qname.namespace
+                continue
+            if element.tag != event_tag or \
+                    element.getparent() is not catalog_el:
+                continue
+            event = None
+            if self._event_within_limits(element, limits):
+                event = self._event(element)
+            element.clear()
+            catalog_el.remove(element)
+            self._child_index = {}
+            if event is not None:
+                yield event
+        if catalog_el is None:
+            raise Exception("Not a QuakeML compatible file or string")
+
+    def _event_within_limits(self, event_el, limits):
+        """
+        Checks the values of the preferred (or first) origin and magnitude of
+        an event element.
+
+        :type limits: list of tuples
+        :param limits: ``(name, minimum, maximum)`` of origin time, latitude,
+            longitude (``name`` is ``"time"``, ``"latitude"`` or
+            ``"longitude"``) or magnitude (``"mag"``). ``None`` for no
+            limit.
+        """
+        elements = {}
+        for name, id_name in (('origin', 'preferredOriginID'),
+                              ('magnitude', 'preferredMagnitudeID')):
+            candidates = self._xpath(name, event_el)
+            preferred_id = self._xpath2obj(id_name, event_el)
+            preferred = [el for el in candidates
+                         if el.get('publicID') == preferred_id]
+            elements[name] = (preferred or candidates or [None])[0]
+        for name, minimum, maximum in limits:
+            element = elements['magnitude' if name == 'mag' else 'origin']
+            if element is None:
+                return False
+            value, _ = self._value(element, name,
+                                   UTCDateTime if name == 'time' else float)
+            if value is None:
+                return False
+            if minimum is not None and value < minimum:
+                return False
+            if maximum is not None and value > maximum:
+                return False
+        return True
+
     def _xpath2obj(self, xpath, element=None, convert_to=str, namespace=None):
         q = self._xpath(xpath, element=element, namespace=namespace)
         if not q:
@@ -176,21 +296,48 @@ class Unpickler(object):
         return None
 
     def _xpath(self, xpath, element=None, namespace=None):
+        """
+        Returns the child elements of the given element matching ``xpath``.
+
+        Simple tag names are looked up in the children of the element,
+        which are collected by tag in a single pass on the first lookup (see
+        :meth:`_children`), instead of evaluating an XPath query for every
+        field. Anything else is evaluated as XPath expression.
+        """
         if element is None:
             element = self.xml_root
 
-        namespaces = None
+        if not namespace:
+            nsmap = getattr(element, "nsmap", {})
+            if None not in nsmap:
+                nsmap = getattr(self, "nsmap", {})
+            namespace = nsmap.get(None)
+
+        if _SIMPLE_TAG.match(xpath):
+            if namespace:
+                xpath = "{%s}%s" % (namespace, xpath)
+            return self._children(element).get(xpath, [])
         if namespace:
-            xpath = "b:%s" % xpath
-            namespaces = {"b": namespace}
-        elif hasattr(element, "nsmap") and None in element.nsmap:
-            xpath = "b:%s" % xpath
-            namespaces = {"b": element.nsmap[None]}
-        elif hasattr(self, "nsmap") and None in self.nsmap:
-            xpath = "b:%s" % xpath
-            namespaces = {"b": self.nsmap[None]}
+            return element.xpath("b:%s" % xpath, namespaces={"b": namespace})
+        return element.xpath(xpath)
 
-        return element.xpath(xpath, namespaces=namespaces)
+    def _children(self, element):
+        """
+        Returns a dictionary mapping tags to the child elements of the given
+        element in document order.
+
+        The dictionary is created in a single pass over the children and
+        kept until the current event has been read.
+        """
+        try:
+            return self._child_index[element]
+        except KeyError:
+            pass
+        children = {}
+        for child in element.iterchildren(tag=etree.Element):
+            children.setdefault(child.tag, []).append(child)
+        self._child_index[element] = children
+        return children
 
     def _comments(self, parent):
         obj = []
@@ -874,6 +1021,67 @@ class Unpickler(object):
         self._extra(element, obj)
         return obj
 
+    def _event(self, event_el):
+        # create new Event object
+        event = Event(force_resource_id=False)
+        # optional event attributes
+        event.preferred_origin_id = \
+            self._xpath2obj('preferredOriginID', event_el)
+        event.preferred_magnitude_id = \
+            self._xpath2obj('preferredMagnitudeID', event_el)
+        event.preferred_focal_mechanism_id = \
+            self._xpath2obj('preferredFocalMechanismID', event_el)
+        event_type = self._xpath2obj('type', event_el)
+        # Change for QuakeML 1.2RC4. 'null' is no longer acceptable as an
+        # event type. Will be replaced with 'not reported'.
+        if event_type == "null":
+            event_type = "not reported"
+        event.event_type = event_type
+        event.event_type_certainty = self._xpath2obj(
+            'typeCertainty', event_el)
+        event.creation_info = self._creation_info(event_el)
+        event.event_descriptions = self._event_description(event_el)
+        event.comments = self._comments(event_el)
+        # origins
+        event.origins = []
+        for origin_el in self._xpath('origin', event_el):
+            origin = self._origin(origin_el)
+            # arrivals
+            origin.arrivals = []
+            for arrival_el in self._xpath('arrival', origin_el):
+                arrival = self._arrival(arrival_el)
+                origin.arrivals.append(arrival)
+            # append origin with arrivals
+            event.origins.append(origin)
+        # magnitudes
+        event.magnitudes = []
+        for magnitude_el in self._xpath('magnitude', event_el):
+            magnitude = self._magnitude(magnitude_el)
+            event.magnitudes.append(magnitude)
+        # station magnitudes
+        event.station_magnitudes = []
+        for magnitude_el in self._xpath('stationMagnitude', event_el):
+            magnitude = self._station_magnitude(magnitude_el)
+            event.station_magnitudes.append(magnitude)
+        # picks
+        event.picks = []
+        for pick_el in self._xpath('pick', event_el):
+            pick = self._pick(pick_el)
+            event.picks.append(pick)
+        # amplitudes
+        event.amplitudes = []
+        for el in self._xpath('amplitude', event_el):
+            amp = self._amplitude(el)
+            event.amplitudes.append(amp)
+        # focal mechanisms
+        event.focal_mechanisms = []
+        for fm_el in self._xpath('focalMechanism', event_el):
+            fm = self._focal_mechanism(fm_el)
+            event.focal_mechanisms.append(fm)
+        event.resource_id = event_el.get('publicID')
+        self._extra(event_el, event)
+        return event
+
     def _deserialize(self):
         # check node "quakeml/eventParameters" for global namespace
         try:
@@ -894,66 +1102,8 @@ class Unpickler(object):
         catalog.creation_info = self._creation_info(catalog_el)
         # loop over all events
         for event_el in self._xpath('event', catalog_el):
-            # create new Event object
-            event = Event(force_resource_id=False)
-            # optional event attributes
-            event.preferred_origin_id = \
-                self._xpath2obj('preferredOriginID', event_el)
-            event.preferred_magnitude_id = \
-                self._xpath2obj('preferredMagnitudeID', event_el)
-            event.preferred_focal_mechanism_id = \
-                self._xpath2obj('preferredFocalMechanismID', event_el)
-            event_type = self._xpath2obj('type', event_el)
-            # Change for QuakeML 1.2RC4. 'null' is no longer acceptable as an
-            # event type. Will be replaced with 'not reported'.
-            if event_type == "null":
-                event_type = "not reported"
-            event.event_type = event_type
-            event.event_type_certainty = self._xpath2obj(
-                'typeCertainty', event_el)
-            event.creation_info = self._creation_info(event_el)
-            event.event_descriptions = self._event_description(event_el)
-            event.comments = self._comments(event_el)
-            # origins
-            event.origins = []
-            for origin_el in self._xpath('origin', event_el):
-                origin = self._origin(origin_el)
-                # arrivals
-                origin.arrivals = []
-                for arrival_el in self._xpath('arrival', origin_el):
-                    arrival = self._arrival(arrival_el)
-                    origin.arrivals.append(arrival)
-                # append origin with arrivals
-                event.origins.append(origin)
-            # magnitudes
-            event.magnitudes = []
-            for magnitude_el in self._xpath('magnitude', event_el):
-                magnitude = self._magnitude(magnitude_el)
-                event.magnitudes.append(magnitude)
-            # station magnitudes
-            event.station_magnitudes = []
-            for magnitude_el in self._xpath('stationMagnitude', event_el):
-                magnitude = self._station_magnitude(magnitude_el)
-                event.station_magnitudes.append(magnitude)
-            # picks
-            event.picks = []
-            for pick_el in self._xpath('pick', event_el):
-                pick = self._pick(pick_el)
-                event.picks.append(pick)
-            # amplitudes
-            event.amplitudes = []
-            for el in self._xpath('amplitude', event_el):
-                amp = self._amplitude(el)
-                event.amplitudes.append(amp)
-            # focal mechanisms
-            event.focal_mechanisms = []
-            for fm_el in self._xpath('focalMechanism', event_el):
-                fm = self._focal_mechanism(fm_el)
-                event.focal_mechanisms.append(fm)
-            # finally append newly created event to catalog
-            event.resource_id = event_el.get('publicID')
-            self._extra(event_el, event)
-            catalog.append(event)
+            catalog.append(self._event(event_el))
+            self._child_index = {}
         catalog.resource_id = catalog_el.get('publicID')
         self._extra(catalog_el, catalog)
         return catalog
@@ -1763,6 +1913,30 @@ def readQuakeML(filename):
     return Unpickler().load(filename)
 
 
+@map_example_filename("filename")
+def iterQuakeML(filename, **kwargs):
+    """
+    Reads the events of a QuakeML file one at a time.
+
+    The file is parsed incrementally, so catalogs of any size can be
+    processed without keeping all events in memory. Events can be selected
+    by origin time, location and magnitude before they are read completely,
+    see :meth:`Unpickler.iterload` for all criteria.
+
+    :type filename: str
+    :param filename: QuakeML file to be read.
+    :rtype: generator of :class:`~obspy.core.event.Event`
+
+    .. rubric:: Example
+
+    >>> for event in iterQuakeML('/path/to/iris_events.xml',
+    ...                          minmagnitude=9.5):
+    ...     print(event.short_str())
+    2006-09-10T04:26:33.610000Z |  +9.614, +121.961 | 9.8 MS
+    """
+    return Unpickler().iterload(filename, **kwargs)
+
+
 def writeQuakeML(catalog, filename, validate=False, nsmap=None,
                  **kwargs):  # @UnusedVariable
     """
@@ -18,18 +18,21 @@ with standard_library.hooks():
 
 from glob import glob, has_magic
 from obspy.core import compatibility
-from obspy.core.trace import Trace
-from obspy.core.utcdatetime import UTCDateTime
-from obspy.core.util import NamedTemporaryFile
+from obspy.core.trace import Trace, _newProcessingInfo, _checkResampling, \
+    _resampleData, _getTaper, _copySharingData
+from obspy.core.utcdatetime import UTCDateTime, UTCDateTimeArray
+from obspy.core.util import NamedTemporaryFile, createEmptyDataChunk
 from obspy.core.util.decorator import map_example_filename
 from obspy.core.util.base import ENTRY_POINTS, _readFromPlugin, \
-    _getFunctionFromEntryPoint
+    _getFunctionFromEntryPoint, _getPluginFunction, \
+    WAVEFORM_THREADED_FORMATS, BATCHED_PROCESSING
 from obspy.core.util.decorator import uncompressFile, raiseIfMasked
-from pkg_resources import load_entry_point
 import pickle
 import copy
 import fnmatch
 import math
+import multiprocessing
+from multiprocessing.pool import ThreadPool
 import numpy as np
 import os
 import warnings
@@ -38,7 +41,7 @@ import warnings
 @map_example_filename("pathname_or_url")
 def read(pathname_or_url=None, format=None, headonly=False, starttime=None,
          endtime=None, nearest_sample=True, dtype=None, apply_calib=False,
-         **kwargs):
+         workers=None, **kwargs):
     """
     Read waveform files into an ObsPy Stream object.
 
@@ -80,6 +83,14 @@ def read(pathname_or_url=None, format=None, headonly=False, starttime=None,
     :type apply_calib: bool, optional
     :param apply_calib: Automatically applies the calibration factor
         ``trace.stats.calib`` for each trace, if set. Defaults to ``False``.
+    :type workers: int, optional
+    :param workers: Number of files read in parallel if the file name
+        contains wildcards. Files are read in separate processes unless a
+        ``format`` is given whose reader mainly runs thread-safe C code (see
+        :const:`~obspy.core.util.base.WAVEFORM_THREADED_FORMATS`), in which
+        case threads are used. Traces are returned in the same order as for
+        sequential reading. Defaults to ``None``, i.e. reading all files one
+        after another.
     :param kwargs: Additional keyword arguments passed to the underlying
         waveform reader method.
     :return: An ObsPy :class:`~obspy.core.stream.Stream` object.
@@ -223,8 +234,15 @@ def read(pathname_or_url=None, format=None, headonly=False, starttime=None,
     else:
         # some file name
         pathname = pathname_or_url
-        for file in sorted(glob(pathname)):
-            st.extend(_read(file, format, headonly, **kwargs).traces)
+        files = sorted(glob(pathname))
+        if workers and workers > 1 and len(files) > 1:
+            streams = _readParallel(files, format, headonly, workers,
+                                    **kwargs)
+        else:
+            streams = (_read(file, format, headonly, **kwargs)
+                       for file in files)
+        for stream in streams:
+            st.extend(stream.traces)
         if len(st) == 0:
             # try to give more specific information why the stream is empty
             if has_magic(pathname) and not glob(pathname):
@@ -275,6 +293,37 @@ def _read(filename, format=None, headonly=False, **kwargs):
     return stream
 
 
+def _readParallel(filenames, format, headonly, workers, **kwargs):
+    """
+    Reads multiple files concurrently and returns a list of Stream objects in
+    the order of the given file names.
+    """
+    workers = min(workers, len(filenames))
+    if format is not None and format.upper() in WAVEFORM_THREADED_FORMATS:
+        pool = ThreadPool(workers)
+    else:
+        pool = multiprocessing.Pool(workers)
+    args = [(filename, format, headonly, kwargs) for filename in filenames]
+    try:
+        streams = pool.map(_readWorker, args, chunksize=1)
+    except:
+        pool.terminate()
+        raise
+    finally:
+        pool.close()
+        pool.join()
+    return streams
+
+
+def _readWorker(args):
+    """
+    Reads a single file, helper function for :func:`_readParallel`. Needs to
+    be defined at module level to be usable with a process pool.
+    """
+    filename, format, headonly, kwargs = args
+    return _read(filename, format, headonly, **kwargs)
+
+
 def _createExampleStream(headonly=False):
     """
     Create an example stream.
@@ -777,51 +826,60 @@ class Stream(object):
         BW.RJOB..EHZ      2009-08-24T00:20:13.000000Z ...
         Total: 1 gap(s) and 0 overlap(s)
         """
-        # Create shallow copy of the traces to be able to sort them later on.
-        copied_traces = copy.copy(self.traces)
-        self.sort()
+        order, codes, starttimes, endtimes = self._getSortedTimes()
+        traces = [self.traces[_i] for _i in order]
+        if len(traces) < 2:
+            return []
+        # compare each trace with its successor of the same id
+        same_id = codes[1:] == codes[:-1]
+        delta = starttimes[1:] - endtimes[:-1]
+        # Check that any overlap is not larger than the trace coverage
+        coverage = endtimes[1:] - starttimes[1:]
+        delta = np.where((delta < 0) & (-delta > coverage), -coverage, delta)
+        # Check gap/overlap criteria
+        keep = same_id
+        if min_gap:
+            keep &= delta >= min_gap
+        if max_gap:
+            keep &= delta <= max_gap
+        sampling_rates = np.array([tr.stats.sampling_rate for tr in traces])
+        deltas = np.array([tr.stats.delta for tr in traces])
+        # Number of missing samples, rounded away from zero like
+        # compatibility.round_away()
+        nsamples = np.floor(np.abs(delta) * sampling_rates[:-1] + 0.5)
+        # different sampling rates should always result in a gap or overlap,
+        # otherwise skip if it is equal to delta (1 / sampling rate)
+        keep &= (deltas[1:] != deltas[:-1]) | (nsamples != 1)
+        nsamples += np.where(delta > 0, -1, 1)
         gap_list = []
-        for _i in range(len(self.traces) - 1):
-            # skip traces with different network, station, location or channel
-            if self.traces[_i].id != self.traces[_i + 1].id:
-                continue
-            # different sampling rates should always result in a gap or overlap
-            if self.traces[_i].stats.delta == self.traces[_i + 1].stats.delta:
-                flag = True
-            else:
-                flag = False
-            stats = self.traces[_i].stats
-            stime = stats['endtime']
-            etime = self.traces[_i + 1].stats['starttime']
-            delta = etime.timestamp - stime.timestamp
-            # Check that any overlap is not larger than the trace coverage
-            if delta < 0:
-                temp = self.traces[_i + 1].stats['endtime'].timestamp - \
-                    etime.timestamp
-                if (delta * -1) > temp:
-                    delta = -1 * temp
-            # Check gap/overlap criteria
-            if min_gap and delta < min_gap:
-                continue
-            if max_gap and delta > max_gap:
-                continue
-            # Number of missing samples
-            nsamples = int(compatibility.round_away(math.fabs(delta) *
-                                                    stats['sampling_rate']))
-            # skip if is equal to delta (1 / sampling rate)
-            if flag and nsamples == 1:
-                continue
-            elif delta > 0:
-                nsamples -= 1
-            else:
-                nsamples += 1
+        for _i in np.nonzero(keep)[0]:
+            stats = traces[_i].stats
             gap_list.append([stats['network'], stats['station'],
                              stats['location'], stats['channel'],
-                             stime, etime, delta, nsamples])
-        # Set the original traces to not alter the stream object.
-        self.traces = copied_traces
+                             stats['endtime'],
+                             traces[_i + 1].stats['starttime'],
+                             float(delta[_i]), int(nsamples[_i])])
         return gap_list
 
+    def _getSortedTimes(self):
+        """
+        Returns the order of the traces sorted by network, station, location,
+        channel, start and end time (like :meth:`sort` with its default keys)
+        together with integer codes of the trace ids and the start and end
+        times as :class:`~obspy.core.utcdatetime.UTCDateTimeArray`, all in
+        sorted order.
+        """
+        keys = [(tr.stats.network, tr.stats.station, tr.stats.location,
+                 tr.stats.channel) for tr in self.traces]
+        lookup = dict((key, _i) for _i, key in enumerate(sorted(set(keys))))
+        codes = np.array([lookup[key] for key in keys], dtype=np.int64)
+        starttimes = UTCDateTimeArray(
+            [tr.stats.starttime.timestamp for tr in self.traces])
+        endtimes = UTCDateTimeArray(
+            [tr.stats.endtime.timestamp for tr in self.traces])
+        order = np.lexsort((endtimes.ns, starttimes.ns, codes))
+        return order, codes[order], starttimes[order], endtimes[order]
+
     def insert(self, position, object):
         """
         Inserts either a single Trace or a list of Traces before index.
@@ -1388,9 +1446,8 @@ class Stream(object):
             # get format specific entry point
             format_ep = ENTRY_POINTS['waveform_write'][format]
             # search writeFormat method for given entry point
-            writeFormat = load_entry_point(
-                format_ep.dist.key,
-                'obspy.plugin.waveform.%s' % (format_ep.name), 'writeFormat')
+            writeFormat = _getPluginFunction('waveform', format_ep,
+                                             'writeFormat')
         except (IndexError, ImportError, KeyError):
             msg = "Writing format \"%s\" is not supported. Supported types: %s"
             raise TypeError(msg % (format,
@@ -1456,16 +1513,7 @@ class Stream(object):
             return
         # select start/end time fitting to a sample point of the first trace
         if nearest_sample:
-            tr = self.traces[0]
-            if starttime:
-                delta = compatibility.round_away(
-                    (starttime - tr.stats.starttime) * tr.stats.sampling_rate)
-                starttime = tr.stats.starttime + delta * tr.stats.delta
-            if endtime:
-                delta = compatibility.round_away(
-                    (endtime - tr.stats.endtime) * tr.stats.sampling_rate)
-                # delta is negative!
-                endtime = tr.stats.endtime + delta * tr.stats.delta
+            starttime, endtime = self._alignTrimTimes(starttime, endtime)
         for trace in self.traces:
             trace.trim(starttime, endtime, pad=pad,
                        nearest_sample=nearest_sample, fill_value=fill_value)
@@ -1473,6 +1521,23 @@ class Stream(object):
         self.traces = [_i for _i in self.traces if _i.stats.npts]
         return self
 
+    def _alignTrimTimes(self, starttime=None, endtime=None):
+        """
+        Returns start and end time moved to the nearest sample point of the
+        first trace, see :meth:`trim`.
+        """
+        tr = self.traces[0]
+        if starttime:
+            delta = compatibility.round_away(
+                (starttime - tr.stats.starttime) * tr.stats.sampling_rate)
+            starttime = tr.stats.starttime + delta * tr.stats.delta
+        if endtime:
+            delta = compatibility.round_away(
+                (endtime - tr.stats.endtime) * tr.stats.sampling_rate)
+            # delta is negative!
+            endtime = tr.stats.endtime + delta * tr.stats.delta
+        return starttime, endtime
+
     def _ltrim(self, starttime, pad=False, nearest_sample=True):
         """
         Cuts all traces of this Stream object to given start time.
@@ -1700,21 +1765,22 @@ class Stream(object):
             # skip empty traces
             if len(trace) == 0:
                 continue
+            _id = trace.id
             # Check sampling rate.
-            sr.setdefault(trace.id, trace.stats.sampling_rate)
-            if trace.stats.sampling_rate != sr[trace.id]:
+            sr.setdefault(_id, trace.stats.sampling_rate)
+            if trace.stats.sampling_rate != sr[_id]:
                 msg = "Can't merge traces with same ids but differing " + \
                       "sampling rates!"
                 raise Exception(msg)
             # Check dtype.
-            dtype.setdefault(trace.id, trace.data.dtype)
-            if trace.data.dtype != dtype[trace.id]:
+            dtype.setdefault(_id, trace.data.dtype)
+            if trace.data.dtype != dtype[_id]:
                 msg = "Can't merge traces with same ids but differing " + \
                       "data types!"
                 raise Exception(msg)
             # Check calibration factor.
-            calib.setdefault(trace.id, trace.stats.calib)
-            if trace.stats.calib != calib[trace.id]:
+            calib.setdefault(_id, trace.stats.calib)
+            if trace.stats.calib != calib[_id]:
                 msg = "Can't merge traces with same ids but differing " + \
                       "calibration factors.!"
                 raise Exception(msg)
@@ -1752,62 +1818,37 @@ class Stream(object):
         The ``method`` argument controls the handling of overlapping data
         values.
         """
-        def listsort(order, current):
-            """
-            Helper method for keeping trace's ordering
-            """
-            try:
-                return order.index(current)
-            except ValueError:
-                return -1
-
         if method == -1:
             self._cleanup()
             return
         # check sampling rates and dtypes
         self._mergeChecks()
         # remember order of traces
-        order = [id(i) for i in self.traces]
+        order = dict((id(tr), _i) for _i, tr in
+                     reversed(list(enumerate(self.traces))))
         # order matters!
-        self.sort(keys=['network', 'station', 'location', 'channel',
-                        'starttime', 'endtime'])
-        # build up dictionary with with lists of traces with same ids
-        traces_dict = {}
-        # using pop() and try-except saves memory
-        try:
-            while True:
-                trace = self.traces.pop(0)
-                # skip empty traces
-                if len(trace) == 0:
-                    continue
-                _id = trace.getId()
-                if _id not in traces_dict:
-                    traces_dict[_id] = [trace]
-                else:
-                    traces_dict[_id].append(trace)
-        except IndexError:
-            pass
+        indices, codes, _, _ = self._getSortedTimes()
+        traces = [self.traces[_i] for _i in indices]
         # clear traces of current stream
         self.traces = []
-        # loop through ids
-        for _id in traces_dict.keys():
-            cur_trace = traces_dict[_id].pop(0)
-            # loop through traces of same id
-            for _i in range(len(traces_dict[_id])):
-                trace = traces_dict[_id].pop(0)
-                # disable sanity checks because there are already done
-                cur_trace = cur_trace.__add__(
-                    trace, method, fill_value=fill_value, sanity_checks=False,
-                    interpolation_samples=interpolation_samples)
-            self.traces.append(cur_trace)
-
+        # loop through traces of same id, skipping empty traces
+        start = 0
+        for _i in range(1, len(traces) + 1):
+            if _i < len(traces) and codes[_i] == codes[start]:
+                continue
+            group = [tr for tr in traces[start:_i] if len(tr)]
+            start = _i
+            if group:
+                self.traces.append(_mergeTraces(
+                    group, method, fill_value, interpolation_samples))
         # trying to restore order, newly created traces are placed at
         # start
-        self.traces.sort(key=lambda x: listsort(order, id(x)))
+        self.traces.sort(key=lambda x: order.get(id(x), -1))
         return self
 
     def simulate(self, paz_remove=None, paz_simulate=None,
-                 remove_sensitivity=True, simulate_sensitivity=True, **kwargs):
+                 remove_sensitivity=True, simulate_sensitivity=True,
+                 workers=None, **kwargs):
         """
         Correct for instrument response / Simulate new instrument response.
 
@@ -1834,6 +1875,10 @@ class Stream(object):
             ``paz_simulate['sensitivity']`` to simulate overall sensitivity of
             new instrument (seismometer/digitizer) during instrument
             simulation.
+        :type workers: int, optional
+        :param workers: Number of threads processing the traces
+            concurrently. Defaults to ``None``, i.e. processing in the calling
+            thread.
 
         This function corrects for the original instrument response given by
         ``paz_remove`` and/or simulates a new instrument response given by
@@ -1902,13 +1947,86 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             st.simulate(paz_remove=paz_sts2, paz_simulate=paz_1hz)
             st.plot()
         """
-        for tr in self:
-            tr.simulate(paz_remove=paz_remove, paz_simulate=paz_simulate,
-                        remove_sensitivity=remove_sensitivity,
-                        simulate_sensitivity=simulate_sensitivity, **kwargs)
+        kwargs = dict(kwargs, paz_remove=paz_remove, paz_simulate=paz_simulate,
+                      remove_sensitivity=remove_sensitivity,
+                      simulate_sensitivity=simulate_sensitivity)
+        self._processTraces([('simulate', (), kwargs)], workers)
         return self
 
-    def filter(self, type, **options):
+    def _getBatches(self, workers=None):
+        """
+        Groups the traces of the stream for batched processing.
+
+        Traces with the same sampling rate, number of samples and data type
+        can be processed at once as rows of a two-dimensional array. Traces
+        with masked, multi-dimensional or no data are put in a group of their
+        own.
+
+        :type workers: int, optional
+        :param workers: Number of threads processing the groups. Groups are
+            split into up to ``workers`` parts so that all threads are busy.
+        :rtype: list of lists of :class:`~obspy.core.trace.Trace`
+        """
+        groups = {}
+        for tr in self:
+            if isinstance(tr.data, np.ma.masked_array) or \
+                    tr.data.ndim != 1 or len(tr) == 0:
+                key = id(tr)
+            else:
+                key = (tr.stats.sampling_rate, len(tr), tr.data.dtype)
+            groups.setdefault(key, []).append(tr)
+        if not workers or workers < 2:
+            return list(groups.values())
+        batches = []
+        for traces in groups.values():
+            size = int(math.ceil(len(traces) / float(workers)))
+            batches.extend(traces[i:i + size]
+                           for i in range(0, len(traces), size))
+        return batches
+
+    def _processTraces(self, steps, workers=None):
+        """
+        Applies a sequence of Trace processing methods to all traces.
+
+        Every trace gets the same data and processing information as by
+        calling the methods on each trace one after another. If all methods
+        support it (see :const:`~obspy.core.util.base.BATCHED_PROCESSING`),
+        the traces of a group of :meth:`_getBatches` are stacked into a
+        two-dimensional array once and all steps are applied to it before the
+        rows are written back to the traces.
+
+        :type steps: list of tuples
+        :param steps: Name of the :class:`~obspy.core.trace.Trace` method,
+            positional arguments and keyword arguments for every call.
+        :type workers: int, optional
+        :param workers: Number of threads processing the traces
+            concurrently.
+        """
+        kernels = [_BATCH_KERNELS[method](*args, **dict(kwargs))
+                   if method in _BATCH_KERNELS else None
+                   for method, args, kwargs in steps]
+
+        def _processTrace(tr):
+            for method, args, kwargs in steps:
+                getattr(tr, method)(*args, **kwargs)
+
+        if None in kernels:
+            _mapParallel(_processTrace, self.traces, workers)
+            return
+
+        def _processBatch(traces):
+            if len(traces) == 1:
+                _processTrace(traces[0])
+                return
+            batch = _Batch(traces)
+            for (method, args, kwargs), kernel in zip(steps, kernels):
+                kernel(batch)
+                batch.addProcessingInfo(getattr(Trace, method), *args,
+                                        **kwargs)
+            batch.apply()
+        _mapParallel(_processBatch, self._getBatches(workers), workers)
+
+    def filter(self, type, workers=None, **options):
         """
         Filters the data of all traces in the Stream.
 
@@ -1919,6 +2037,10 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         :param options: Necessary keyword arguments for the respective filter
             that will be passed on. (e.g. ``freqmin=1.0``, ``freqmax=20.0`` for
             ``"bandpass"``)
+        :type workers: int, optional
+        :param workers: Number of threads processing the traces
+            concurrently. Defaults to ``None``, i.e. processing in the calling
+            thread.
 
         .. note::
 
@@ -1929,6 +2051,12 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             This also makes an entry with information on the applied processing
             in ``stats.processing`` of every trace.
 
+        .. note::
+
+            Traces with the same sampling rate, number of samples and data
+            type are filtered at once by the Butterworth and the Cheby2
+            filters. The filter design is computed only once for all traces.
+
         .. rubric:: _`Supported Filter`
 
         ``'bandpass'``
@@ -1968,17 +2096,20 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             st.filter("highpass", freq=1.0)
             st.plot()
         """
-        for tr in self:
-            tr.filter(type, **options)
+        self._processTraces([('filter', (type,), options)], workers)
         return self
 
-    def trigger(self, type, **options):
+    def trigger(self, type, workers=None, **options):
         """
         Runs a triggering algorithm on all traces in the stream.
 
         :param type: String that specifies which trigger is applied (e.g.
             ``'recstalta'``). See the `Supported Trigger`_ section below for
             further details.
+        :type workers: int, optional
+        :param workers: Number of threads processing the traces
+            concurrently. Defaults to ``None``, i.e. processing in the calling
+            thread.
         :param options: Necessary keyword arguments for the respective
             trigger that will be passed on. (e.g. ``sta=3``, ``lta=10``)
             Arguments ``sta`` and ``lta`` (seconds) will be mapped to ``nsta``
@@ -2038,12 +2169,11 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             st.trigger('recstalta', sta=1, lta=4)
             st.plot()
         """
-        for tr in self:
-            tr.trigger(type, **options)
+        self._processTraces([('trigger', (type,), options)], workers)
         return self
 
     def resample(self, sampling_rate, window='hanning', no_filter=True,
-                 strict_length=False):
+                 strict_length=False, workers=None):
         """
         Resample data in all traces of stream using Fourier method.
 
@@ -2059,6 +2189,10 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         :type strict_length: bool, optional
         :param strict_length: Leave traces unchanged for which end time of
             trace would change. Defaults to ``False``.
+        :type workers: int, optional
+        :param workers: Number of threads processing the traces
+            concurrently. Defaults to ``None``, i.e. processing in the calling
+            thread.
 
         .. note::
 
@@ -2097,12 +2231,13 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         BW.RJOB..EHN | 2009-08-24T00:20:03.000000Z ... | 10.0 Hz, 300 samples
         BW.RJOB..EHE | 2009-08-24T00:20:03.000000Z ... | 10.0 Hz, 300 samples
         """
-        for tr in self:
-            tr.resample(sampling_rate, window=native_str(window),
-                        no_filter=no_filter, strict_length=strict_length)
+        kwargs = dict(window=window, no_filter=no_filter,
+                      strict_length=strict_length)
+        self._processTraces([('resample', (sampling_rate,), kwargs)], workers)
         return self
 
-    def decimate(self, factor, no_filter=False, strict_length=False):
+    def decimate(self, factor, no_filter=False, strict_length=False,
+                 workers=None):
         """
         Downsample data in all traces of stream by an integer factor.
 
@@ -2115,6 +2250,10 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         :type strict_length: bool, optional
         :param strict_length: Leave traces unchanged for which end time of
             trace would change. Defaults to ``False``.
+        :type workers: int, optional
+        :param workers: Number of threads processing the traces
+            concurrently. Defaults to ``None``, i.e. processing in the calling
+            thread.
 
         Currently a simple integer decimation is implemented.
         Only every decimation_factor-th sample remains in the trace, all other
@@ -2165,9 +2304,8 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         >>> tr.data
         array([0, 4, 8])
         """
-        for tr in self:
-            tr.decimate(factor, no_filter=no_filter,
-                        strict_length=strict_length)
+        kwargs = dict(no_filter=no_filter, strict_length=strict_length)
+        self._processTraces([('decimate', (factor,), kwargs)], workers)
         return self
 
     def max(self):
@@ -2189,7 +2327,7 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         """
         return [tr.max() for tr in self]
 
-    def differentiate(self, type='gradient'):
+    def differentiate(self, type='gradient', workers=None):
         """
         Method to differentiate all traces with respect to time.
 
@@ -2197,6 +2335,10 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         :param type: Method to use for differentiation. Defaults to
             ``'gradient'``. See the `Supported Methods`_ section below for
             further details.
+        :type workers: int, optional
+        :param workers: Number of threads processing the traces
+            concurrently. Defaults to ``None``, i.e. processing in the calling
+            thread.
 
         .. note::
 
@@ -2215,11 +2357,10 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             hence has the same shape as the input array. (uses
             :func:`numpy.gradient`)
         """
-        for tr in self:
-            tr.differentiate(type=type)
+        self._processTraces([('differentiate', (), dict(type=type))], workers)
         return self
 
-    def integrate(self, type='cumtrapz', **options):
+    def integrate(self, type='cumtrapz', workers=None, **options):
         """
         Method to integrate all traces with respect to time.
 
@@ -2231,6 +2372,10 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         :param type: Method to use for integration. Defaults to
             ``'cumtrapz'``. See :meth:`~obspy.core.trace.Trace.integrate` for
             further details.
+        :type workers: int, optional
+        :param workers: Number of threads processing the traces
+            concurrently. Defaults to ``None``, i.e. processing in the calling
+            thread.
 
         .. note::
 
@@ -2241,18 +2386,22 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             This also makes an entry with information on the applied processing
             in ``stats.processing`` of every trace.
         """
-        for tr in self:
-            tr.integrate(type=type, **options)
+        self._processTraces([('integrate', (), dict(options, type=type))],
+                            workers)
         return self
 
     @raiseIfMasked
-    def detrend(self, type='simple'):
+    def detrend(self, type='simple', workers=None):
         """
         Method to remove a linear trend from all traces.
 
         :type type: str, optional
         :param type: Method to use for detrending. Defaults to ``'simple'``.
             See the `Supported Methods`_ section below for further details.
+        :type workers: int, optional
+        :param workers: Number of threads processing the traces
+            concurrently. Defaults to ``None``, i.e. processing in the calling
+            thread.
 
         .. note::
 
@@ -2276,8 +2425,7 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         ``'constant'`` or ``'demean'``
             Mean of data is subtracted (uses :func:`scipy.signal.detrend`).
         """
-        for tr in self:
-            tr.detrend(type=type)
+        self._processTraces([('detrend', (), dict(type=type))], workers)
         return self
 
     def taper(self, *args, **kwargs):
@@ -2285,7 +2433,9 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         Method to taper all Traces in Stream.
 
         For details see the corresponding :meth:`~obspy.core.trace.Trace.taper`
-        method of :class:`~obspy.core.trace.Trace`.
+        method of :class:`~obspy.core.trace.Trace`. The traces are processed
+        concurrently in a thread pool if the additional keyword argument
+        ``workers`` is set to more than one thread.
 
         .. note::
 
@@ -2294,8 +2444,8 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             original data, use :meth:`~obspy.core.stream.Stream.copy` to create
             a copy of your stream object.
         """
-        for tr in self:
-            tr.taper(*args, **kwargs)
+        workers = kwargs.pop('workers', None)
+        self._processTraces([('taper', args, kwargs)], workers)
         return self
 
     def interpolate(self, *args, **kwargs):
@@ -2554,10 +2704,15 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
                     comp.stats.inclination = inclination
         return self
 
-    def copy(self):
+    def copy(self, copy_data=True):
         """
         Returns a deepcopy of the Stream object.
 
+        :type copy_data: bool, optional
+        :param copy_data: If ``False``, the data is not copied. The traces of
+            the copy get read-only views on the data of the traces of the
+            stream, which is left unchanged, see
+            :meth:`~obspy.core.trace.Trace.copy`. Defaults to ``True``.
         :rtype: :class:`~obspy.core.stream.Stream`
         :return: Copy of current stream.
 
@@ -2588,8 +2743,57 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             True
             >>> st == st3
             True
+
+        3. Copy the stream for alternative processing without copying the
+           data. Both streams share it until it is processed.
+
+            >>> st4 = st.copy(copy_data=False)
+            >>> st4 == st
+            True
+            >>> st4.filter('lowpass', freq=1.0)  # doctest: +ELLIPSIS
+            <...Stream object at 0x...>
+            >>> st4 == st
+            False
+        """
+        if copy_data:
+            return copy.deepcopy(self)
+        return _copySharingData(self, self)
+
+    def lazy(self, padding=None, workers=None):
         """
-        return copy.deepcopy(self)
+        Returns a view on the stream which defers processing until the data
+        is needed.
+
+        The processing calls on the returned object are recorded and executed
+        in place on this stream in a single pass where possible as soon as
+        the traces are accessed. See
+        :class:`~obspy.core.pipeline.LazyStream` for details.
+
+        :type padding: float, optional
+        :param padding: Length in seconds of data kept before a trim window
+            when moving a trim before a recursive filter, see
+            :class:`~obspy.core.pipeline.LazyStream`.
+        :type workers: int, optional
+        :param workers: Number of threads processing the traces
+            concurrently.
+        :rtype: :class:`~obspy.core.pipeline.LazyStream`
+
+        .. rubric:: Example
+
+        >>> from obspy import read, UTCDateTime
+        >>> st = read()
+        >>> t = UTCDateTime("2009-08-24T00:20:10")
+        >>> st.lazy().filter('lowpass', freq=5.0).trim(t, t + 5).execute()
+        ... # doctest: +ELLIPSIS
+        <...Stream object at 0x...>
+        >>> print(st)  # doctest: +ELLIPSIS
+        3 Trace(s) in Stream:
+        BW.RJOB..EHZ | 2009-08-24T00:20:10.000000Z ... | 100.0 Hz, 501 samples
+        BW.RJOB..EHN | 2009-08-24T00:20:10.000000Z ... | 100.0 Hz, 501 samples
+        BW.RJOB..EHE | 2009-08-24T00:20:10.000000Z ... | 100.0 Hz, 501 samples
+        """
+        from obspy.core.pipeline import LazyStream
+        return LazyStream(self, padding=padding, workers=workers)
 
     def clear(self):
         """
@@ -2682,50 +2886,57 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
                 warnings.warn(msg)
                 return
         # order matters!
-        self.sort(keys=['network', 'station', 'location', 'channel',
-                        'starttime', 'endtime'])
-        # build up dictionary with lists of traces with same ids
-        traces_dict = {}
-        # using pop() and try-except saves memory
-        try:
-            while True:
-                trace = self.traces.pop(0)
-                # add trace to respective list or create that list
-                traces_dict.setdefault(trace.id, []).append(trace)
-        except IndexError:
-            pass
+        order, codes, starttimes, endtimes = self._getSortedTimes()
+        traces = [self.traces[_i] for _i in order]
+        # work with integer nanoseconds, times closer than the default
+        # precision of UTCDateTime are considered equal
+        tolerance = 10 ** max(9 - UTCDateTime.DEFAULT_PRECISION, 0) // 2
+        starttimes = starttimes.ns.tolist()
+        endtimes = endtimes.ns.tolist()
+        deltas = UTCDateTimeArray._secondsToNanoseconds(
+            [tr.stats.delta for tr in traces]).tolist()
+        codes = codes.tolist()
         # clear traces of current stream
         self.traces = []
-        # loop through ids
-        for id_ in traces_dict.keys():
-            trace_list = traces_dict[id_]
-            cur_trace = trace_list.pop(0)
-            # work through all traces of same id
-            while trace_list:
-                trace = trace_list.pop(0)
-                # we have some common parts: check if consistent
-                if trace.stats.starttime <= cur_trace.stats.endtime:
-                    # check if common time slice [t1 --> t2] is equal:
-                    t1 = trace.stats.starttime
-                    t2 = min(cur_trace.stats.endtime, trace.stats.endtime)
-                    # if consistent: add them together
-                    if np.array_equal(cur_trace.slice(t1, t2).data,
-                                      trace.slice(t1, t2).data):
-                        cur_trace += trace
-                    # if not consistent: leave them alone
-                    else:
-                        self.traces.append(cur_trace)
-                        cur_trace = trace
-                # traces are perfectly adjacent: add them together
-                elif trace.stats.starttime == cur_trace.stats.endtime + \
-                        cur_trace.stats.delta:
-                    cur_trace += trace
-                # no common parts (gap):
-                # leave traces alone and add current to list
+        # directly adjacent traces are collected and concatenated at once
+        chain = []
+        for _i, trace in enumerate(traces):
+            # first trace of an id
+            if _i == 0 or codes[_i] != codes[_i - 1]:
+                if chain:
+                    self.traces.append(_concatenateTraces(chain))
+                chain = [trace]
+                cur_end = endtimes[_i]
+                continue
+            gap = starttimes[_i] - cur_end
+            # we have some common parts: check if consistent
+            if gap <= tolerance:
+                cur_trace = _concatenateTraces(chain)
+                # check if common time slice [t1 --> t2] is equal:
+                t1 = trace.stats.starttime
+                t2 = min(cur_trace.stats.endtime, trace.stats.endtime)
+                # if consistent: add them together
+                if np.array_equal(cur_trace.slice(t1, t2).data,
+                                  trace.slice(t1, t2).data):
+                    chain = [cur_trace + trace]
+                    cur_end = max(cur_end, endtimes[_i])
+                # if not consistent: leave them alone
                 else:
                     self.traces.append(cur_trace)
-                    cur_trace = trace
-            self.traces.append(cur_trace)
+                    chain = [trace]
+                    cur_end = endtimes[_i]
+            # traces are perfectly adjacent: add them together
+            elif abs(gap - deltas[_i]) <= tolerance:
+                chain.append(trace)
+                cur_end = endtimes[_i]
+            # no common parts (gap):
+            # leave traces alone and add current to list
+            else:
+                self.traces.append(_concatenateTraces(chain))
+                chain = [trace]
+                cur_end = endtimes[_i]
+        if chain:
+            self.traces.append(_concatenateTraces(chain))
         self.traces = [tr for tr in self.traces if tr.stats.npts]
 
     def split(self):
@@ -2795,7 +3006,9 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
 
         For details see the corresponding
         :meth:`~obspy.core.trace.Trace.remove_response` method of
-        :class:`~obspy.core.trace.Trace`.
+        :class:`~obspy.core.trace.Trace`. The traces are processed
+        concurrently in a thread pool if the additional keyword argument
+        ``workers`` is set to more than one thread.
 
         >>> from obspy import read
         >>> st = read()
@@ -2828,11 +3041,428 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             original data, use :meth:`~obspy.core.stream.Stream.copy` to create
             a copy of your stream object.
         """
-        for tr in self:
-            tr.remove_response(*args, **kwargs)
+        workers = kwargs.pop('workers', None)
+        self._processTraces([('remove_response', args, kwargs)], workers)
         return self
 
 
+def _mapParallel(func, items, workers=None):
+    """
+    Calls ``func`` for every item, concurrently in a thread pool with the
+    given number of threads if ``workers`` is larger than one.
+
+    The items must be independent of each other, e.g. distinct traces or
+    batches of traces. Exceptions are raised in the calling thread.
+
+    :return: List of the return values of ``func`` in order of the items.
+    """
+    if not workers or workers < 2 or len(items) < 2:
+        return [func(item) for item in items]
+    pool = ThreadPool(min(workers, len(items)))
+    try:
+        return pool.map(func, items, chunksize=1)
+    except:
+        pool.terminate()
+        raise
+    finally:
+        pool.close()
+        pool.join()
+
+
+class _Batch(object):
+    """
+    Traces with the same sampling rate, number of samples and data type which
+    are processed at once as rows of a two-dimensional array, see
+    :meth:`Stream._getBatches`.
+
+    The processing functions work on :attr:`data` and :attr:`sampling_rate`
+    only. The traces are not changed until :meth:`apply` is called.
+    """
+    def __init__(self, traces):
+        self.traces = traces
+        self.data = np.vstack([tr.data for tr in traces])
+        self.sampling_rate = traces[0].stats.sampling_rate
+        self.processing = []
+
+    @property
+    def npts(self):
+        return self.data.shape[-1]
+
+    @property
+    def delta(self):
+        return 1.0 / float(self.sampling_rate)
+
+    def addProcessingInfo(self, method, *args, **kwargs):
+        """
+        Adds the processing information of the equivalent call of the given
+        :class:`~obspy.core.trace.Trace` method.
+        """
+        if not Trace.PROCESSING_INFO:
+            return
+        info = _newProcessingInfo(method, self.traces[0], *args, **kwargs)
+        self.processing.append(info)
+
+    def apply(self):
+        """
+        Writes data, sampling rate and processing information to the traces.
+
+        The rows are views on the processed data, i.e. the data is not copied
+        again.
+        """
+        for tr, row in zip(self.traces, self.data):
+            tr.data = row
+            tr.stats.sampling_rate = self.sampling_rate
+            for info in self.processing:
+                tr._addProcessingInfo(info)
+
+
+def _filterKernel(type, **options):
+    """
+    Returns the function applying :meth:`Trace.filter` to a :class:`_Batch`
+    or ``None`` if the filter does not support two-dimensional data.
+    """
+    type = type.lower()
+    if type not in BATCHED_PROCESSING['filter']:
+        return None
+    func = _getFunctionFromEntryPoint('filter', type)
+
+    def kernel(batch):
+        batch.data = func(batch.data, df=batch.sampling_rate, **options)
+    return kernel
+
+
+def _detrendKernel(type='simple', **options):
+    """
+    Returns the function applying :meth:`Trace.detrend` to a
+    :class:`_Batch` or ``None`` if not supported.
+    """
+    type = type.lower()
+    if type not in BATCHED_PROCESSING['detrend']:
+        return None
+    func = _getFunctionFromEntryPoint('detrend', type)
+    if func.__module__.startswith('scipy'):
+        # SciPy need to set the type keyword
+        options['type'] = 'constant' if type == 'demean' else type
+
+    def kernel(batch):
+        batch.data = func(batch.data, **options)
+    return kernel
+
+
+def _taperKernel(*args, **kwargs):
+    """
+    Returns the function applying :meth:`Trace.taper` to a :class:`_Batch`
+    or ``None`` for the deprecated call syntax.
+    """
+    if 'p' in kwargs or ('max_percentage' not in kwargs and (
+            not args or isinstance(args[0], (str, native_str)) or
+            'type' in kwargs)):
+        return None
+
+    def kernel(batch):
+        taper = _getTaper(batch.npts, batch.sampling_rate, *args, **kwargs)
+        # not in place, the result has the same dtype as by Trace.taper
+        batch.data = batch.data * taper
+    return kernel
+
+
+def _differentiateKernel(type='gradient', **options):
+    """
+    Returns the function applying :meth:`Trace.differentiate` to a
+    :class:`_Batch` or ``None`` if not supported.
+    """
+    type = type.lower()
+    if type not in BATCHED_PROCESSING['differentiate'] or options:
+        return None
+    func = _getFunctionFromEntryPoint('differentiate', type)
+
+    def kernel(batch):
+        try:
+            batch.data = func(batch.data, batch.delta, axis=-1)
+        except TypeError:
+            # NumPy < 1.11 has no axis keyword and computes the gradient
+            # along all axes
+            batch.data = func(batch.data, 1.0, batch.delta)[-1]
+    return kernel
+
+
+def _integrateKernel(type='cumtrapz', **options):
+    """
+    Returns the function applying :meth:`Trace.integrate` to a
+    :class:`_Batch` or ``None`` if not supported.
+    """
+    type = type.lower()
+    if type not in BATCHED_PROCESSING['integrate']:
+        return None
+    func = _getFunctionFromEntryPoint('integrate', type)
+
+    def kernel(batch):
+        kwargs = dict(options)
+        kwargs.setdefault('dx', batch.delta)
+        batch.data = func(batch.data, **kwargs)
+    return kernel
+
+
+def _triggerKernel(type, **options):
+    """
+    Returns the function applying :meth:`Trace.trigger` to a :class:`_Batch`
+    or ``None`` if the trigger does not support two-dimensional data.
+    """
+    type = type.lower()
+    if type not in BATCHED_PROCESSING['trigger']:
+        return None
+    func = _getFunctionFromEntryPoint('trigger', type)
+
+    def kernel(batch):
+        kwargs = dict(options)
+        for key in ['sta', 'lta']:
+            if key in kwargs:
+                kwargs['n%s' % (key)] = int(kwargs.pop(key) *
+                                            batch.sampling_rate)
+        batch.data = func(batch.data, **kwargs)
+    return kernel
+
+
+def _lowpassBatch(batch, factor):
+    """
+    Applies the automatic lowpass filter of :meth:`Trace.resample` and
+    :meth:`Trace.decimate` to a :class:`_Batch`.
+
+    :param factor: Ratio of current to new sampling rate.
+    """
+    freq = batch.sampling_rate * 0.5 / float(factor)
+    _filterKernel('lowpassCheby2', freq=freq, maxorder=12)(batch)
+    batch.addProcessingInfo(Trace.filter, 'lowpassCheby2', freq=freq,
+                            maxorder=12)
+
+
+def _resampleKernel(sampling_rate, window='hanning', no_filter=True,
+                    strict_length=False):
+    """
+    Returns the function applying :meth:`Trace.resample` to a
+    :class:`_Batch`.
+    """
+    def kernel(batch):
+        factor = batch.sampling_rate / float(sampling_rate)
+        _checkResampling(batch.npts, factor, no_filter, strict_length,
+                         'resample')
+        # do automatic lowpass filtering
+        if not no_filter:
+            _lowpassBatch(batch, factor)
+        batch.data = _resampleData(batch.data, batch.sampling_rate,
+                                   sampling_rate, window=window)
+        batch.sampling_rate = sampling_rate
+    return kernel
+
+
+def _decimateKernel(factor, no_filter=False, strict_length=False):
+    """
+    Returns the function applying :meth:`Trace.decimate` to a
+    :class:`_Batch`.
+    """
+    from obspy.signal import integerDecimation
+
+    def kernel(batch):
+        _checkResampling(batch.npts, factor, no_filter, strict_length,
+                         'decimate')
+        # do automatic lowpass filtering
+        if not no_filter:
+            _lowpassBatch(batch, factor)
+        batch.data = integerDecimation(batch.data, factor)
+        batch.sampling_rate = batch.sampling_rate / float(factor)
+    return kernel
+
+
+# functions returning the processing function of a _Batch for a call of the
+# Trace method with the given arguments, see Stream._processTraces()
+_BATCH_KERNELS = {
+    'filter': _filterKernel,
+    'detrend': _detrendKernel,
+    'taper': _taperKernel,
+    'differentiate': _differentiateKernel,
+    'integrate': _integrateKernel,
+    'trigger': _triggerKernel,
+    'resample': _resampleKernel,
+    'decimate': _decimateKernel,
+}
+
+
+def _concatenateTraces(traces):
+    """
+    Returns a trace containing the data of the given directly adjacent
+    traces. The result is the same as adding the traces one after another
+    but the data is only copied once.
+    """
+    first = traces[0]
+    if len(traces) == 1:
+        return first
+    for trace in traces[1:]:
+        if trace.stats.sampling_rate != first.stats.sampling_rate or \
+                trace.stats.calib != first.stats.calib or \
+                trace.data.dtype != first.data.dtype:
+            # let Trace.__add__ complain about incompatible traces
+            for trace in traces[1:]:
+                first = first + trace
+            return first
+    out = first.__class__(header=copy.deepcopy(first.stats))
+    data = [trace.data for trace in traces]
+    if True in [isinstance(_i, np.ma.masked_array) for _i in data]:
+        data = np.ma.concatenate(data)
+        # Check if we can downgrade to normal ndarray
+        if np.ma.count_masked(data) == 0:
+            data = data.compressed()
+    else:
+        data = np.require(np.concatenate(data), dtype=first.data.dtype)
+    out.data = data
+    return out
+
+
+def _mergeTraces(traces, method=0, fill_value=None, interpolation_samples=0):
+    """
+    Merges traces with the same id sorted by start time.
+
+    The result is the same as adding the traces one after another using
+    :meth:`~obspy.core.trace.Trace.__add__`. Runs of traces are however merged
+    at once: the length of the output and the position of each trace, gap
+    and resolved overlap are computed first and each piece is copied exactly
+    once into a preallocated array. Only overlaps which can not be resolved
+    this way, e.g. contained traces or overlaps reaching into masked data,
+    are handled by adding the traces one by one.
+    """
+    cur_trace = traces[0]
+    # pieces of data following the current trace as (offset, data), later
+    # pieces replace the overlapping samples of earlier ones
+    run = []
+    # state of the merged trace - same floating point operations as
+    # Trace.__add__() and Stats to get the identical result
+    npts = len(cur_trace)
+    dtype = cur_trace.data.dtype
+    is_masked = isinstance(cur_trace.data, np.ma.masked_array)
+    has_masked = is_masked and np.ma.count_masked(cur_trace.data) > 0
+    # last piece of the run, always ending with the merged data
+    last = cur_trace.data
+    stats = cur_trace.stats
+    timestamp, sr, dt = stats.starttime.timestamp, stats.sampling_rate, \
+        stats.delta
+    for trace in traces[1:]:
+        endtime = timestamp + (npts - 1) * dt
+        starttime = trace.stats.starttime
+        delta = round(starttime.timestamp - endtime,
+                      starttime.precision) * sr
+        delta = int(compatibility.round_away(delta)) - 1
+        if delta < 0:
+            # overlap or contained trace
+            pieces = _resolveOverlap(last, trace.data, -delta, dtype, method,
+                                     fill_value, interpolation_samples)
+            if pieces is not None:
+                offset = npts + delta
+                for piece in pieces:
+                    run.append((offset, piece))
+                    offset += len(piece)
+                    if isinstance(piece, np.ma.masked_array):
+                        is_masked = has_masked = True
+                npts = offset
+                last = pieces[-1]
+                continue
+            cur_trace = _fillTrace(cur_trace, run, npts, dtype, has_masked)
+            cur_trace = cur_trace.__add__(
+                trace, method, fill_value=fill_value, sanity_checks=False,
+                interpolation_samples=interpolation_samples)
+            run = []
+            npts = len(cur_trace)
+            dtype = cur_trace.data.dtype
+            is_masked = isinstance(cur_trace.data, np.ma.masked_array)
+            has_masked = is_masked
+            last = cur_trace.data
+            stats = cur_trace.stats
+            timestamp, sr, dt = stats.starttime.timestamp, \
+                stats.sampling_rate, stats.delta
+            continue
+        gap = None
+        if delta > 0:
+            # gap - use fixed value or interpolate in between
+            if fill_value == "latest":
+                value = last[-1]
+            elif fill_value == "interpolate":
+                value = (last[-1], trace.data[0])
+            else:
+                value = fill_value
+            gap = createEmptyDataChunk(delta, dtype, value)
+            run.append((npts, gap))
+        pieces = [cur_trace.data if is_masked else None, gap, trace.data]
+        if True in [isinstance(_i, np.ma.masked_array) for _i in pieces]:
+            dtype = np.result_type(dtype, *[_i.dtype for _i in pieces[1:]
+                                            if _i is not None])
+            has_masked = has_masked or \
+                True in [np.ma.count_masked(_i) > 0 for _i in pieces[1:]
+                         if isinstance(_i, np.ma.masked_array)]
+            # Check if we can downgrade to normal ndarray
+            is_masked = has_masked
+        run.append((npts + delta, trace.data))
+        npts += delta + len(trace)
+        last = trace.data
+    return _fillTrace(cur_trace, run, npts, dtype, has_masked)
+
+
+def _resolveOverlap(last, data, overlap, dtype, method, fill_value,
+                    interpolation_samples):
+    """
+    Returns the pieces replacing the last ``overlap`` samples of the merged
+    data and following them, see :meth:`~obspy.core.trace.Trace.__add__`.
+
+    ``last`` is the last piece of the merged data. ``None`` is returned if
+    the overlap can not be resolved from it, i.e. if the overlapping samples
+    are not all part of the unmasked last piece or if the trace is
+    contained in the merged data.
+    """
+    if isinstance(last, np.ma.masked_array) or \
+            isinstance(data, np.ma.masked_array) or \
+            last.dtype != dtype or data.dtype != dtype or \
+            len(last) <= overlap or len(data) <= overlap:
+        return None
+    if np.all(np.equal(last[-overlap:], data[:overlap])):
+        # data are the same
+        return [data]
+    if method == 0:
+        if fill_value == "latest":
+            fill_value = last[-1]
+        elif fill_value == "interpolate":
+            fill_value = (last[-1], data[0])
+        return [createEmptyDataChunk(overlap, dtype, fill_value),
+                data[overlap:]]
+    if method == 1 and interpolation_samples >= -1:
+        if interpolation_samples == -1 or interpolation_samples > overlap:
+            interpolation_samples = overlap
+        # include left and right sample (overlap + 2)
+        interpolation = np.linspace(last[-overlap - 1],
+                                    data[interpolation_samples],
+                                    interpolation_samples + 2)
+        # cut left and right sample and ensure correct data type
+        interpolation = np.require(interpolation[1:-1], dtype)
+        return [interpolation, data[interpolation_samples:]]
+    return None
+
+
+def _fillTrace(trace, run, npts, dtype, masked):
+    """
+    Returns a new trace with the data of a trace followed by the pieces of a
+    run, see :func:`_mergeTraces`.
+    """
+    if not run:
+        return trace
+    data = np.empty(npts, dtype=dtype)
+    mask = np.zeros(npts, dtype=np.bool_) if masked else None
+    for offset, piece in [(0, trace.data)] + run:
+        data[offset:offset + len(piece)] = np.ma.getdata(piece)
+        if masked:
+            mask[offset:offset + len(piece)] = np.ma.getmaskarray(piece)
+    if masked:
+        data = np.ma.masked_array(data, mask=mask)
+    out = trace.__class__(header=copy.deepcopy(trace.stats))
+    out.data = data
+    return out
+
+
 def isPickle(filename):  # @UnusedVariable
     """
     Checks whether a file is a pickled ObsPy Stream file.
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from future.builtins import *  # NOQA
+
+from obspy import read, UTCDateTime
+from obspy.core.pipeline import LazyStream, _optimize
+import numpy as np
+import unittest
+
+
+class LazyStreamTestCase(unittest.TestCase):
+    """
+    Test suite for obspy.core.pipeline.LazyStream.
+    """
+
+    def test_deferredExecution(self):
+        """
+        Processing is only done once the traces are accessed.
+        """
+        st = read()
+        data = st[0].data.copy()
+        lazy = st.lazy()
+        self.assertTrue(isinstance(lazy, LazyStream))
+        lazy.detrend('demean').filter('highpass', freq=1.0)
+        np.testing.assert_array_equal(st[0].data, data)
+        self.assertEqual(len(lazy), 3)
+        self.assertEqual(len(st[0].stats.processing), 2)
+        self.assertFalse(np.array_equal(st[0].data, data))
+        # recorded steps are only executed once
+        self.assertTrue(lazy.execute() is st)
+        self.assertEqual(len(st[0].stats.processing), 2)
+
+    def test_fusedProcessing(self):
+        """
+        Fused processing gives the same result as processing step by step.
+        """
+        st = read()
+        st += read()
+        st[3].data = st[3].data[:2000]
+        expected = st.copy()
+        expected.detrend('linear')
+        expected.taper(max_percentage=0.05)
+        expected.filter('bandpass', freqmin=1.0, freqmax=10.0)
+        expected.decimate(2)
+        processed = st.copy().lazy().detrend('linear') \
+            .taper(max_percentage=0.05) \
+            .filter('bandpass', freqmin=1.0, freqmax=10.0) \
+            .decimate(2).execute()
+        self.assertEqual(len(processed), len(expected))
+        for tr, tr_expected in zip(processed, expected):
+            self.assertEqual(tr.stats, tr_expected.stats)
+            np.testing.assert_allclose(tr.data, tr_expected.data,
+                                       rtol=1e-10, atol=1e-10)
+
+    def test_trimBeforeFilter(self):
+        """
+        Trims are moved before causal filters without changing the result.
+        """
+        st = read()
+        t = UTCDateTime("2009-08-24T00:20:10")
+        expected = st.copy()
+        expected.filter('lowpass', freq=5.0)
+        expected.differentiate()
+        expected.trim(t, t + 5)
+        lazy = st.copy().lazy().filter('lowpass', freq=5.0).differentiate()
+        lazy.trim(t, t + 5)
+        steps = _optimize(lazy._steps)
+        self.assertEqual([step[0] for step in steps],
+                         ['_preTrim', 'filter', 'differentiate', '_trim'])
+        processed = lazy.execute()
+        for tr, tr_expected in zip(processed, expected):
+            self.assertEqual(tr.stats.starttime, tr_expected.stats.starttime)
+            self.assertEqual(tr.stats.npts, tr_expected.stats.npts)
+            np.testing.assert_array_equal(tr.data, tr_expected.data)
+
+    def test_optimizeTrim(self):
+        """
+        The start of the data is only cut before recursive filters if padding
+        is given. Trims are not moved before other processing.
+        """
+        t = UTCDateTime("2009-08-24T00:20:10")
+        steps = [('filter', ('lowpass',), dict(freq=5.0, zerophase=True)),
+                 ('trim', (t, t + 5), {})]
+        self.assertEqual([step[0] for step in _optimize(steps)],
+                         ['filter', 'trim'])
+        optimized = _optimize(steps, padding=10.0)
+        self.assertEqual([step[0] for step in optimized],
+                         ['_preTrim', 'filter', '_trim'])
+        self.assertEqual(optimized[0][2]['left'], (10.0, 0))
+        self.assertEqual(optimized[0][2]['right'], (10.0, 0))
+        steps = [('taper', (0.05,), {}), ('trim', (t, t + 5), {})]
+        self.assertEqual([step[0] for step in _optimize(steps)],
+                         ['taper', 'trim'])
+        steps = [('filter', ('lowpass',), dict(freq=5.0)),
+                 ('trim', (t, t + 5), dict(pad=True))]
+        self.assertEqual([step[0] for step in _optimize(steps)],
+                         ['filter', 'trim'])
+
+
+def suite():
+    return unittest.makeSuite(LazyStreamTestCase, 'test')
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
@@ -15,7 +15,8 @@ from lxml import etree
 from obspy.core.event import ResourceIdentifier, WaveformStreamID, Magnitude, \
     Origin, Event, Tensor, MomentTensor, FocalMechanism, Catalog, readEvents, \
     Pick
-from obspy.core.quakeml import readQuakeML, Pickler, writeQuakeML
+from obspy.core.quakeml import readQuakeML, Pickler, Unpickler, \
+    writeQuakeML, iterQuakeML
 from obspy.core.utcdatetime import UTCDateTime
 from obspy.core.util import AttribDict
 from obspy.core.util.base import NamedTemporaryFile
@@ -974,6 +975,66 @@ class QuakeMLTestCase(unittest.TestCase):
         self.assertTrue(hasattr(cat, "nsmap"))
         self.assertTrue(getattr(cat, "nsmap")['ns0'] == nsmap['ns0'])
 
+    def test_iter_events(self):
+        """
+        Reading events one by one gives the same events as reading the whole
+        catalog, the criteria are checked against the preferred origin and
+        magnitude.
+        """
+        for filename in ('iris_events.xml', 'preferred.xml',
+                         'quakeml_1.2_origin.xml'):
+            filename = os.path.join(self.path, filename)
+            catalog = readQuakeML(filename)
+            self.assertEqual(list(iterQuakeML(filename)), catalog.events)
+            with open(filename, 'rb') as fh:
+                data = fh.read()
+            self.assertEqual(list(iterQuakeML(io.BytesIO(data))),
+                             catalog.events)
+        filename = os.path.join(self.path, 'iris_events.xml')
+        events = list(iterQuakeML(filename, minmagnitude=9.0,
+                                  maxmagnitude=9.5))
+        self.assertEqual([str(ev.resource_id) for ev in events],
+                         ['smi:www.iris.edu/ws/event/query?eventId=3279407'])
+        events = iterQuakeML(filename, starttime=UTCDateTime(2010, 1, 1),
+                             minlatitude=38.0, maxlongitude=150.0)
+        self.assertEqual(len(list(events)), 1)
+        events = iterQuakeML(filename, endtime=UTCDateTime(2010, 1, 1),
+                             minlongitude=122.0)
+        self.assertEqual(list(events), [])
+        # the preferred magnitude is used
+        filename = os.path.join(self.path, 'preferred.xml')
+        event = readQuakeML(filename)[0]
+        mag = event.preferred_magnitude().mag
+        self.assertNotEqual(mag, event.magnitudes[0].mag)
+        self.assertEqual(len(list(iterQuakeML(filename, minmagnitude=mag))),
+                         1)
+        self.assertEqual(
+            len(list(iterQuakeML(filename, minmagnitude=mag + 0.01))), 0)
+        # not a QuakeML file
+        filename = os.path.join(self.path, 'stationxml_BK.CMB.__.LKS.xml')
+        self.assertRaises(Exception, list, iterQuakeML(filename))
+
+    def test_child_lookup(self):
+        """
+        Child elements are looked up by tag in document order, other
+        expressions are evaluated as XPath.
+        """
+        xml = b"""<?xml version="1.0" encoding="utf-8"?>
+<root xmlns="http://quakeml.org/xmlns/bed/1.2" xmlns:ns0="http://test.org">
+  <a>1</a><b/><!-- comment --><a>2</a><ns0:a>3</ns0:a>
+  <b><a>4</a></b>
+</root>"""
+        unpickler = Unpickler(etree.parse(io.BytesIO(xml)))
+        self.assertEqual([el.text for el in unpickler._xpath('a')],
+                         ['1', '2'])
+        self.assertEqual(len(unpickler._xpath('b')), 2)
+        self.assertEqual(unpickler._xpath('c'), [])
+        self.assertEqual(unpickler._xpath2obj('a', convert_to=int), 1)
+        elements = unpickler._xpath('a', namespace='http://test.org')
+        self.assertEqual([el.text for el in elements], ['3'])
+        self.assertEqual([el.text for el in unpickler._xpath('b/b:a')],
+                         ['4'])
+
 
 def suite():
     return unittest.makeSuite(QuakeMLTestCase, 'test')
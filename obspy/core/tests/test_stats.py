@@ -4,9 +4,10 @@ from __future__ import (absolute_import, division, print_function,
 from future.builtins import *  # NOQA
 
 from obspy import Stream, Trace, UTCDateTime
-from obspy.core import Stats
+from obspy.core import Stats, CompactStats
 from obspy.core.util import AttribDict
 import copy
+import numpy as np
 import pickle
 import unittest
 import warnings
@@ -227,6 +228,75 @@ class StatsTestCase(unittest.TestCase):
         self.assertEqual(ad, adict)
         self.assertEqual(adict, ad)
 
+    def test_compactStats(self):
+        """
+        CompactStats behaves like Stats.
+        """
+        header = {'network': 'BW', 'station': 'RJOB', 'npts': 11,
+                  'starttime': UTCDateTime(2014, 1, 1), 'delta': 0.5,
+                  'mseed': {'dataquality': 'D'}, 'test': 1}
+        stats = CompactStats(header)
+        expected = Stats(header)
+        self.assertEqual(stats, expected)
+        self.assertEqual(expected, stats)
+        self.assertEqual(sorted(stats), sorted(expected))
+        self.assertEqual(len(stats), len(expected))
+        self.assertEqual(str(stats), str(expected))
+        self.assertEqual(stats.endtime, UTCDateTime(2014, 1, 1, 0, 0, 5))
+        self.assertEqual(stats['sampling_rate'], 2.0)
+        self.assertEqual(stats.mseed.__class__, AttribDict)
+        # derived values follow changes
+        stats.sampling_rate = 10
+        stats.npts = 21
+        self.assertEqual(stats.delta, 0.1)
+        self.assertEqual(stats.endtime, UTCDateTime(2014, 1, 1, 0, 0, 2))
+        stats.starttime = '2014-01-02'
+        self.assertEqual(stats.endtime, UTCDateTime(2014, 1, 2, 0, 0, 2))
+        self.assertRaises(AttributeError, stats.__setitem__, 'endtime',
+                          UTCDateTime())
+        # deleting resets default attributes
+        del stats.network
+        self.assertEqual(stats.network, '')
+        del stats.test
+        self.assertFalse('test' in stats)
+        # copying and pickling
+        stats2 = copy.deepcopy(stats)
+        self.assertEqual(stats2.__class__, CompactStats)
+        self.assertEqual(stats2, stats)
+        stats2.mseed.dataquality = 'Q'
+        self.assertEqual(stats.mseed.dataquality, 'D')
+        for protocol in (0, 1, 2):
+            stats2 = pickle.loads(pickle.dumps(stats, protocol=protocol))
+            self.assertEqual(stats2.__class__, CompactStats)
+            self.assertEqual(stats2, stats)
+        with warnings.catch_warnings(record=True):
+            warnings.simplefilter('error', UserWarning)
+            self.assertRaises(UserWarning, stats.__setitem__, 'calib', 0)
+
+    def test_compactStatsTrace(self):
+        """
+        Traces use CompactStats if given as header or switched on.
+        """
+        tr = Trace(data=np.arange(10), header=CompactStats({'station': 'A'}))
+        self.assertEqual(tr.stats.__class__, CompactStats)
+        self.assertEqual(tr.stats.npts, 10)
+        tr.data = tr.data[:5]
+        self.assertEqual(tr.stats.npts, 5)
+        self.assertEqual(tr.stats.endtime, UTCDateTime(4))
+        tr.detrend()
+        self.assertEqual(len(tr.stats.processing), 1)
+        tr2 = tr.copy()
+        self.assertEqual(tr2.stats.__class__, CompactStats)
+        self.assertEqual(tr2, tr)
+        tr.verify()
+        Trace.COMPACT_STATS = True
+        try:
+            st = Stream([Trace(data=np.arange(10))])
+        finally:
+            Trace.COMPACT_STATS = False
+        self.assertEqual(st[0].stats.__class__, CompactStats)
+        self.assertEqual(Trace().stats.__class__, Stats)
+
 
 def suite():
     return unittest.makeSuite(StatsTestCase, 'test')
@@ -12,6 +12,7 @@ from obspy.core.util.base import (NamedTemporaryFile, getMatplotlibVersion,
                                   getSciPyVersion)
 from obspy.xseed import Parser
 from obspy.core.util.decorator import skipIf
+from obspy.core.util.misc import TemporaryWorkingDirectory
 import numpy as np
 import os
 import pickle
@@ -1067,6 +1068,93 @@ class StreamTestCase(unittest.TestCase):
             (4 * 1440 - 1) * trace1.stats.delta
         self.assertEqual(st[0].stats.endtime, endtime)
 
+    def test_mergeManyTracesLikeAdding(self):
+        """
+        Merging many traces with gaps, masked values and some overlaps gives
+        the same result as adding them one after another.
+        """
+        np.random.seed(815)
+        st = Stream()
+        t = UTCDateTime(0)
+        for _i in range(300):
+            npts = np.random.randint(1, 20)
+            tr = Trace(data=np.random.randint(0, 100, npts).astype(np.int32))
+            if _i % 50 == 7:
+                tr.data = np.ma.masked_array(tr.data)
+                tr.data[0] = np.ma.masked
+            tr.stats.starttime = t
+            tr.stats.sampling_rate = 100.0
+            st.append(tr)
+            t += (npts + np.random.randint(-2 if _i % 30 == 0 else 0, 6) +
+                  (np.random.rand() - 0.5) * 0.4) / 100.0
+        for fill_value in [None, 0, 'latest', 'interpolate']:
+            for method in [0, 1]:
+                expected = st[0].copy()
+                for tr in st[1:]:
+                    expected = expected.__add__(
+                        tr, method=method, fill_value=fill_value)
+                merged = st.copy()
+                merged.traces.reverse()
+                merged.merge(method=method, fill_value=fill_value)
+                self.assertEqual(len(merged), 1)
+                self.assertEqual(merged[0].stats, expected.stats)
+                self.assertEqual(type(merged[0].data), type(expected.data))
+                self.assertEqual(merged[0].data.dtype, expected.data.dtype)
+                np.testing.assert_array_equal(merged[0].data, expected.data)
+                if fill_value is None:
+                    np.testing.assert_array_equal(merged[0].data.mask,
+                                                  expected.data.mask)
+
+    def test_mergeManyOverlappingTracesLikeAdding(self):
+        """
+        Merging many overlapping traces gives the same result as adding them
+        one after another.
+        """
+        np.random.seed(4711)
+        for dtype in [np.int32, np.float64]:
+            st = Stream()
+            t = UTCDateTime(0)
+            previous = None
+            for _i in range(300):
+                npts = np.random.randint(5, 30)
+                data = np.random.randint(0, 100, npts).astype(dtype)
+                # traces start after the start of the previous trace
+                overlap = 0
+                if previous is not None:
+                    overlap = np.random.randint(-3, min(8, len(previous)))
+                if _i % 3 == 0 and 0 < overlap <= npts:
+                    # same data in the overlap
+                    data[:overlap] = previous[-overlap:]
+                tr = Trace(data=data)
+                if _i % 70 == 9:
+                    tr.data = np.ma.masked_array(tr.data)
+                    tr.data[0] = np.ma.masked
+                tr.stats.starttime = t - overlap / 100.0
+                tr.stats.sampling_rate = 100.0
+                st.append(tr)
+                t = tr.stats.endtime + 0.01
+                previous = data
+            kwargs = [dict(method=0, fill_value=None),
+                      dict(method=0, fill_value=0),
+                      dict(method=0, fill_value='latest'),
+                      dict(method=0, fill_value='interpolate'),
+                      dict(method=1, interpolation_samples=0),
+                      dict(method=1, interpolation_samples=2),
+                      dict(method=1, interpolation_samples=-1)]
+            for kw in kwargs:
+                expected = st[0].copy()
+                for tr in st[1:]:
+                    expected = expected.__add__(tr, **kw)
+                merged = st.copy().merge(**kw)
+                self.assertEqual(len(merged), 1)
+                self.assertEqual(merged[0].stats, expected.stats)
+                self.assertEqual(type(merged[0].data), type(expected.data))
+                self.assertEqual(merged[0].data.dtype, expected.data.dtype)
+                np.testing.assert_array_equal(merged[0].data, expected.data)
+                np.testing.assert_array_equal(
+                    np.ma.getmaskarray(merged[0].data),
+                    np.ma.getmaskarray(expected.data))
+
     def test_mergeOverlapsMethod1(self):
         """
         Test merging with method = 1.
@@ -1662,6 +1750,44 @@ class StreamTestCase(unittest.TestCase):
         np.testing.assert_array_almost_equal(
             st1[0].data[:-1], st2[0].data[:-1], decimal=5)
 
+    def test_cleanupManyAdjacentTraces(self):
+        """
+        Many directly adjacent traces in arbitrary order are merged like
+        adding them one after another.
+        """
+        np.random.seed(815)
+        st = Stream()
+        for _i in range(200):
+            tr = Trace(data=np.arange(10, dtype=np.float64) + 10 * _i)
+            tr.stats.starttime = UTCDateTime(0) + 10 * _i
+            tr.stats.station = 'A'
+            st.append(tr)
+        # gap and masked data
+        for tr in st[150:]:
+            tr.stats.starttime += 100
+        st[99].data = np.ma.masked_array(st[99].data)
+        st[99].data[5] = np.ma.masked
+        st += st.copy()
+        for tr in st[200:]:
+            tr.stats.station = 'B'
+        expected = [st[0].copy(), st[150].copy(), st[200].copy(),
+                    st[350].copy()]
+        for _i, j in enumerate((range(1, 150), range(151, 200),
+                                range(201, 350), range(351, 400))):
+            for _j in j:
+                expected[_i] += st[_j]
+        st.traces = [st[_i] for _i in np.random.permutation(len(st))]
+        st._cleanup()
+        self.assertEqual(len(st), 4)
+        for tr, tr_expected in zip(st, expected):
+            self.assertEqual(tr.stats, tr_expected.stats)
+            self.assertEqual(type(tr.data), type(tr_expected.data))
+            np.testing.assert_array_equal(tr.data, tr_expected.data)
+        self.assertTrue(st[0].data.mask[995])
+        self.assertEqual(st[0].stats.npts, 1500)
+        self.assertEqual(st[1].stats.npts, 500)
+        self.assertEqual(len(st.getGaps()), 2)
+
     def test_cleanupNonDefaultPrecisionUTCDateTime(self):
         """
         Testing cleanup with a non-default precision of UTCDateTime.
@@ -1685,6 +1811,105 @@ class StreamTestCase(unittest.TestCase):
         self.assertEqual(len(st), 1)
         UTCDateTime.DEFAULT_PRECISION = 6
 
+    def test_filterBatched(self):
+        """
+        Filtering traces of the same sampling rate and length at once gives
+        the same result as filtering each trace.
+        """
+        st = read()
+        st += read()
+        st[1].data = st[1].data[:1000]
+        st[2].data = np.ma.masked_array(st[2].data)
+        st[3].stats.sampling_rate = 50.0
+        for options in [dict(type='bandpass', freqmin=1.0, freqmax=10.0),
+                        dict(type='highpass', freq=1.0, zerophase=True),
+                        dict(type='lowpassCheby2', freq=10.0)]:
+            expected = st.copy()
+            for tr in expected:
+                tr.filter(**options)
+            filtered = st.copy().filter(**options)
+            for tr, tr_expected in zip(filtered, expected):
+                self.assertEqual(tr.stats, tr_expected.stats)
+                np.testing.assert_array_equal(tr.data, tr_expected.data)
+
+    def test_processingBatched(self):
+        """
+        Processing traces of the same sampling rate and length at once gives
+        the same result and processing information as processing each trace.
+        """
+        st = read()
+        st += read()
+        st[1].data = st[1].data[:1000]
+        st[3].stats.sampling_rate = 50.0
+        calls = [('detrend', (), dict(type='simple')),
+                 ('detrend', (), dict(type='linear')),
+                 ('detrend', (), dict(type='demean')),
+                 ('taper', (0.05,), dict()),
+                 ('taper', (), dict(max_percentage=0.1, side='left')),
+                 ('differentiate', (), dict(type='gradient')),
+                 ('integrate', (), dict(type='cumtrapz')),
+                 ('resample', (20.0,), dict(no_filter=False)),
+                 ('decimate', (2,), dict(no_filter=True)),
+                 ('decimate', (5,), dict())]
+        for method, args, kwargs in calls:
+            expected = st.copy()
+            for tr in expected:
+                getattr(tr, method)(*args, **kwargs)
+            processed = st.copy()
+            getattr(processed, method)(*args, **kwargs)
+            for tr, tr_expected in zip(processed, expected):
+                self.assertEqual(tr.stats, tr_expected.stats)
+                np.testing.assert_allclose(tr.data, tr_expected.data,
+                                           rtol=1e-10, atol=1e-10)
+        # rows of the batch are written back without copying
+        st.detrend()
+        self.assertTrue(st[0].data.base is st[2].data.base)
+
+    def test_processingBatchedFloat32(self):
+        """
+        Batched processing of single precision data gives the same data
+        type and values as processing each trace.
+        """
+        st = read()
+        for tr in st:
+            tr.data = tr.data.astype(np.float32)
+        expected = st.copy()
+        for tr in expected:
+            tr.taper(max_percentage=0.05)
+        processed = st.copy()
+        processed.taper(max_percentage=0.05)
+        for tr, tr_expected in zip(processed, expected):
+            self.assertEqual(tr.data.dtype, tr_expected.data.dtype)
+            np.testing.assert_array_equal(tr.data, tr_expected.data)
+
+    def test_processingWorkers(self):
+        """
+        Processing the traces in a thread pool gives the same result and
+        processing information in the same trace order.
+        """
+        st = read()
+        st += read()
+        st += read()
+        st[1].data = st[1].data[:1000]
+        st[3].stats.sampling_rate = 50.0
+        calls = [('filter', ('bandpass',), dict(freqmin=1.0, freqmax=10.0)),
+                 ('detrend', (), dict(type='linear')),
+                 ('taper', (), dict(max_percentage=0.05)),
+                 ('differentiate', (), dict()),
+                 ('resample', (20.0,), dict()),
+                 ('decimate', (5,), dict())]
+        for method, args, kwargs in calls:
+            expected = st.copy()
+            getattr(expected, method)(*args, **kwargs)
+            processed = st.copy()
+            getattr(processed, method)(*args, workers=4, **kwargs)
+            self.assertEqual([tr.id for tr in processed],
+                             [tr.id for tr in expected])
+            for tr, tr_expected in zip(processed, expected):
+                self.assertEqual(tr.stats, tr_expected.stats)
+                np.testing.assert_allclose(tr.data, tr_expected.data,
+                                           rtol=1e-10, atol=1e-10)
+
     def test_read(self):
         """
         Testing read function.
@@ -1752,6 +1977,34 @@ class StreamTestCase(unittest.TestCase):
             self.assertRaises(UserWarning, read, '/path/to/slist_float.ascii',
                               headonly=True, starttime=0, endtime=1)
 
+    def test_readParallel(self):
+        """
+        Reading multiple files in parallel must return the same traces in the
+        same order as reading them sequentially.
+        """
+        st = read()
+        with TemporaryWorkingDirectory():
+            for i in range(6):
+                for tr in st:
+                    tr.stats.station = 'ST%02i' % i
+                    tr.data = tr.data.astype(np.int32)
+                st.write('file%02i.mseed' % i, format='MSEED')
+                st.write('file%02i.gse2' % i, format='GSE2')
+            for pattern, format in (('*.mseed', None), ('*.gse2', 'GSE2'),
+                                    ('file0[2-4]*', None)):
+                st1 = read(pattern, format=format)
+                st2 = read(pattern, format=format, workers=3)
+                self.assertEqual(st1, st2)
+                self.assertEqual([tr.stats._format for tr in st1],
+                                 [tr.stats._format for tr in st2])
+            self.assertEqual(len(st2), 18)
+            # Keyword arguments are passed on to the plug-ins.
+            st2 = read('*.mseed', workers=2, sourcename='*.ST01.*.EHZ')
+            self.assertEqual(len(st2), 1)
+            # Errors in the workers are raised.
+            self.assertRaises(TypeError, read, '*.mseed', format='XYZ',
+                              workers=2)
+
     def test_copy(self):
         """
         Testing the copy method of the Stream object.
@@ -1765,6 +2018,35 @@ class StreamTestCase(unittest.TestCase):
         self.assertTrue(st.traces[0] == st2.traces[0])
         self.assertFalse(st.traces[0] is st2.traces[0])
 
+    def test_copyWithoutData(self):
+        """
+        Copies without data share it as read-only arrays until processed.
+        """
+        st = read()
+        data = [tr.data.copy() for tr in st]
+        st2 = st.copy(copy_data=False)
+        self.assertEqual(st2, st)
+        for tr, tr2 in zip(st, st2):
+            self.assertFalse(tr2 is tr)
+            self.assertFalse(tr2.stats is tr.stats)
+            self.assertTrue(np.may_share_memory(tr2.data, tr.data))
+            self.assertTrue(tr.data.flags.writeable)
+            self.assertFalse(tr2.data.flags.writeable)
+        # processing either stream leaves the other one untouched
+        st2.filter('highpass', freq=1.0)
+        st.taper(max_percentage=0.05).normalize()
+        st3 = read()
+        st3.filter('highpass', freq=1.0)
+        for tr2, tr3, original in zip(st2, st3, data):
+            np.testing.assert_array_equal(tr2.data, tr3.data)
+            self.assertFalse(np.array_equal(tr2.data, original))
+        # in place changes are refused
+        st2 = st.copy(copy_data=False)
+        self.assertRaises(ValueError, st2[0].data.__imul__, 2)
+        st2[0]._ensureWritable()
+        st2[0].data *= 2
+        np.testing.assert_array_equal(st2[0].data, st[0].data * 2)
+
     def test_merge_with_empty_trace(self):
         """
         Merging a stream containing a empty trace with a differing sampling
@@ -1729,6 +1729,77 @@ class TraceTestCase(unittest.TestCase):
         self.assertRaises(ValueError, tr.decimate, 7, strict_length=True)
         self.assertEqual(tr.stats.processing, [info])
 
+    def test_deferred_processing_info(self):
+        """
+        The processing information is formatted when it is read and can be
+        switched off.
+        """
+        tr = Trace(data=np.arange(20, dtype=np.float64))
+        tr.detrend('linear')
+        tr.taper(max_percentage=0.05, type='cosine')
+        tr.filter('lowpass', freq=0.2)
+        # not yet formatted
+        raw = tr.stats.__dict__['processing']
+        self.assertFalse(any(isinstance(info, str) for info in raw))
+        # copies and comparisons behave as the strings
+        tr2 = tr.copy()
+        self.assertEqual(tr2.stats, tr.stats)
+        pr = tr.stats.processing
+        self.assertTrue(all(isinstance(info, str) for info in pr))
+        self.assertEqual(
+            "ObsPy %s: detrend(options={}::type='linear')" % __version__,
+            pr[0])
+        self.assertTrue("taper" in pr[1])
+        self.assertTrue("filter" in pr[2])
+        self.assertEqual(tr.stats['processing'], pr)
+        self.assertEqual(tr2.stats.processing, pr)
+        # mutable arguments are formatted right away
+        tr.simulate(paz_remove={'poles': [-1.0 + 1.0j, -1.0 - 1.0j],
+                                'zeros': [0j], 'gain': 1.0,
+                                'sensitivity': 1.0})
+        self.assertTrue(isinstance(tr.stats.__dict__['processing'][3], str))
+        # switched off
+        st = Stream([Trace(data=np.arange(20, dtype=np.float64))
+                     for _i in range(3)])
+        Trace.PROCESSING_INFO = False
+        try:
+            st[0].detrend()
+            st.detrend()
+        finally:
+            Trace.PROCESSING_INFO = True
+        for tr in st:
+            self.assertFalse("processing" in tr.stats)
+
+    def test_copyWithoutData(self):
+        """
+        Copies without data get read-only views on it, also masked ones.
+        """
+        tr = Trace(data=np.ma.masked_array(np.arange(10.0),
+                                           mask=[False] * 9 + [True]))
+        tr2 = tr.copy(copy_data=False)
+        self.assertEqual(tr2.stats, tr.stats)
+        np.testing.assert_array_equal(tr2.data, tr.data)
+        self.assertTrue(np.may_share_memory(tr2.data, tr.data))
+        self.assertRaises(ValueError, tr2.data.__setitem__, 0, 1.0)
+        self.assertTrue(tr.data.flags.writeable)
+        # the masks are not shared
+        tr2.data[1] = np.ma.masked
+        self.assertFalse(tr.data.mask[1])
+        tr2.trim(tr2.stats.starttime + 2)
+        self.assertEqual(len(tr), 10)
+        tr2 = tr.copy(copy_data=False).split()[0]
+        tr2.detrend()
+        np.testing.assert_array_equal(tr.data.data, np.arange(10.0))
+        # the original trace can still be processed in place
+        tr = Trace(data=np.arange(10.0))
+        tr2 = tr.copy(copy_data=False)
+        tr.data *= 2
+        tr.data[0] = 1.0
+        np.testing.assert_array_equal(tr2.data, tr.data)
+        tr.normalize()
+        self.assertEqual(tr.data.max(), 1.0)
+        self.assertEqual(tr2.data.max(), 18.0)
+
     def test_meta(self):
         """
         Tests Trace.meta an alternative to Trace.stats
@@ -5,11 +5,15 @@ from future.builtins import *  # NOQA @UnusedWildImport
 
 import copy
 import datetime
+import threading
 import unittest
 
 import numpy as np
 
 from obspy import UTCDateTime
+from obspy.core import utcdatetime
+from obspy.core.compatibility import mock
+from obspy.core.utcdatetime import UTCDateTimeArray
 from obspy.core.util.decorator import skipIf
 
 
@@ -945,6 +949,165 @@ class UTCDateTimeTestCase(unittest.TestCase):
         dt = UTCDateTime(2106, 2, 7, 6, 28, 16)
         self.assertEqual(dt.__str__(), '2106-02-07T06:28:16.000000Z')
 
+    def test_parseISO8601Fast(self):
+        """
+        The fast ISO8601 parser returns exactly the same timestamps as the
+        generic parser and leaves all other strings to it.
+        """
+        values = ['2009-12-31T12:23:34', '2009-12-31T12:23:34Z',
+                  '2009-12-31T12:23:34.5', '2009-12-31T12:23:34.123456Z',
+                  '2009-12-31T12:23:34.123456789', '1969-07-20T20:17:40.1Z',
+                  '1853-02-03T04:05:06.000001', '2012-02-29T23:59:59.999999',
+                  '2012-04-04T14:21:42.3+00:00', '2013-12-07T19:00:42.8+01:30',
+                  '2013-12-07T19:00:42-05:00', '2150-01-01T00:00:00.0Z']
+        for value in values:
+            expected = UTCDateTime._parseISO8601(value).timestamp
+            self.assertEqual(UTCDateTime._parseISO8601Fast(value), expected)
+            # cached value
+            self.assertEqual(UTCDateTime._parseISO8601Fast(value), expected)
+            self.assertEqual(UTCDateTime(value).timestamp, expected)
+            self.assertEqual(UTCDateTime(' %s ' % value).timestamp, expected)
+        for value in ['2009-365T12:23:34', '20091231T122334',
+                      '2009-12-31T12:23', '2009-12-31 12:23:34',
+                      '2009-12-31T12:23:34.', '2009-12-31T12:23:34,5',
+                      '2009-12-31T24:00:00', '2009-12-31T12:60:00',
+                      '2009-02-30T12:23:34', '2009-12-31T12:23:3a',
+                      '2009-12-31T12:23:34+0100', '2009-12-31T12:23:34ZZ',
+                      '2009-12-31T12:23:+1.5', '']:
+            self.assertEqual(UTCDateTime._parseISO8601Fast(value), None)
+        # all other strings are still parsed by the generic parser
+        self.assertEqual(UTCDateTime('2009-12-31T12:23:34.'),
+                         UTCDateTime(2009, 12, 31, 12, 23, 34))
+        self.assertEqual(UTCDateTime('2009-12-31T13:23:34+0100'),
+                         UTCDateTime(2009, 12, 31, 12, 23, 34))
+        self.assertRaises(ValueError, UTCDateTime, '2009-12-31T24:00:00',
+                          iso8601=True)
+
+    def test_parseISO8601FastCache(self):
+        """
+        The least recently used strings are removed from the cache.
+        """
+        with mock.patch.object(utcdatetime, 'ISO8601_CACHE_SIZE', 3), \
+                mock.patch.object(utcdatetime, '_ISO8601_CACHE',
+                                  utcdatetime.OrderedDict()) as cache:
+            values = ['2009-12-31T12:23:3%d' % _i for _i in range(5)]
+            for value in values[:3]:
+                UTCDateTime(value)
+            self.assertEqual(list(cache), values[:3])
+            UTCDateTime(values[0])
+            UTCDateTime(values[3])
+            self.assertEqual(list(cache), [values[2], values[0], values[3]])
+            self.assertEqual(cache[values[3]], UTCDateTime(values[3]))
+            UTCDateTime(values[4])
+            self.assertEqual(list(cache), [values[0], values[3], values[4]])
+        # concurrent parsing keeps the cache consistent
+        with mock.patch.object(utcdatetime, 'ISO8601_CACHE_SIZE', 50), \
+                mock.patch.object(utcdatetime, '_ISO8601_CACHE',
+                                  utcdatetime.OrderedDict()) as cache:
+            values = ['2009-12-31T12:%02d:%02d' % (_i // 60, _i % 60)
+                      for _i in range(200)]
+
+            def parse():
+                for value in values * 5:
+                    UTCDateTime(value)
+
+            threads = [threading.Thread(target=parse) for _i in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(len(cache), 50)
+            for value, timestamp in list(cache.items()):
+                self.assertEqual(timestamp, UTCDateTime(value).timestamp)
+        # a size of 0 disables the cache
+        with mock.patch.object(utcdatetime, 'ISO8601_CACHE_SIZE', 0), \
+                mock.patch.object(utcdatetime, '_ISO8601_CACHE',
+                                  utcdatetime.OrderedDict()) as cache:
+            self.assertEqual(UTCDateTime('2009-12-31T12:23:34').timestamp,
+                             1262262214.0)
+            self.assertEqual(len(cache), 0)
+
+    def test_UTCDateTimeArrayConversion(self):
+        """
+        UTCDateTimeArray can be created from and converted back to
+        UTCDateTime objects, timestamps, strings and datetime64 values.
+        """
+        times = [UTCDateTime(2009, 8, 24, 0, 20, 3, 123456),
+                 UTCDateTime(1970, 1, 1), UTCDateTime(-1.5),
+                 UTCDateTime(2038, 1, 19, 3, 14, 8)]
+        expected = [str(t) for t in times]
+        strings = [str(t) for t in times] + ['2009-234T00:20:03.5']
+        for values in (times, [t.timestamp for t in times],
+                       np.array([t.timestamp for t in times]), expected,
+                       UTCDateTimeArray(times)):
+            array = UTCDateTimeArray(values)
+            self.assertEqual(len(array), 4)
+            self.assertEqual(array.toUTCDateTime(), times)
+            self.assertEqual(list(array), times)
+            self.assertEqual([str(t) for t in array.isoformat()], expected)
+        # strings which can not be parsed by NumPy directly
+        array = UTCDateTimeArray(strings)
+        self.assertEqual(array[-1], UTCDateTime(2009, 8, 22, 0, 20, 3, 500000))
+        self.assertRaises(ValueError, UTCDateTimeArray, ['2009-13-45'])
+        # integer nanoseconds and datetime64
+        array = UTCDateTimeArray(times)
+        # float timestamps are only accurate to a fraction of a microsecond
+        self.assertTrue(abs(array.ns[0] - 1251073203123456000) < 1000)
+        self.assertEqual(array.ns[2], -1500000000)
+        self.assertTrue(np.array_equal(
+            UTCDateTimeArray(array.toDatetime64()).ns, array.ns))
+        self.assertTrue(np.array_equal(
+            UTCDateTimeArray.fromNanoseconds(array.ns).ns, array.ns))
+        np.testing.assert_allclose(array.timestamp,
+                                   [t.timestamp for t in times])
+        # indexing
+        self.assertTrue(isinstance(array[1:], UTCDateTimeArray))
+        self.assertEqual(array[1:].toUTCDateTime(), times[1:])
+        self.assertEqual(array[array.argsort()][0], UTCDateTime(-1.5))
+        self.assertEqual(array.min(), UTCDateTime(-1.5))
+        self.assertEqual(array.max(), times[-1])
+        array[1] = UTCDateTime(10)
+        self.assertEqual(array[1], UTCDateTime(10))
+        # precision of the string representation
+        array = UTCDateTimeArray([UTCDateTime(0.1234567)], precision=3)
+        self.assertEqual(str(array.isoformat()[0]),
+                         '1970-01-01T00:00:00.123Z')
+        array.precision = 0
+        self.assertEqual(str(array.isoformat()[0]), '1970-01-01T00:00:00Z')
+
+    def test_UTCDateTimeArrayArithmeticAndComparison(self):
+        """
+        Arithmetic and rich comparisons of UTCDateTimeArray behave like the
+        ones of UTCDateTime.
+        """
+        times = [UTCDateTime(2009, 8, 24, 0, 20, 3, 123456),
+                 UTCDateTime(123.000000012), UTCDateTime(123.000000099)]
+        array = UTCDateTimeArray(times)
+        other = UTCDateTime(123.000000099)
+        for offset in (1, 1.5, -0.000001, datetime.timedelta(seconds=1.5)):
+            self.assertEqual((array + offset).toUTCDateTime(),
+                             [t + offset for t in times])
+            self.assertEqual((array - offset).toUTCDateTime(),
+                             [t - offset for t in times])
+        self.assertEqual((1 + array).toUTCDateTime(), [t + 1 for t in times])
+        offsets = np.array([1.0, 2.0, 3.0])
+        self.assertEqual((array + offsets).toUTCDateTime(),
+                         [t + o for t, o in zip(times, offsets)])
+        np.testing.assert_allclose(array - other,
+                                   [t - other for t in times], atol=1e-6)
+        np.testing.assert_allclose(array - array, 0)
+        # comparisons use the precision
+        for op in ('__eq__', '__ne__', '__lt__', '__le__', '__gt__',
+                   '__ge__'):
+            self.assertEqual(getattr(array, op)(other).tolist(),
+                             [getattr(t, op)(other) for t in times])
+            self.assertEqual(getattr(array, op)(array[::-1]).tolist(),
+                             [getattr(t, op)(o)
+                              for t, o in zip(times, times[::-1])])
+        array.precision = 11
+        self.assertEqual((array == other).tolist(), [False, False, True])
+        self.assertEqual((array == 'abc').tolist(), [False, False, False])
+
 
 def suite():
     return unittest.makeSuite(UTCDateTimeTestCase, 'test')
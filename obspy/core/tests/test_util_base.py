@@ -3,7 +3,10 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
 
+from obspy.core.compatibility import mock
+from obspy.core.util import base
 from obspy.core.util.base import getMatplotlibVersion, NamedTemporaryFile
+from obspy.core.util.misc import TemporaryWorkingDirectory
 from obspy.core.util.testing import ImageComparison, \
     ImageComparisonException, HAS_COMPARE_IMAGE
 from obspy.core.util.decorator import skipIf
@@ -62,6 +65,119 @@ class UtilBaseTestCase(unittest.TestCase):
         # Set it to the original version str just in case.
         matplotlib.__version__ = original_version
 
+    def test_getFormatCandidates(self):
+        """
+        Formats matching the signature of a file and the last format detected
+        in the same directory are probed first.
+        """
+        path = os.path.join(os.path.dirname(__file__), 'data')
+        slist = os.path.join(path, 'slist.ascii')
+        tspair = os.path.join(path, 'tspair.ascii')
+        base._DIRECTORY_FORMATS.clear()
+        candidates = base._getFormatCandidates('waveform', slist)
+        self.assertEqual(candidates[0], 'SLIST')
+        self.assertEqual(sorted(candidates),
+                         sorted(base.ENTRY_POINTS['waveform'].keys()))
+        self.assertEqual(base._getFormatCandidates('waveform', tspair)[0],
+                         'TSPAIR')
+        # file-like objects are sniffed without changing the position
+        with open(slist, 'rb') as fh:
+            fh.seek(5)
+            self.assertEqual(base._getFormatCandidates('waveform', fh)[0],
+                             'MSEED')
+            self.assertEqual(fh.tell(), 5)
+            fh.seek(0)
+            self.assertEqual(base._getFormatCandidates('waveform', fh)[0],
+                             'SLIST')
+        # the last detected format of the directory comes first
+        _, format = base._readFromPlugin('waveform', tspair)
+        self.assertEqual(format, 'TSPAIR')
+        candidates = base._getFormatCandidates('waveform', slist)
+        self.assertEqual(candidates[:2], ['TSPAIR', 'SLIST'])
+        _, format = base._readFromPlugin('waveform', slist)
+        self.assertEqual(format, 'SLIST')
+        base._DIRECTORY_FORMATS.clear()
+
+    def test_getPluginFunctionIsCached(self):
+        """
+        Plug-in functions are only loaded once.
+        """
+        filename = os.path.join(os.path.dirname(__file__), 'data',
+                                'slist.ascii')
+        base._PLUGIN_FUNCTIONS.clear()
+        with mock.patch('obspy.core.util.base._loadEntryPoint',
+                        side_effect=base._loadEntryPoint) as p:
+            st1, _ = base._readFromPlugin('waveform', filename)
+            count = p.call_count
+            self.assertTrue(count >= 2)
+            st2, _ = base._readFromPlugin('waveform', filename)
+            self.assertEqual(p.call_count, count)
+        self.assertEqual(st1, st2)
+
+    def test_entryPointCache(self):
+        """
+        Entry point metadata is written to and restored from the cache file
+        and the cache is rebuilt if it is outdated.
+        """
+        with TemporaryWorkingDirectory():
+            cache_file = os.path.join('cache', 'entry_points.json')
+            with mock.patch.object(base, 'ENTRY_POINT_CACHE_FILE',
+                                   cache_file), \
+                    mock.patch.object(base, '_ENTRY_POINT_MAP', None):
+                with mock.patch('obspy.core.util.base._scanEntryPoints',
+                                side_effect=base._scanEntryPoints) as p:
+                    scanned = base._getEntryPointMap()
+                    self.assertEqual(p.call_count, 1)
+                    self.assertTrue(os.path.isfile(cache_file))
+                    # entry point map is kept for the interpreter session
+                    self.assertTrue(base._getEntryPointMap() is scanned)
+                    # restored from cache without scanning
+                    base._ENTRY_POINT_MAP = None
+                    cached = base._getEntryPointMap()
+                    self.assertEqual(p.call_count, 1)
+                    self.assertEqual(sorted(cached), sorted(scanned))
+                    for group, eps in scanned.items():
+                        self.assertEqual(
+                            [str(ep) for ep in eps.values()],
+                            [str(ep) for ep in cached[group].values()])
+                    ep = cached['obspy.plugin.waveform.SLIST']['isFormat']
+                    self.assertEqual(ep.dist.key, 'obspy')
+                    self.assertEqual(ep.load().__name__, 'isSLIST')
+                    # outdated or corrupt caches are rebuilt
+                    with mock.patch(
+                            'obspy.core.util.base._getEntryPointCacheKey',
+                            return_value=['outdated']):
+                        base._ENTRY_POINT_MAP = None
+                        base._getEntryPointMap()
+                        self.assertEqual(p.call_count, 2)
+                    with open(cache_file, 'wb') as fh:
+                        fh.write(b'{corrupt')
+                    base._ENTRY_POINT_MAP = None
+                    base._getEntryPointMap()
+                    self.assertEqual(p.call_count, 3)
+                    base._ENTRY_POINT_MAP = None
+                    base._getEntryPointMap()
+                    self.assertEqual(p.call_count, 3)
+
+    def test_entryPointRegistryIsLazy(self):
+        """
+        Plug-in types are only collected on first access and no plug-in
+        module is imported by the registry itself.
+        """
+        registry = base._EntryPointRegistry(base.ENTRY_POINT_GROUPS)
+        self.assertEqual(sorted(registry), sorted(base.ENTRY_POINT_GROUPS))
+        self.assertEqual(registry._entry_points, {})
+        with mock.patch('obspy.core.util.base._EntryPoint.load') as p:
+            waveform = registry['waveform']
+            self.assertEqual(p.call_count, 0)
+        self.assertEqual(list(registry._entry_points), ['waveform'])
+        self.assertTrue(registry['waveform'] is waveform)
+        self.assertEqual(list(waveform)[:3], ['MSEED', 'SAC', 'GSE2'])
+        self.assertEqual(dict(waveform), dict(base.ENTRY_POINTS['waveform']))
+        self.assertRaises(KeyError, registry.__getitem__, 'xyz')
+        self.assertRaises(ImportError, base._loadEntryPoint,
+                          'obspy.plugin.waveform.XYZ', 'readFormat')
+
     def test_NamedTemporaryFile_ContextManager(self):
         """
         Tests the automatic closing/deleting of NamedTemporaryFile using the
@@ -22,6 +22,7 @@ from obspy.core.util.decorator import raiseIfMasked, skipIfNoData, \
 from obspy.core import compatibility
 from obspy.core.util.misc import flatnotmaskedContiguous
 import math
+import numbers
 import numpy as np
 import warnings
 import functools
@@ -189,6 +190,30 @@ class Stats(AttribDict):
 
     __setattr__ = __setitem__
 
+    def __getitem__(self, key, default=None):
+        """
+        Formats the processing information, see :attr:`processing`.
+        """
+        if key == 'processing' and key in self.__dict__:
+            return self.processing
+        return super(Stats, self).__getitem__(key, default)
+
+    @property
+    def processing(self):
+        """
+        List of strings with the processing applied to the trace.
+        """
+        try:
+            processing = self.__dict__['processing']
+        except KeyError:
+            raise AttributeError('processing')
+        # format the strings of the processing information stored by
+        # _add_processing_info
+        for i, info in enumerate(processing):
+            if isinstance(info, _ProcessingInfo):
+                processing[i] = info.format()
+        return processing
+
     def __str__(self):
         """
         Return better readable string representation of Stats object.
@@ -199,30 +224,248 @@ class Stats(AttribDict):
         return self._pretty_str(priorized_keys)
 
 
+class CompactStats(Stats):
+    """
+    A :class:`~obspy.core.trace.Stats` object using less memory and time for
+    the default attributes.
+
+    The default attributes are stored in slots instead of the instance
+    dictionary. ``delta`` and ``endtime`` are computed from ``sampling_rate``,
+    ``starttime`` and ``npts`` when they are read instead of on every change.
+    All other attributes, e.g. format specific dictionaries like ``mseed``
+    or ``sac``, are stored as in :class:`~obspy.core.trace.Stats`.
+
+    Use it for streams with many short traces, either by passing a
+    ``CompactStats`` object as header of a :class:`~obspy.core.trace.Trace`
+    or by setting :attr:`Trace.COMPACT_STATS` to ``True``, which also
+    applies to all traces created by :func:`~obspy.core.stream.read`.
+
+    >>> stats = CompactStats({'network': 'BW', 'npts': 11})
+    >>> stats.sampling_rate = 10.0
+    >>> stats.endtime
+    UTCDateTime(1970, 1, 1, 0, 0, 1)
+    >>> stats['mseed'] = {'dataquality': 'D'}
+    >>> print(stats.mseed.dataquality)
+    D
+    """
+    __slots__ = ['network', 'station', 'location', 'channel', 'starttime',
+                 'sampling_rate', 'npts', 'calib']
+    _derived = ['delta', 'endtime']
+
+    def __init__(self, header={}):
+        """
+        """
+        # set default values directly
+        for key in self.__slots__:
+            object.__setattr__(self, key, self.defaults[key])
+        self.update(header)
+
+    def __setitem__(self, key, value):
+        """
+        """
+        if key == 'delta':
+            key = 'sampling_rate'
+            value = 1.0 / float(value)
+        elif key == 'sampling_rate':
+            value = float(value)
+        elif key == 'starttime':
+            if not isinstance(value, UTCDateTime):
+                value = UTCDateTime(value)
+        elif key == 'npts':
+            value = int(value)
+        elif key in self.__slots__:
+            # prevent a calibration factor of 0
+            if key == 'calib' and value == 0:
+                msg = 'Calibration factor set to 0.0!'
+                warnings.warn(msg, UserWarning)
+        else:
+            super(CompactStats, self).__setitem__(key, value)
+            return
+        object.__setattr__(self, key, value)
+
+    __setattr__ = __setitem__
+
+    def __getitem__(self, key, default=None):
+        """
+        """
+        if key in self.__slots__ or key in self._derived:
+            return getattr(self, key)
+        return super(CompactStats, self).__getitem__(key, default)
+
+    def __delitem__(self, key):
+        """
+        Resets default attributes to their default value.
+        """
+        if key in self.__slots__:
+            self[key] = self.defaults[key]
+        elif key == 'delta':
+            self['sampling_rate'] = self.defaults['sampling_rate']
+        elif key != 'endtime':
+            super(CompactStats, self).__delitem__(key)
+
+    __delattr__ = __delitem__
+
+    @property
+    def delta(self):
+        try:
+            return 1.0 / self.sampling_rate
+        except ZeroDivisionError:
+            return 0
+
+    @property
+    def endtime(self):
+        if self.npts == 0:
+            return self.starttime
+        return self.starttime + (self.npts - 1) * self.delta
+
+    def __iter__(self):
+        for key in self.__slots__:
+            yield key
+        for key in self._derived:
+            yield key
+        for key in self.__dict__:
+            yield key
+
+    def __len__(self):
+        return len(self.__slots__) + len(self._derived) + len(self.__dict__)
+
+    def __repr__(self):
+        return "%s(%s)" % (self.__class__.__name__, self.__getstate__())
+
+    def __getstate__(self):
+        state = dict((key, getattr(self, key)) for key in self.__slots__)
+        state.update(self.__dict__)
+        return state
+
+    def __setstate__(self, state):
+        self.__init__(state)
+
+    def __deepcopy__(self, *args, **kwargs):  # @UnusedVariable
+        return self.__class__(deepcopy(self.__getstate__()))
+
+
+def _getProcessingInfo(func, *args, **kwargs):
+    """
+    Returns the information about a processing call as stored in the
+    Trace.stats.processing list.
+
+    :param func: The processing method, decorated with
+        :func:`_add_processing_info` or not.
+    :param args: Positional arguments of the call including the trace.
+    :param kwargs: Keyword arguments of the call.
+    """
+    func = getattr(func, '_processing_func', func)
+    callargs = compatibility.getcallargs(func, *args, **kwargs)
+    callargs.pop("self")
+    kwargs_ = callargs.pop("kwargs", {})
+    from obspy import __version__
+    info = "ObsPy {version}: {function}(%s)".format(
+        version=__version__,
+        function=func.__name__)
+    arguments = []
+    arguments += \
+        ["%s=%s" % (k, v) if not isinstance(v, native_str) else
+         "%s='%s'" % (k, v) for k, v in callargs.items()]
+    arguments += \
+        ["%s=%s" % (k, v) if not isinstance(v, native_str) else
+         "%s='%s'" % (k, v) for k, v in kwargs_.items()]
+    arguments.sort()
+    return info % "::".join(arguments)
+
+
+# argument types which are stored as they are in the processing information
+# and formatted when the processing information is read
+_IMMUTABLE_TYPES = (numbers.Number, str, native_str, bytes, type(None),
+                    UTCDateTime)
+
+
+class _ProcessingInfo(object):
+    """
+    Information about a processing call which is formatted as string by
+    :func:`_getProcessingInfo` when it is read from ``Trace.stats``.
+
+    Behaves like the formatted string for comparisons and pickling. The
+    arguments are immutable, so copies share the same object.
+    """
+    __slots__ = ['func', 'args', 'kwargs', '_info']
+
+    def __init__(self, func, args, kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self._info = None
+
+    def format(self):
+        if self._info is None:
+            self._info = _getProcessingInfo(self.func, None, *self.args,
+                                            **self.kwargs)
+        return self._info
+
+    def __str__(self):
+        return self.format()
+
+    def __repr__(self):
+        return repr(self.format())
+
+    def __eq__(self, other):
+        if isinstance(other, _ProcessingInfo):
+            other = other.format()
+        return self.format() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.format())
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        info = self.format()
+        return type(info), (info,)
+
+
+def _newProcessingInfo(func, *args, **kwargs):
+    """
+    Returns the information about a processing call for the
+    Trace.stats.processing list.
+
+    Formatting is deferred until the list is read if all arguments are of
+    immutable types, see :class:`_ProcessingInfo`. Otherwise the string is
+    formatted right away so that later changes of the arguments do not alter
+    it.
+
+    :param func: The processing method, decorated with
+        :func:`_add_processing_info` or not.
+    :param args: Positional arguments of the call including the trace.
+    :param kwargs: Keyword arguments of the call.
+    """
+    func = getattr(func, '_processing_func', func)
+    for value in args[1:] + tuple(kwargs.values()):
+        if not isinstance(value, _IMMUTABLE_TYPES):
+            return _getProcessingInfo(func, *args, **kwargs)
+    return _ProcessingInfo(func, args[1:], kwargs)
+
+
 def _add_processing_info(func):
     """
     This is a decorator that attaches information about a processing call as a
     string to the Trace.stats.processing list.
+
+    The undecorated method is available as ``_processing_func`` attribute,
+    also on methods with further decorators. Nothing is attached if
+    :attr:`Trace.PROCESSING_INFO` is ``False``.
     """
     @functools.wraps(func)
     def new_func(*args, **kwargs):
-        callargs = compatibility.getcallargs(func, *args, **kwargs)
-        callargs.pop("self")
-        kwargs_ = callargs.pop("kwargs", {})
-        from obspy import __version__
-        info = "ObsPy {version}: {function}(%s)".format(
-            version=__version__,
-            function=func.__name__)
-        arguments = []
-        arguments += \
-            ["%s=%s" % (k, v) if not isinstance(v, native_str) else
-             "%s='%s'" % (k, v) for k, v in callargs.items()]
-        arguments += \
-            ["%s=%s" % (k, v) if not isinstance(v, native_str) else
-             "%s='%s'" % (k, v) for k, v in kwargs_.items()]
-        arguments.sort()
-        info = info % "::".join(arguments)
         self = args[0]
+        if not self.PROCESSING_INFO:
+            return func(*args, **kwargs)
+        info = _newProcessingInfo(func, *args, **kwargs)
         result = func(*args, **kwargs)
         # Attach after executing the function to avoid having it attached
         # while the operation failed.
@@ -232,9 +475,138 @@ def _add_processing_info(func):
     new_func.__name__ = func.__name__
     new_func.__doc__ = func.__doc__
     new_func.__dict__.update(func.__dict__)
+    new_func._processing_func = func
     return new_func
 
 
+def _checkResampling(npts, factor, no_filter, strict_length, method):
+    """
+    Checks the arguments of Trace.resample() and Trace.decimate().
+
+    :param npts: Number of samples of the data.
+    :param factor: Ratio of current to new sampling rate.
+    :param method: ``'resample'`` or ``'decimate'``.
+    """
+    # check if end time changes and this is not explicitly allowed
+    if strict_length and npts % factor:
+        msg = "End time of trace would change and strict_length=True."
+        raise ValueError(msg)
+    # be sure automatic lowpass filter still behaves good
+    if not no_filter and factor > 16:
+        if method == 'resample':
+            msg = "Automatic filter design is unstable for resampling " + \
+                  "factors (current sampling rate/new sampling rate) " + \
+                  "above 16. Manual resampling is necessary."
+        else:
+            msg = "Automatic filter design is unstable for decimation " + \
+                  "factors above 16. Manual decimation is necessary."
+        raise ArithmeticError(msg)
+
+
+def _resampleData(data, df, sampling_rate, window='hanning'):
+    """
+    Resamples data using the Fourier method along the last axis, see
+    :meth:`Trace.resample`.
+
+    :type data: :class:`~numpy.ndarray`
+    :param data: One- or two-dimensional data array.
+    :param df: Current sampling rate in Hz.
+    :param sampling_rate: New sampling rate in Hz.
+    :return: Resampled data.
+    """
+    from scipy.signal import get_window
+    from scipy.fftpack import rfft, irfft
+    npts = data.shape[-1]
+    factor = df / float(sampling_rate)
+    delta = 1.0 / float(df)
+    # resample in the frequency domain
+    X = rfft(data, axis=-1)
+    X = np.insert(X, 1, 0, axis=-1)
+    if npts % 2 == 0:
+        X = np.append(X, np.zeros(X.shape[:-1] + (1,)), axis=-1)
+    Xr = X[..., ::2]
+    Xi = X[..., 1::2]
+    if window is not None:
+        if callable(window):
+            W = window(np.fft.fftfreq(npts))
+        elif isinstance(window, np.ndarray):
+            if window.shape != (npts,):
+                msg = "Window has the wrong shape. Window length must " + \
+                      "equal the number of points."
+                raise ValueError(msg)
+            W = window
+        else:
+            W = np.fft.ifftshift(get_window(native_str(window), npts))
+        Xr *= W[:npts//2+1]
+        Xi *= W[:npts//2+1]
+    # interpolate
+    num = int(npts / factor)
+    df = 1.0 / (npts * delta)
+    dF = 1.0 / num * sampling_rate
+    f = df * np.arange(0, npts // 2 + 1, dtype=np.int32)
+    nF = num // 2 + 1
+    F = dF * np.arange(0, nF, dtype=np.int32)
+    Y = np.zeros(data.shape[:-1] + (2*nF,))
+    for y, xr, xi in zip(Y.reshape(-1, 2*nF), Xr.reshape(-1, Xr.shape[-1]),
+                         Xi.reshape(-1, Xi.shape[-1])):
+        y[::2] = np.interp(F, f, xr)
+        y[1::2] = np.interp(F, f, xi)
+    Y = np.delete(Y, 1, axis=-1)
+    if num % 2 == 0:
+        Y = np.delete(Y, -1, axis=-1)
+    return irfft(Y, axis=-1) * (float(num) / float(npts))
+
+
+def _getTaper(npts, sampling_rate, max_percentage, type='hann',
+              max_length=None, side='both', **kwargs):
+    """
+    Returns the taper window for data with the given number of samples and
+    sampling rate, see :meth:`Trace.taper` for the other arguments.
+    """
+    type = type.lower()
+    side = side.lower()
+    side_valid = ['both', 'left', 'right']
+    if side not in side_valid:
+        raise ValueError("'side' has to be one of: %s" % side_valid)
+    # retrieve function call from entry points
+    func = _getFunctionFromEntryPoint('taper', type)
+    # store all constraints for maximum taper length
+    max_half_lenghts = []
+    if max_percentage is not None:
+        max_half_lenghts.append(int(max_percentage * npts))
+    if max_length is not None:
+        max_half_lenghts.append(int(max_length * sampling_rate))
+    if np.all([2 * mhl > npts for mhl in max_half_lenghts]):
+        msg = "The requested taper is longer than the trace. " \
+              "The taper will be shortened to trace length."
+        warnings.warn(msg)
+    # add full trace length to constraints
+    max_half_lenghts.append(int(npts / 2))
+    # select shortest acceptable window half-length
+    wlen = min(max_half_lenghts)
+    # obspy.signal.cosTaper has a default value for taper percentage,
+    # we need to override is as we control percentage completely via npts
+    # of taper function and insert ones in the middle afterwards
+    if type == "cosine":
+        kwargs['p'] = 1.0
+    # tapering. tapering functions are expected to accept the number of
+    # samples as first argument and return an array of values between 0 and
+    # 1 with the same length as the data
+    if 2 * wlen == npts:
+        taper_sides = func(2 * wlen, **kwargs)
+    else:
+        taper_sides = func(2 * wlen + 1, **kwargs)
+    if side == 'left':
+        taper = np.hstack((taper_sides[:wlen], np.ones(npts - wlen)))
+    elif side == 'right':
+        taper = np.hstack((np.ones(npts - wlen),
+                           taper_sides[len(taper_sides) - wlen:]))
+    else:
+        taper = np.hstack((taper_sides[:wlen], np.ones(npts - 2 * wlen),
+                           taper_sides[len(taper_sides) - wlen:]))
+    return taper
+
+
 class Trace(object):
     """
     An object containing data of a continuous series, such as a seismic trace.
@@ -263,6 +635,14 @@ class Trace(object):
         Returns basic information about the trace object.
         See also: :meth:`Trace.__str__`.
     """
+    #: Whether processing methods add information about the call to
+    #: ``stats.processing``. Set to ``False`` to save the overhead, e.g. when
+    #: processing many short traces.
+    PROCESSING_INFO = True
+    #: Whether the header of new traces is stored in a
+    #: :class:`~obspy.core.trace.CompactStats` object instead of a
+    #: :class:`~obspy.core.trace.Stats` object.
+    COMPACT_STATS = False
 
     def __init__(self, data=np.array([]), header=None):
         # make sure Trace gets initialized with suitable ndarray as self.data
@@ -275,7 +655,15 @@ class Trace(object):
             # KnownIssues#DefaultParameterValuesinPython
             header = {}
         header.setdefault('npts', len(data))
-        self.stats = Stats(header)
+        if isinstance(header, CompactStats):
+            self.stats = CompactStats(header)
+            # the npts slot always exists, a value of 0 means it was not set
+            if not self.stats.npts:
+                self.stats.npts = len(data)
+        elif self.COMPACT_STATS:
+            self.stats = CompactStats(header)
+        else:
+            self.stats = Stats(header)
         # set data without changing npts in stats object (for headonly option)
         super(Trace, self).__setattr__('data', data)
 
@@ -1500,65 +1888,16 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         >>> tr.data  # doctest: +NORMALIZE_WHITESPACE +ELLIPSIS
         array([ 0.5       ,  0.40432914,  0.3232233 ,  0.26903012,  0.25 ...
         """
-        from scipy.signal import get_window
-        from scipy.fftpack import rfft, irfft
         factor = self.stats.sampling_rate / float(sampling_rate)
-        # check if end time changes and this is not explicitly allowed
-        if strict_length:
-            if len(self.data) % factor != 0.0:
-                msg = "End time of trace would change and strict_length=True."
-                raise ValueError(msg)
+        _checkResampling(self.stats.npts, factor, no_filter, strict_length,
+                         'resample')
         # do automatic lowpass filtering
         if not no_filter:
-            # be sure filter still behaves good
-            if factor > 16:
-                msg = "Automatic filter design is unstable for resampling " + \
-                      "factors (current sampling rate/new sampling rate) " + \
-                      "above 16. Manual resampling is necessary."
-                raise ArithmeticError(msg)
             freq = self.stats.sampling_rate * 0.5 / float(factor)
             self.filter('lowpassCheby2', freq=freq, maxorder=12)
-
-        # resample in the frequency domain
-        X = rfft(self.data)
-        X = np.insert(X, 1, 0)
-        if self.stats.npts % 2 == 0:
-            X = np.append(X, [0])
-        Xr = X[::2]
-        Xi = X[1::2]
-
-        if window is not None:
-            if callable(window):
-                W = window(np.fft.fftfreq(self.stats.npts))
-            elif isinstance(window, np.ndarray):
-                if window.shape != (self.stats.npts,):
-                    msg = "Window has the wrong shape. Window length must " + \
-                          "equal the number of points."
-                    raise ValueError(msg)
-                W = window
-            else:
-                W = np.fft.ifftshift(get_window(native_str(window),
-                                                self.stats.npts))
-            Xr *= W[:self.stats.npts//2+1]
-            Xi *= W[:self.stats.npts//2+1]
-
-        # interpolate
-        num = int(self.stats.npts / factor)
-        df = 1.0 / (self.stats.npts * self.stats.delta)
-        dF = 1.0 / num * sampling_rate
-        f = df * np.arange(0, self.stats.npts // 2 + 1, dtype=np.int32)
-        nF = num // 2 + 1
-        F = dF * np.arange(0, nF, dtype=np.int32)
-        Y = np.zeros((2*nF))
-        Y[::2] = np.interp(F, f, Xr)
-        Y[1::2] = np.interp(F, f, Xi)
-
-        Y = np.delete(Y, 1)
-        if num % 2 == 0:
-            Y = np.delete(Y, -1)
-        self.data = irfft(Y) * (float(num) / float(self.stats.npts))
+        self.data = _resampleData(self.data, self.stats.sampling_rate,
+                                  sampling_rate, window=window)
         self.stats.sampling_rate = sampling_rate
-
         return self
 
     @_add_processing_info
@@ -1623,18 +1962,10 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         >>> tr.data
         array([0, 4, 8])
         """
-        # check if end time changes and this is not explicitly allowed
-        if strict_length and len(self.data) % factor:
-            msg = "End time of trace would change and strict_length=True."
-            raise ValueError(msg)
-
+        _checkResampling(len(self.data), factor, no_filter, strict_length,
+                         'decimate')
         # do automatic lowpass filtering
         if not no_filter:
-            # be sure filter still behaves good
-            if factor > 16:
-                msg = "Automatic filter design is unstable for decimation " + \
-                      "factors above 16. Manual decimation is necessary."
-                raise ArithmeticError(msg)
             freq = self.stats.sampling_rate * 0.5 / float(factor)
             self.filter('lowpassCheby2', freq=freq, maxorder=12)
 
@@ -1916,48 +2247,9 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         ``'triang'``
             Triangular window. (uses: :func:`scipy.signal.triang`)
         """
-        type = type.lower()
-        side = side.lower()
-        side_valid = ['both', 'left', 'right']
-        npts = self.stats.npts
-        if side not in side_valid:
-            raise ValueError("'side' has to be one of: %s" % side_valid)
-        # retrieve function call from entry points
-        func = _getFunctionFromEntryPoint('taper', type)
-        # store all constraints for maximum taper length
-        max_half_lenghts = []
-        if max_percentage is not None:
-            max_half_lenghts.append(int(max_percentage * npts))
-        if max_length is not None:
-            max_half_lenghts.append(int(max_length * self.stats.sampling_rate))
-        if np.all([2 * mhl > npts for mhl in max_half_lenghts]):
-            msg = "The requested taper is longer than the trace. " \
-                  "The taper will be shortened to trace length."
-            warnings.warn(msg)
-        # add full trace length to constraints
-        max_half_lenghts.append(int(npts / 2))
-        # select shortest acceptable window half-length
-        wlen = min(max_half_lenghts)
-        # obspy.signal.cosTaper has a default value for taper percentage,
-        # we need to override is as we control percentage completely via npts
-        # of taper function and insert ones in the middle afterwards
-        if type == "cosine":
-            kwargs['p'] = 1.0
-        # tapering. tapering functions are expected to accept the number of
-        # samples as first argument and return an array of values between 0 and
-        # 1 with the same length as the data
-        if 2 * wlen == npts:
-            taper_sides = func(2 * wlen, **kwargs)
-        else:
-            taper_sides = func(2 * wlen + 1, **kwargs)
-        if side == 'left':
-            taper = np.hstack((taper_sides[:wlen], np.ones(npts - wlen)))
-        elif side == 'right':
-            taper = np.hstack((np.ones(npts - wlen),
-                               taper_sides[len(taper_sides) - wlen:]))
-        else:
-            taper = np.hstack((taper_sides[:wlen], np.ones(npts - 2 * wlen),
-                               taper_sides[len(taper_sides) - wlen:]))
+        taper = _getTaper(self.stats.npts, self.stats.sampling_rate,
+                          max_percentage, type=type, max_length=max_length,
+                          side=side, **kwargs)
         self.data = self.data * taper
         return self
 
@@ -2015,10 +2307,20 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
 
         return self
 
-    def copy(self):
+    def copy(self, copy_data=True):
         """
         Returns a deepcopy of the trace.
 
+        :type copy_data: bool, optional
+        :param copy_data: If ``False``, the data is not copied. The data of
+            the copy is a read-only view on the data of the trace, which
+            itself is left unchanged and writable. Processing methods replace
+            the data by a new array anyway, so both can be processed
+            independently. Changing the data of the copy in place, e.g.
+            ``tr2.data *= 2``, raises a :class:`ValueError`, replace it by a
+            writable copy first (``tr2.data = tr2.data.copy()``). Changing
+            the data of the original trace in place also changes the data of
+            the copy. Defaults to ``True``.
         :return: Copy of trace.
 
         This actually copies all data in the trace and does not only provide
@@ -2051,15 +2353,42 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         True
         >>> tr3 == tr
         True
+
+        A copy sharing the data until it is processed:
+
+        >>> tr4 = tr.copy(copy_data=False)
+        >>> np.may_share_memory(tr4.data, tr.data)
+        True
+        >>> tr4.data.flags.writeable
+        False
+        >>> tr.data.flags.writeable
+        True
+        """
+        if copy_data:
+            return deepcopy(self)
+        return _copySharingData(self, [self])
+
+    def _ensureWritable(self):
         """
-        return deepcopy(self)
+        Replaces read-only data, e.g. shared with a copy of the trace (see
+        :meth:`~obspy.core.trace.Trace.copy`), by a writable copy before the
+        data is changed in place.
+
+        :return: The writable data array.
+        """
+        if not self.data.flags.writeable:
+            self.data = self.data.copy()
+        return self.data
 
     def _addProcessingInfo(self, info):
         """
         Adds the given informational string to the `processing` field in the
         trace's :class:`~obspy.core.trace.Stats` object.
         """
-        proc = self.stats.setdefault('processing', [])
+        if not self.PROCESSING_INFO:
+            return
+        # bypass Stats.processing which formats all entries
+        proc = self.stats.__dict__.setdefault('processing', [])
         proc.append(info)
 
     @_add_processing_info
@@ -2452,6 +2781,35 @@ def _data_sanity_checks(value):
         raise ValueError(msg)
 
 
+def _readOnlyView(data):
+    """
+    Returns a read-only view on the given data array.
+
+    Masked arrays get their own copy of the mask.
+    """
+    if isinstance(data, np.ma.MaskedArray):
+        mask = np.ma.getmask(data)
+        if mask is not np.ma.nomask:
+            mask = mask.copy()
+        return np.ma.masked_array(_readOnlyView(data.data), mask=mask,
+                                  fill_value=data.fill_value)
+    view = data.view()
+    view.flags.writeable = False
+    return view
+
+
+def _copySharingData(obj, traces):
+    """
+    Returns a deep copy of the object, e.g. a Trace or Stream, in which the
+    data arrays of the given traces are replaced by read-only views on them
+    instead of being copied.
+    """
+    memo = {}
+    for tr in traces:
+        memo[id(tr.data)] = _readOnlyView(tr.data)
+    return deepcopy(obj, memo)
+
+
 if __name__ == '__main__':
     import doctest
     doctest.testmod(exclude_empty=True)
@@ -12,13 +12,29 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA @UnusedWildImport
 from future.utils import native_str
+from future import standard_library
+with standard_library.hooks():
+    from collections import OrderedDict
 
 import datetime
 import time
 import math
+import re
+import threading
+
+import numpy as np
 
 
 TIMESTAMP0 = datetime.datetime(1970, 1, 1, 0, 0)
+TIMESTAMP0_ORDINAL = TIMESTAMP0.toordinal()
+# maximum number of recently parsed ISO8601 strings kept in memory
+ISO8601_CACHE_SIZE = 10000
+# recently parsed ISO8601 strings and their timestamps
+_ISO8601_CACHE = OrderedDict()
+_ISO8601_CACHE_LOCK = threading.Lock()
+# ISO8601 calendar date time strings which can be parsed by NumPy directly
+_ISO8601_SIMPLE = re.compile(
+    r'^\d{4}-\d{2}-\d{2}(T\d{2}(:\d{2}(:\d{2}(\.\d{1,9})?)?)?)?Z?$')
 
 
 class UTCDateTime(object):
@@ -244,6 +260,11 @@ class UTCDateTime(object):
                     value = value.decode()
                 # got a string instance
                 value = value.strip()
+                # fast path for the most common ISO8601 date time strings
+                timestamp = self._parseISO8601Fast(value)
+                if timestamp is not None:
+                    self.timestamp = timestamp
+                    return
                 # check for ISO8601 date string
                 if value.count("T") == 1 or iso8601:
                     try:
@@ -367,6 +388,74 @@ class UTCDateTime(object):
         self.timestamp = (td.microseconds + (td.seconds + td.days * 86400) *
                           1000000) / 1000000.0 + ms
 
+    @staticmethod
+    def _parseISO8601Fast(value):
+        """
+        Parses ISO8601:2004 date time strings of the most common form
+        ``YYYY-MM-DDThh:mm:ss[.ffffff][Z|+hh:mm|-hh:mm]``.
+
+        Returns the timestamp in seconds or ``None`` if the string is not of
+        this form, in which case it should be parsed by
+        :meth:`UTCDateTime._parseISO8601`. The results of recently parsed
+        strings are kept in a cache of :const:`ISO8601_CACHE_SIZE` items.
+
+        .. rubric:: Example
+
+        >>> UTCDateTime._parseISO8601Fast("2009-12-31T12:23:34.5Z")
+        1262262214.5
+        >>> UTCDateTime._parseISO8601Fast("2009-12-31T13:23:34.5+01:00")
+        1262262214.5
+        >>> UTCDateTime._parseISO8601Fast("2009-365T12:23:34.5") is None
+        True
+        """
+        with _ISO8601_CACHE_LOCK:
+            timestamp = _ISO8601_CACHE.pop(value, None)
+            if timestamp is not None:
+                _ISO8601_CACHE[value] = timestamp
+                return timestamp
+        end = len(value)
+        offset = 0
+        if end and value[-1] == 'Z':
+            end -= 1
+        elif end >= 25 and value[-6] in '+-' and value[-3] == ':':
+            # time zone designator
+            if not (value[-5:-3] + value[-2:]).isdigit():
+                return None
+            offset = int(value[-5:-3]) * 3600 + int(value[-2:]) * 60
+            if value[-6] == '+':
+                offset = -offset
+            end -= 6
+        if end < 19 or value[4] != '-' or value[7] != '-' or \
+                value[10] != 'T' or value[13] != ':' or value[16] != ':':
+            return None
+        fraction = value[19:end]
+        if fraction and (fraction[0] != '.' or
+                         not fraction[1:].isdigit()):
+            return None
+        if not (value[0:4] + value[5:7] + value[8:10] + value[11:13] +
+                value[14:16] + value[17:19]).isdigit():
+            return None
+        try:
+            days = datetime.date(int(value[0:4]), int(value[5:7]),
+                                 int(value[8:10])).toordinal()
+            hour = int(value[11:13])
+            minute = int(value[14:16])
+            second = int(value[17:19])
+        except ValueError:
+            return None
+        if hour > 23 or minute > 59 or second > 59:
+            return None
+        # same floating point operations as UTCDateTime._parseISO8601()
+        timestamp = float((days - TIMESTAMP0_ORDINAL) * 86400 + hour * 3600 +
+                          minute * 60 + second)
+        timestamp += float(offset) + (fraction and float('0' + fraction) or 0)
+        with _ISO8601_CACHE_LOCK:
+            if ISO8601_CACHE_SIZE > 0:
+                _ISO8601_CACHE[value] = timestamp
+            while len(_ISO8601_CACHE) > max(ISO8601_CACHE_SIZE, 0):
+                _ISO8601_CACHE.popitem(last=False)
+        return timestamp
+
     @staticmethod
     def _parseISO8601(value):
         """
@@ -1442,6 +1531,292 @@ class UTCDateTime(object):
         return UTCDateTime()
 
 
+class UTCDateTimeArray(object):
+    """
+    An array of UTC-based points in time.
+
+    The times are stored as NumPy ``int64`` array of nanoseconds since
+    1970-01-01T00:00:00 (see :attr:`ns`), so arithmetic, comparisons and
+    conversions work on all times at once instead of creating one
+    :class:`UTCDateTime` object per point in time. Times between 1677 and
+    2262 can be represented.
+
+    :type values: :class:`UTCDateTimeArray`, list or :class:`numpy.ndarray`
+    :param values: :class:`UTCDateTime` objects, POSIX timestamps in seconds,
+        strings understood by :class:`UTCDateTime` or NumPy ``datetime64``
+        values.
+    :type precision: int, optional
+    :param precision: Number of decimal digits of seconds used by the rich
+        comparison operators and the string representation, see
+        :attr:`UTCDateTime.precision`. Defaults to
+        :attr:`UTCDateTime.DEFAULT_PRECISION`.
+
+    .. rubric:: Example
+
+    >>> times = UTCDateTimeArray(["2009-08-24T00:20:03", 1e9,
+    ...                           UTCDateTime(2010, 1, 1)])
+    >>> times  # doctest: +NORMALIZE_WHITESPACE
+    UTCDateTimeArray(['2009-08-24T00:20:03.000000Z',
+                      '2001-09-09T01:46:40.000000Z',
+                      '2010-01-01T00:00:00.000000Z'])
+    >>> times[0]
+    UTCDateTime(2009, 8, 24, 0, 20, 3)
+    >>> print(times + 1.5)  # doctest: +NORMALIZE_WHITESPACE
+    ['2009-08-24T00:20:04.500000Z' '2001-09-09T01:46:41.500000Z'
+     '2010-01-01T00:00:01.500000Z']
+    >>> (times - UTCDateTime(2009, 8, 24)).tolist()
+    [1203.0, -251072000.0, 11232000.0]
+    >>> (times > UTCDateTime(2009, 8, 24)).tolist()
+    [True, False, True]
+    >>> print(times[times.argsort()][0])
+    2001-09-09T01:46:40.000000Z
+    """
+    def __init__(self, values=(), precision=None):
+        if precision is None:
+            precision = getattr(values, 'precision',
+                                UTCDateTime.DEFAULT_PRECISION)
+        self.precision = precision
+        if isinstance(values, UTCDateTimeArray):
+            self.ns = values.ns.copy()
+            return
+        values = np.asarray(values)
+        if values.dtype.kind in 'iu':
+            self.ns = values.astype(np.int64) * 1000000000
+        elif values.dtype.kind == 'f':
+            self.ns = _timestampsToNanoseconds(values)
+        elif values.dtype.kind == 'M':
+            self.ns = values.astype(native_str('datetime64[ns]')).view(
+                np.int64)
+        elif values.dtype.kind in 'SU':
+            self.ns = _parseISO8601Array(values)
+        else:
+            self.ns = _timestampsToNanoseconds(
+                [v.timestamp if isinstance(v, UTCDateTime) else
+                 UTCDateTime(v).timestamp for v in values.ravel()]
+            ).reshape(values.shape)
+
+    @classmethod
+    def fromNanoseconds(cls, ns, precision=None):
+        """
+        Creates a new array from nanoseconds since 1970-01-01T00:00:00.
+
+        The given array is not copied.
+
+        >>> UTCDateTimeArray.fromNanoseconds([1500000000])
+        UTCDateTimeArray(['1970-01-01T00:00:01.500000Z'])
+        """
+        times = cls(precision=precision)
+        times.ns = np.asarray(ns, dtype=np.int64)
+        return times
+
+    def _getTimeStamp(self):
+        """
+        Returns UTC timestamps in seconds.
+
+        >>> UTCDateTimeArray([UTCDateTime(123.5)]).timestamp.tolist()
+        [123.5]
+        """
+        seconds, nanoseconds = np.divmod(self.ns, 1000000000)
+        return seconds.astype(np.float64) + nanoseconds / 1e9
+
+    timestamp = property(_getTimeStamp)
+
+    def _getPrecision(self):
+        return self._precision
+
+    def _setPrecision(self, value=6):
+        self._precision = int(value)
+
+    precision = property(_getPrecision, _setPrecision)
+
+    def __len__(self):
+        return len(self.ns)
+
+    def __iter__(self):
+        for timestamp in self.timestamp:
+            yield UTCDateTime(timestamp, precision=self._precision)
+
+    def __getitem__(self, index):
+        ns = self.ns[index]
+        if np.ndim(ns) == 0:
+            return self._toUTCDateTime(ns)
+        return UTCDateTimeArray.fromNanoseconds(ns, self._precision)
+
+    def __setitem__(self, index, value):
+        self.ns[index] = self._toNanoseconds(value)
+
+    def _toUTCDateTime(self, ns):
+        seconds, nanoseconds = divmod(int(ns), 1000000000)
+        return UTCDateTime(seconds + nanoseconds / 1e9,
+                           precision=self._precision)
+
+    @staticmethod
+    def _toNanoseconds(value):
+        """
+        Converts a time or times to nanoseconds.
+        """
+        if isinstance(value, UTCDateTimeArray):
+            return value.ns
+        if isinstance(value, UTCDateTime):
+            return _timestampsToNanoseconds(value.timestamp)
+        return UTCDateTimeArray(value).ns
+
+    @staticmethod
+    def _secondsToNanoseconds(value):
+        """
+        Converts relative times in seconds to nanoseconds.
+        """
+        if isinstance(value, datetime.timedelta):
+            return (value.microseconds + (value.seconds + value.days *
+                    86400) * 1000000) * 1000
+        value = np.asarray(value)
+        if value.dtype.kind in 'iu':
+            return value.astype(np.int64) * 1000000000
+        return np.round(value * 1e9).astype(np.int64)
+
+    def __add__(self, value):
+        """
+        Adds seconds to all times.
+        """
+        return UTCDateTimeArray.fromNanoseconds(
+            self.ns + self._secondsToNanoseconds(value), self._precision)
+
+    __radd__ = __add__
+
+    def __sub__(self, value):
+        """
+        Subtracts seconds from all times. Subtracting UTCDateTime objects
+        results into relative time spans in seconds.
+        """
+        if isinstance(value, (UTCDateTime, UTCDateTimeArray)):
+            return (self.ns - self._toNanoseconds(value)) / 1e9
+        return UTCDateTimeArray.fromNanoseconds(
+            self.ns - self._secondsToNanoseconds(value), self._precision)
+
+    def _compare(self, other):
+        """
+        Returns the differences to other times in nanoseconds rounded to the
+        precision of the array.
+        """
+        diff = self.ns - self._toNanoseconds(other)
+        if self._precision >= 9:
+            return diff
+        return np.round(diff / 10.0 ** (9 - self._precision))
+
+    def __eq__(self, other):
+        try:
+            return self._compare(other) == 0
+        except (TypeError, ValueError):
+            return np.zeros(self.ns.shape, dtype=np.bool_)
+
+    def __ne__(self, other):
+        return ~self.__eq__(other)
+
+    def __lt__(self, other):
+        return self._compare(other) < 0
+
+    def __le__(self, other):
+        return self._compare(other) <= 0
+
+    def __gt__(self, other):
+        return self._compare(other) > 0
+
+    def __ge__(self, other):
+        return self._compare(other) >= 0
+
+    # arrays are mutable
+    __hash__ = None
+
+    def argsort(self):
+        """
+        Returns the indices that would sort the array.
+        """
+        return np.argsort(self.ns, kind='mergesort')
+
+    def min(self):
+        return self._toUTCDateTime(self.ns.min())
+
+    def max(self):
+        return self._toUTCDateTime(self.ns.max())
+
+    def copy(self):
+        return UTCDateTimeArray(self)
+
+    def isoformat(self):
+        """
+        Returns ISO8601 strings of all times using the precision of the array.
+
+        >>> times = UTCDateTimeArray([1e9, 1.0000000015e9], precision=3)
+        >>> for time in times.isoformat():
+        ...     print(time)
+        2001-09-09T01:46:40.000Z
+        2001-09-09T01:46:41.500Z
+        """
+        precision = min(max(self._precision, 0), 9)
+        scale = 10 ** (9 - precision)
+        ns = (self.ns + scale // 2) // scale * scale
+        strings = np.datetime_as_string(
+            ns.view(native_str('datetime64[ns]')), unit=native_str('ns'))
+        width = 19 + (precision and precision + 1)
+        strings = strings.astype(native_str('U%d' % width))
+        return np.char.add(strings, 'Z')
+
+    def toUTCDateTime(self):
+        """
+        Returns a list of :class:`UTCDateTime` objects.
+        """
+        return list(self)
+
+    def toDatetime64(self):
+        """
+        Returns a NumPy ``datetime64[ns]`` array sharing the memory of the
+        array.
+        """
+        return self.ns.view(native_str('datetime64[ns]'))
+
+    def __str__(self):
+        return str(self.isoformat())
+
+    def __repr__(self):
+        return 'UTCDateTimeArray(%s)' % (
+            [native_str(s) for s in self.isoformat()], )
+
+
+def _timestampsToNanoseconds(timestamps):
+    """
+    Converts POSIX timestamps in seconds to integer nanoseconds.
+
+    The integer and fractional seconds are converted separately to keep the
+    full precision of the timestamps.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    seconds = np.floor(timestamps)
+    return seconds.astype(np.int64) * 1000000000 + \
+        np.round((timestamps - seconds) * 1e9).astype(np.int64)
+
+
+def _parseISO8601Array(values):
+    """
+    Parses an array of date time strings to nanoseconds.
+
+    Plain ISO8601 calendar date times are parsed by NumPy at once, all other
+    strings by :class:`UTCDateTime`.
+    """
+    values = np.char.strip(np.asarray(values, dtype=np.unicode_))
+    flat = values.ravel()
+    simple = np.array([_ISO8601_SIMPLE.match(v) is not None for v in flat],
+                      dtype=np.bool_)
+    ns = np.empty(flat.shape, dtype=np.int64)
+    if simple.any():
+        strings = np.char.rstrip(flat[simple], 'Z')
+        ns[simple] = strings.astype(native_str('datetime64[ns]')).view(
+            np.int64)
+    if not simple.all():
+        ns[~simple] = _timestampsToNanoseconds(
+            [UTCDateTime(v).timestamp for v in flat[~simple]])
+    return ns.reshape(values.shape)
+
+
 if __name__ == '__main__':
     import doctest
     doctest.testmod(exclude_empty=True)
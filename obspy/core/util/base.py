@@ -17,11 +17,14 @@ with standard_library.hooks():
     from collections import OrderedDict
 
 from obspy.core.util.misc import toIntOrZero
-from pkg_resources import iter_entry_points, load_entry_point
+import collections
 import doctest
 import inspect
+import io
+import json
 import numpy as np
 import os
+import re
 import sys
 import tempfile
 
@@ -42,6 +45,76 @@ WAVEFORM_PREFERRED_ORDER = ['MSEED', 'SAC', 'GSE2', 'SEISAN', 'SACXY', 'GSE1',
                             'AH']
 EVENT_PREFERRED_ORDER = ['QUAKEML']
 
+# waveform formats whose readers spend most of the time in reentrant C code
+# releasing the GIL - these are read in parallel using threads instead of
+# processes. MSEED is missing on purpose as libmseed uses global logging
+# handlers.
+WAVEFORM_THREADED_FORMATS = ['GSE2', 'SEGY', 'SU']
+
+# processing functions (lower case names) per entry point group which accept
+# two-dimensional arrays and process each row on its own - the Stream
+# processing methods process all traces with the same sampling rate, number
+# of samples and data type at once.
+BATCHED_PROCESSING = {
+    'filter': ['bandpass', 'bandstop', 'lowpass', 'highpass',
+               'lowpasscheby2'],
+    'detrend': ['simple', 'linear', 'constant', 'demean'],
+    'differentiate': ['gradient'],
+    'integrate': ['cumtrapz'],
+    'trigger': ['recstalta', 'classicstalta'],
+}
+
+# cheap signatures of the first bytes of a file per plug-in type. Formats
+# whose signature matches are probed first during the automatic format
+# detection, the actual decision is still made by the isFormat functions.
+FORMAT_SIGNATURES = {
+    'waveform': [
+        ('MSEED', br'[0-9 \x00]{6}[DRQMV]'),
+        ('GSE2', br'\s*(WID2|BEGIN GSE2|DATA_TYPE)'),
+        ('GSE1', br'(WID1|XW01)'),
+        ('SLIST', br'TIMESERIES[^\n]*SLIST'),
+        ('TSPAIR', br'TIMESERIES[^\n]*TSPAIR'),
+        ('SH_ASC', br'DELTA:'),
+        ('Q', br'43981'),
+        ('WAV', br'RIFF.{4}WAVE'),
+        ('PICKLE', br'\x80[\x02-\x05]'),
+    ],
+}
+# number of bytes used to check the signatures
+FORMAT_SIGNATURE_LENGTH = 256
+# maximum number of directories whose last detected format is remembered
+FORMAT_DIRECTORY_CACHE_SIZE = 1000
+
+# entry point groups of all plug-in types as (group, subgroup, order)
+ENTRY_POINT_GROUPS = {
+    'trigger': ('obspy.plugin.trigger', None, None),
+    'filter': ('obspy.plugin.filter', None, None),
+    'rotate': ('obspy.plugin.rotate', None, None),
+    'detrend': ('obspy.plugin.detrend', None, None),
+    'integrate': ('obspy.plugin.integrate', None, None),
+    'interpolate': ('obspy.plugin.interpolate', None, None),
+    'differentiate': ('obspy.plugin.differentiate', None, None),
+    'waveform': ('obspy.plugin.waveform', 'readFormat',
+                 WAVEFORM_PREFERRED_ORDER),
+    'waveform_write': ('obspy.plugin.waveform', 'writeFormat',
+                       WAVEFORM_PREFERRED_ORDER),
+    'event': ('obspy.plugin.event', 'readFormat', None),
+    'event_write': ('obspy.plugin.event', 'writeFormat', None),
+    'taper': ('obspy.plugin.taper', None, None),
+    'inventory': ('obspy.plugin.inventory', 'readFormat', None),
+    'inventory_write': ('obspy.plugin.inventory', 'writeFormat', None),
+}
+# file caching the entry point metadata of all plug-ins across interpreter
+# sessions, may be changed using the OBSPY_ENTRY_POINT_CACHE environment
+# variable - an empty value disables the cache
+ENTRY_POINT_CACHE_FILE = os.environ.get(
+    'OBSPY_ENTRY_POINT_CACHE',
+    os.path.join(os.environ.get('XDG_CACHE_HOME',
+                                os.path.join(os.path.expanduser('~'),
+                                             '.cache')),
+                 'obspy', 'entry_points.json'))
+ENTRY_POINT_CACHE_VERSION = 1
+
 _sys_is_le = sys.byteorder == 'little'
 NATIVE_BYTEORDER = _sys_is_le and '<' or '>'
 
@@ -178,6 +251,190 @@ def getExampleFile(filename):
     raise OSError(msg)
 
 
+class _EntryPoint(object):
+    """
+    Light-weight replacement of :class:`pkg_resources.EntryPoint` which can
+    be restored from the entry point cache without importing
+    :mod:`pkg_resources`.
+
+    .. rubric:: Example
+
+    >>> ep = _EntryPoint('simple', 'obspy.signal.detrend', ['simple'],
+    ...                  'obspy', '/path/to/site-packages')
+    >>> print(ep)
+    simple = obspy.signal.detrend:simple
+    >>> ep.dist.key
+    'obspy'
+    >>> ep.load()  # doctest: +ELLIPSIS
+    <function simple at 0x...>
+    """
+    def __init__(self, name, module_name, attrs=(), dist_key=None,
+                 dist_location=None):
+        self.name = name
+        self.module_name = module_name
+        self.attrs = tuple(attrs)
+        self.dist = _Distribution(dist_key, dist_location)
+
+    def __str__(self):
+        s = "%s = %s" % (self.name, self.module_name)
+        if self.attrs:
+            s += ":" + ".".join(self.attrs)
+        return s
+
+    def __repr__(self):
+        return "EntryPoint.parse(%r)" % native_str(self)
+
+    def load(self):
+        """
+        Imports the module of the entry point and returns the referenced
+        object.
+        """
+        obj = __import__(self.module_name, fromlist=[native_str("__name__")])
+        for attr in self.attrs:
+            obj = getattr(obj, attr)
+        return obj
+
+
+_Distribution = collections.namedtuple('_Distribution', ['key', 'location'])
+
+
+# entry points of all ObsPy plug-in groups, see _getEntryPointMap()
+_ENTRY_POINT_MAP = None
+
+
+def _getEntryPointCacheKey(files):
+    """
+    Returns the key used to validate the entry point cache.
+
+    The key consists of the modification times of all directories on the
+    Python path - these change whenever distributions are (un)installed - and
+    of all files the entry points were originally read from. The first path
+    entry is skipped as it is the directory of the running script.
+    """
+    key = [sys.version, ENTRY_POINT_CACHE_VERSION]
+    for path in sys.path[1:] + files:
+        try:
+            key.append([path, os.stat(path).st_mtime])
+        except OSError:
+            key.append([path, None])
+    return key
+
+
+def _scanEntryPoints():
+    """
+    Collects the entry points of all ObsPy plug-in groups of all installed
+    distributions using :mod:`pkg_resources`.
+
+    Returns a dictionary with a list of ``(name, module_name, attrs,
+    dist_key, dist_location)`` per group and the list of files the entry
+    points were read from.
+    """
+    from pkg_resources import working_set
+    groups = {}
+    files = []
+    for dist in working_set:
+        found = False
+        for group, eps in dist.get_entry_map().items():
+            if not group.startswith('obspy.plugin.'):
+                continue
+            found = True
+            groups.setdefault(group, []).extend(
+                (ep.name, ep.module_name, list(ep.attrs), dist.key,
+                 dist.location) for ep in eps.values())
+        egg_info = getattr(dist, 'egg_info', None)
+        if found and egg_info:
+            files.append(os.path.join(egg_info, 'entry_points.txt'))
+    return groups, files
+
+
+def _loadEntryPointCache(filename):
+    """
+    Returns the entry point groups stored in the cache file or ``None`` if
+    the cache is missing or outdated.
+    """
+    try:
+        with io.open(filename, 'rt', encoding='utf-8') as fh:
+            cache = json.load(fh)
+        if cache['key'] != _getEntryPointCacheKey(cache['files']):
+            return None
+        return cache['groups']
+    except Exception:
+        return None
+
+
+def _writeEntryPointCache(filename, groups, files):
+    """
+    Writes the entry point groups to the cache file. Any errors are silently
+    ignored, e.g. if the cache directory is not writable.
+    """
+    cache = {'key': _getEntryPointCacheKey(files), 'files': files,
+             'groups': groups}
+    try:
+        directory = os.path.dirname(filename)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        # write to a temporary file first so concurrent processes never
+        # read a partially written cache
+        fd, temp = tempfile.mkstemp(dir=directory or None,
+                                    prefix='.entry_points-')
+        with io.open(fd, 'wb') as fh:
+            fh.write(json.dumps(cache).encode('utf-8'))
+        try:
+            os.rename(temp, filename)
+        except OSError:
+            # Windows does not allow renaming onto an existing file
+            os.remove(filename)
+            os.rename(temp, filename)
+    except Exception:
+        pass
+
+
+def _getEntryPointMap():
+    """
+    Returns the entry points of all ObsPy plug-in groups as a dictionary
+    mapping group names to dictionaries of :class:`_EntryPoint` objects.
+
+    The entry points are read only once per interpreter session, preferably
+    from the cache file given by :const:`ENTRY_POINT_CACHE_FILE`. Scanning
+    all installed distributions using :mod:`pkg_resources` is only necessary
+    if the cache is missing or outdated.
+    """
+    global _ENTRY_POINT_MAP
+    if _ENTRY_POINT_MAP is not None:
+        return _ENTRY_POINT_MAP
+    groups = None
+    if ENTRY_POINT_CACHE_FILE:
+        groups = _loadEntryPointCache(ENTRY_POINT_CACHE_FILE)
+    if groups is None:
+        groups, files = _scanEntryPoints()
+        if ENTRY_POINT_CACHE_FILE:
+            _writeEntryPointCache(ENTRY_POINT_CACHE_FILE, groups, files)
+    entry_point_map = {}
+    for group, eps in groups.items():
+        entry_point_map[group] = OrderedDict(
+            (ep[0], _EntryPoint(*ep)) for ep in eps)
+    _ENTRY_POINT_MAP = entry_point_map
+    return _ENTRY_POINT_MAP
+
+
+def _loadEntryPoint(group, name):
+    """
+    Loads the entry point of the given name and group, the equivalent of
+    :func:`pkg_resources.load_entry_point`.
+
+    .. rubric:: Example
+
+    >>> _loadEntryPoint('obspy.plugin.waveform.SLIST', 'isFormat')
+    ... # doctest: +ELLIPSIS
+    <function isSLIST at 0x...>
+    """
+    try:
+        ep = _getEntryPointMap()[group][name]
+    except KeyError:
+        raise ImportError("Entry point %r not found" % ((group, name),))
+    return ep.load()
+
+
 def _getEntryPoints(group, subgroup=None):
     """
     Gets a dictionary of all available plug-ins of a group or subgroup.
@@ -194,10 +451,11 @@ def _getEntryPoints(group, subgroup=None):
     >>> _getEntryPoints('obspy.plugin.waveform')  # doctest: +ELLIPSIS
     {...'SLIST': EntryPoint.parse('SLIST = obspy.core.ascii')...}
     """
+    entry_point_map = _getEntryPointMap()
     features = {}
-    for ep in iter_entry_points(group):
+    for ep in entry_point_map.get(group, {}).values():
         if subgroup:
-            if list(iter_entry_points(group + '.' + ep.name, subgroup)):
+            if subgroup in entry_point_map.get(group + '.' + ep.name, {}):
                 features[ep.name] = ep
         else:
             features[ep.name] = ep
@@ -224,25 +482,40 @@ def _getOrderedEntryPoints(group, subgroup=None, order_list=[]):
     return entry_points
 
 
-ENTRY_POINTS = {
-    'trigger': _getEntryPoints('obspy.plugin.trigger'),
-    'filter': _getEntryPoints('obspy.plugin.filter'),
-    'rotate': _getEntryPoints('obspy.plugin.rotate'),
-    'detrend': _getEntryPoints('obspy.plugin.detrend'),
-    'integrate': _getEntryPoints('obspy.plugin.integrate'),
-    'interpolate': _getEntryPoints('obspy.plugin.interpolate'),
-    'differentiate': _getEntryPoints('obspy.plugin.differentiate'),
-    'waveform': _getOrderedEntryPoints('obspy.plugin.waveform',
-                                       'readFormat', WAVEFORM_PREFERRED_ORDER),
-    'waveform_write': _getOrderedEntryPoints(
-        'obspy.plugin.waveform', 'writeFormat', WAVEFORM_PREFERRED_ORDER),
-    'event': _getEntryPoints('obspy.plugin.event', 'readFormat'),
-    'event_write': _getEntryPoints('obspy.plugin.event', 'writeFormat'),
-    'taper': _getEntryPoints('obspy.plugin.taper'),
-    'inventory': _getEntryPoints('obspy.plugin.inventory', 'readFormat'),
-    'inventory_write': _getEntryPoints('obspy.plugin.inventory',
-                                       'writeFormat'),
-}
+class _EntryPointRegistry(collections.Mapping):
+    """
+    Read-only mapping of plug-in types (see :const:`ENTRY_POINT_GROUPS`) to
+    the dictionaries of their entry points.
+
+    The entry points of a plug-in type are only collected on first access.
+    None of the plug-in modules is imported until one of its functions is
+    actually loaded.
+    """
+    def __init__(self, groups):
+        self._groups = groups
+        self._entry_points = {}
+
+    def __getitem__(self, key):
+        try:
+            return self._entry_points[key]
+        except KeyError:
+            pass
+        group, subgroup, order = self._groups[key]
+        if order is None:
+            eps = _getEntryPoints(group, subgroup)
+        else:
+            eps = _getOrderedEntryPoints(group, subgroup, order)
+        self._entry_points[key] = eps
+        return eps
+
+    def __iter__(self):
+        return iter(self._groups)
+
+    def __len__(self):
+        return len(self._groups)
+
+
+ENTRY_POINTS = _EntryPointRegistry(ENTRY_POINT_GROUPS)
 
 
 def _getFunctionFromEntryPoint(group, type):
@@ -283,8 +556,7 @@ def _getFunctionFromEntryPoint(group, type):
     # import function point
     # any issue during import of entry point should be raised, so the user has
     # a chance to correct the problem
-    func = load_entry_point(entry_point.dist.key, 'obspy.plugin.%s' % (group),
-                            entry_point.name)
+    func = _loadEntryPoint('obspy.plugin.%s' % (group), entry_point.name)
     return func
 
 
@@ -332,6 +604,88 @@ def getSciPyVersion():
     return version
 
 
+# loaded plug-in functions
+_PLUGIN_FUNCTIONS = {}
+# last detected format per plug-in type and directory
+_DIRECTORY_FORMATS = OrderedDict()
+# compiled format signatures per plug-in type
+_COMPILED_SIGNATURES = {}
+
+
+def _getPluginFunction(plugin_type, format_ep, method):
+    """
+    Returns a function of a plug-in, e.g. ``isFormat`` or ``readFormat``.
+
+    Loaded functions are cached to avoid the overhead of looking up the entry
+    point on subsequent calls.
+    """
+    key = (plugin_type, format_ep.dist.key, format_ep.name, method)
+    try:
+        return _PLUGIN_FUNCTIONS[key]
+    except KeyError:
+        pass
+    func = _loadEntryPoint(
+        'obspy.plugin.%s.%s' % (plugin_type, format_ep.name), method)
+    _PLUGIN_FUNCTIONS[key] = func
+    return func
+
+
+def _getFormatCandidates(plugin_type, filename):
+    """
+    Returns the names of all formats of a plug-in type in the order they
+    should be probed for the given file.
+
+    The format last detected for a file in the same directory comes first,
+    followed by all formats whose signature (see :const:`FORMAT_SIGNATURES`)
+    matches the first bytes of the file and finally all remaining formats in
+    their default order.
+    """
+    names = list(ENTRY_POINTS[plugin_type].keys())
+    candidates = []
+    if isinstance(filename, (str, native_str)):
+        directory = os.path.dirname(os.path.abspath(filename))
+        last_format = _DIRECTORY_FORMATS.get((plugin_type, directory))
+        if last_format is not None:
+            candidates.append(last_format)
+    if plugin_type not in _COMPILED_SIGNATURES:
+        _COMPILED_SIGNATURES[plugin_type] = [
+            (name, re.compile(pattern, re.DOTALL))
+            for name, pattern in FORMAT_SIGNATURES.get(plugin_type, [])]
+    signatures = _COMPILED_SIGNATURES[plugin_type]
+    if signatures:
+        header = _readFileHeader(filename, FORMAT_SIGNATURE_LENGTH)
+        candidates.extend(name for name, pattern in signatures
+                          if pattern.match(header))
+    ordered = []
+    for name in candidates + names:
+        if name in names and name not in ordered:
+            ordered.append(name)
+    return ordered
+
+
+def _readFileHeader(filename, length):
+    """
+    Returns the first bytes of a file or file-like object without changing
+    the position of the latter. Returns an empty bytestring if the file can
+    not be read.
+    """
+    try:
+        if hasattr(filename, "read"):
+            position = filename.tell()
+            try:
+                header = filename.read(length)
+            finally:
+                filename.seek(position, 0)
+        else:
+            with open(filename, 'rb') as fh:
+                header = fh.read(length)
+    except Exception:
+        return b''
+    if not isinstance(header, bytes):
+        return b''
+    return header
+
+
 def _readFromPlugin(plugin_type, filename, format=None, **kwargs):
     """
     Reads a single file from a plug-in's readFormat function.
@@ -340,13 +694,12 @@ def _readFromPlugin(plugin_type, filename, format=None, **kwargs):
     # get format entry point
     format_ep = None
     if not format:
-        # auto detect format - go through all known formats in given sort order
-        for format_ep in EPS.values():
+        # auto detect format - go through all known formats starting with the
+        # most likely ones
+        for name in _getFormatCandidates(plugin_type, filename):
+            format_ep = EPS[name]
             # search isFormat for given entry point
-            isFormat = load_entry_point(
-                format_ep.dist.key,
-                'obspy.plugin.%s.%s' % (plugin_type, format_ep.name),
-                'isFormat')
+            isFormat = _getPluginFunction(plugin_type, format_ep, 'isFormat')
             # If it is a file-like object, store the position and restore it
             # later to avoid that the isFormat() functions move the file
             # pointer.
@@ -362,6 +715,13 @@ def _readFromPlugin(plugin_type, filename, format=None, **kwargs):
                 break
         else:
             raise TypeError('Unknown format for file %s' % filename)
+        # remember the format for other files in the same directory
+        if isinstance(filename, (str, native_str)):
+            directory = os.path.dirname(os.path.abspath(filename))
+            _DIRECTORY_FORMATS.pop((plugin_type, directory), None)
+            _DIRECTORY_FORMATS[(plugin_type, directory)] = format_ep.name
+            while len(_DIRECTORY_FORMATS) > FORMAT_DIRECTORY_CACHE_SIZE:
+                _DIRECTORY_FORMATS.popitem(last=False)
     else:
         # format given via argument
         format = format.upper()
@@ -373,9 +733,7 @@ def _readFromPlugin(plugin_type, filename, format=None, **kwargs):
     # file format should be known by now
     try:
         # search readFormat for given entry point
-        readFormat = load_entry_point(
-            format_ep.dist.key,
-            'obspy.plugin.%s.%s' % (plugin_type, format_ep.name), 'readFormat')
+        readFormat = _getPluginFunction(plugin_type, format_ep, 'readFormat')
     except ImportError:
         msg = "Format \"%s\" is not supported. Supported types: %s"
         raise TypeError(msg % (format_ep.name, ', '.join(EPS)))
@@ -431,9 +789,12 @@ def make_format_plugin_table(group="waveform", method="read", numspaces=4,
     mod_list = []
     for name, ep in eps.items():
         module_short = ":mod:`%s`" % ".".join(ep.module_name.split(".")[:2])
-        func = load_entry_point(ep.dist.key,
-                                "obspy.plugin.%s.%s" % (group, name), method)
-        func_str = ':func:`%s`' % ".".join((ep.module_name, func.__name__))
+        # use the entry point metadata instead of loading the function to
+        # avoid importing all plug-in modules
+        func_ep = _getEntryPointMap()["obspy.plugin.%s.%s" % (group, name)][
+            method]
+        func_str = ':func:`%s`' % ".".join((func_ep.module_name, ) +
+                                           func_ep.attrs)
         mod_list.append((name, module_short, func_str))
 
     mod_list = sorted(mod_list)
@@ -23,6 +23,7 @@ from future.utils import native_str
 
 from obspy import UTCDateTime, Stream, Trace
 from obspy.core.preview import mergePreviews
+from obspy.core.trace import _copySharingData
 from obspy.core.util import createEmptyDataChunk, FlinnEngdahl, \
     getMatplotlibVersion, locations2degrees
 from obspy.core.util.decorator import deprecated_keywords
@@ -72,7 +73,9 @@ class WaveformPlotting(object):
         if len(self.stream) < 1:
             msg = "Empty stream object"
             raise IndexError(msg)
-        self.stream = self.stream.copy()
+        # the plotted data is never changed in place, share it with the given
+        # stream instead of copying it
+        self.stream = _copySharingData(self.stream, self.stream)
         # Type of the plot.
         self.type = kwargs.get('type', 'normal')
         # Start and end times of the plots.
@@ -69,9 +69,19 @@ attribute of each trace.
 Several key word arguments are available which can be used for example to
 only read certain records from a file or force the header byteorder:
 ``starttime``, ``endtime``, ``headonly``, ``sourcename``, ``reclen``,
-``details``, and ``header_byteorder``. They are passed to the
-:meth:`~obspy.mseed.core.readMSEED` method so refer to it for details to
-each parameter.
+``details``, ``header_byteorder``, ``use_mmap`` and ``use_index``. They are
+passed to the :meth:`~obspy.mseed.core.readMSEED` method so refer to it for
+details to each parameter.
+
+Files or file-like objects too large to be held in memory can be processed
+trace by trace with :func:`~obspy.mseed.core.iterMSEED` which yields the
+contained data while reading the records incrementally.
+
+>>> from obspy.core.util import getExampleFile
+>>> from obspy.mseed.core import iterMSEED
+>>> for tr in iterMSEED(getExampleFile("test.mseed")):  # doctest: +ELLIPSIS
+...     print(tr)
+NL.HGN.00.BHZ | 2003-05-29T02:13:22.043400Z - ... | 40.0 Hz, 11947 samples
 
 Writing
 -------
@@ -138,6 +148,8 @@ some purposes. Refer to the documentation of each for details.
 +------------------------------------------------------+--------------------------------------------------------------------------+
 | :func:`~obspy.mseed.util.getRecordInformation`       |   Returns record information about given files and file-like object.     |
 +------------------------------------------------------+--------------------------------------------------------------------------+
+| :func:`~obspy.mseed.util.getRecordIndex`             |   Returns a persistent index of all records of a file.                   |
++------------------------------------------------------+--------------------------------------------------------------------------+
 | :func:`~obspy.mseed.util.set_flags_in_fixed_headers` |   Updates a given miniSEED file with some fixed header flags.            |
 +------------------------------------------------------+--------------------------------------------------------------------------+
 """
@@ -6,17 +6,20 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
 from future.utils import native_str
-from struct import pack
+from struct import pack, unpack
 
 from obspy.mseed.headers import clibmseed, ENCODINGS, HPTMODULUS, \
     SAMPLETYPE, DATATYPES, UNSUPPORTED_ENCODINGS, \
     VALID_RECORD_LENGTHS, HPTERROR, SelectTime, Selections, blkt_1001_s, \
-    VALID_CONTROL_HEADERS, SEED_CONTROL_HEADERS, blkt_100_s
+    SEED_CONTROL_HEADERS, MINI_SEED_CONTROL_HEADERS, blkt_100_s
 from obspy.mseed import util
 
 from obspy import Stream, Trace, UTCDateTime
 from obspy.core.util import NATIVE_BYTEORDER
+import collections
 import ctypes as C
+import fnmatch
+import io
 import numpy as np
 import os
 import warnings
@@ -103,7 +106,8 @@ def isMSEED(filename):
 
 def readMSEED(mseed_object, starttime=None, endtime=None, headonly=False,
               sourcename=None, reclen=None, details=False,
-              header_byteorder=None, verbose=None, **kwargs):
+              header_byteorder=None, verbose=None, use_mmap=False,
+              use_index=False, **kwargs):
     """
     Reads a Mini-SEED file and returns a Stream object.
 
@@ -149,6 +153,21 @@ def readMSEED(mseed_object, starttime=None, endtime=None, headonly=False,
         little-endian, ``1`` or ``'>'`` for MBF or big-endian. ``'='`` is the
         native byte order. Used to enforce the header byte order. Useful in
         some rare cases where the automatic byte order detection fails.
+    :type use_mmap: bool, optional
+    :param use_mmap: If ``True`` and a filename is given, the file will be
+        memory mapped instead of being read into memory. If additionally
+        ``starttime``, ``endtime`` or ``sourcename`` are given, only the
+        records whose fixed header matches the selection are passed on to
+        libmseed so just these have to be fetched from disc and decoded. This
+        only works for files with a constant record length, otherwise the
+        whole file is handed to libmseed as usual.
+    :type use_index: bool, optional
+    :param use_index: If ``True`` and a filename together with ``starttime``,
+        ``endtime`` or ``sourcename`` is given, a record index of the file is
+        used to only read the matching records from disc. The index is stored
+        next to the file and rebuilt whenever the file changes, see
+        :func:`~obspy.mseed.util.getRecordIndex`. Only works for files with a
+        constant record length, otherwise the whole file is read as usual.
 
     .. rubric:: Example
 
@@ -216,6 +235,18 @@ def readMSEED(mseed_object, starttime=None, endtime=None, headonly=False,
             ' behavior.'
         warnings.warn(msg, category=DeprecationWarning)
 
+    # Check the selection.
+    if starttime is not None and not isinstance(starttime, UTCDateTime):
+        msg = 'starttime needs to be a UTCDateTime object'
+        raise ValueError(msg)
+    if endtime is not None and not isinstance(endtime, UTCDateTime):
+        msg = 'endtime needs to be a UTCDateTime object'
+        raise ValueError(msg)
+    if sourcename is not None and not isinstance(sourcename, (str,
+                                                              native_str)):
+        msg = 'sourcename needs to be a string'
+        raise ValueError(msg)
+
     # Parse some information about the file.
     if header_byteorder == 0:
         bo = "<"
@@ -249,35 +280,24 @@ def readMSEED(mseed_object, starttime=None, endtime=None, headonly=False,
 
     # If it's a file name just read it.
     if isinstance(mseed_object, (str, native_str)):
-        # Read to NumPy array which is used as a buffer.
-        bfrNp = np.fromfile(mseed_object, dtype=np.int8)
+        if use_index and (starttime is not None or endtime is not None or
+                          sourcename is not None):
+            bfrNp = _readIndexedRecords(mseed_object, starttime, endtime,
+                                        sourcename)
+            if bfrNp is None:
+                return Stream()
+        elif use_mmap:
+            # Map the file to memory. Only the accessed parts will be read.
+            bfrNp = np.memmap(mseed_object, dtype=np.int8, mode='r')
+        else:
+            # Read to NumPy array which is used as a buffer.
+            bfrNp = np.fromfile(mseed_object, dtype=np.int8)
     elif hasattr(mseed_object, 'read'):
         bfrNp = np.fromstring(mseed_object.read(), dtype=np.int8)
 
-    # Get the record length
-    try:
-        record_length = pow(2, int(''.join([chr(_i) for _i in bfrNp[19:21]])))
-    except ValueError:
-        record_length = 4096
-
     # Search for data records and pass only the data part to the underlying C
     # routine.
-    offset = 0
-    # 0 to 9 are defined in a row in the ASCII charset.
-    min_ascii = ord('0')
-    # Small function to check whether an array of ASCII values contains only
-    # digits.
-    isdigit = lambda x: True if (x - min_ascii).max() <= 9 else False
-    while True:
-        # This should never happen
-        if (isdigit(bfrNp[offset:offset + 6]) is False) or \
-                (bfrNp[offset + 6] not in VALID_CONTROL_HEADERS):
-            msg = 'Not a valid (Mini-)SEED file'
-            raise Exception(msg)
-        elif bfrNp[offset + 6] in SEED_CONTROL_HEADERS:
-            offset += record_length
-            continue
-        break
+    offset = util._getDataRecordOffset(bfrNp)
     bfrNp = bfrNp[offset:]
     buflen = len(bfrNp)
 
@@ -289,27 +309,18 @@ def readMSEED(mseed_object, starttime=None, endtime=None, headonly=False,
         selections = Selections()
         selections.timewindows.contents = select_time
         if starttime is not None:
-            if not isinstance(starttime, UTCDateTime):
-                msg = 'starttime needs to be a UTCDateTime object'
-                raise ValueError(msg)
             selections.timewindows.contents.starttime = \
                 util._convertDatetimeToMSTime(starttime)
         else:
             # HPTERROR results in no starttime.
             selections.timewindows.contents.starttime = HPTERROR
         if endtime is not None:
-            if not isinstance(endtime, UTCDateTime):
-                msg = 'endtime needs to be a UTCDateTime object'
-                raise ValueError(msg)
             selections.timewindows.contents.endtime = \
                 util._convertDatetimeToMSTime(endtime)
         else:
             # HPTERROR results in no starttime.
             selections.timewindows.contents.endtime = HPTERROR
         if sourcename is not None:
-            if not isinstance(sourcename, (str, native_str)):
-                msg = 'sourcename needs to be a string'
-                raise ValueError(msg)
             # libmseed uses underscores as separators and allows filtering
             # after the dataquality which is disabled here to not confuse
             # users. (* == all data qualities)
@@ -317,6 +328,17 @@ def readMSEED(mseed_object, starttime=None, endtime=None, headonly=False,
                 encode('ascii', 'ignore')
         else:
             selections.srcname = b'*'
+
+    # Only pass the records matching the selection to libmseed if the file is
+    # memory mapped.
+    if selections is not None and isinstance(bfrNp, np.memmap):
+        bfrNp = _selectRecords(bfrNp, info['record_length'],
+                               info['byteorder'], starttime, endtime,
+                               sourcename)
+        if bfrNp is None:
+            return Stream()
+        buflen = len(bfrNp)
+
     all_data = []
 
     # Use a callback function to allocate the memory and keep track of the
@@ -436,6 +458,287 @@ def readMSEED(mseed_object, starttime=None, endtime=None, headonly=False,
     return Stream(traces=traces)
 
 
+def iterMSEED(mseed_object, starttime=None, endtime=None, sourcename=None,
+              max_records=256, reclen=None, header_byteorder=None, **kwargs):
+    """
+    Reads a Mini-SEED file or file-like object record by record and yields
+    the contained data as Trace objects.
+
+    In contrast to :func:`readMSEED` the data is never held in memory as a
+    whole. Records are collected per source name as long as they are
+    contiguous and passed on to libmseed either when a gap occurs or once
+    ``max_records`` records have been collected. Thus at most ``max_records``
+    records per source name are held in memory at any time. Contiguous data
+    longer than ``max_records`` records is split into several traces which
+    can be merged again if desired.
+
+    :param mseed_object: Filename or open file-like object that contains the
+        binary Mini-SEED data. Any object providing a ``read()`` method, e.g.
+        a socket wrapped with ``makefile()``, will be considered to be a
+        file-like object. No seeking is required.
+    :type starttime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+    :param starttime: Only read data samples after or at the start time.
+    :type endtime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+    :param endtime: Only read data samples before or at the end time.
+    :type sourcename: str
+    :param sourcename: Source name has to have the structure
+        'network.station.location.channel' and can contain globbing characters.
+    :type max_records: int, optional
+    :param max_records: Maximum number of records decoded at once for each
+        source name.
+    :param reclen: Record length in bytes used for records without blockette
+        1000. If ``None``, such records will raise an error.
+    :type header_byteorder: int or str, optional
+    :param header_byteorder: Must be either ``0`` or ``'<'`` for LSBF or
+        little-endian, ``1`` or ``'>'`` for MBF or big-endian. ``'='`` is the
+        native byte order. If not given, it will be determined from the first
+        record.
+
+    Any additional keyword arguments, e.g. ``headonly`` or ``details``, are
+    passed to :func:`readMSEED`. Note that the values in ``stats.mseed``
+    describing the file, e.g. ``filesize`` and ``number_of_records``, refer to
+    the block of records a trace was decoded from.
+
+    .. rubric:: Example
+
+    >>> from obspy.core.util import getExampleFile
+    >>> filename = getExampleFile("BW.BGLD.__.EHE.D.2008.001.first_10_records")
+    >>> for tr in iterMSEED(filename, max_records=4):
+    ...     print(tr)  # doctest: +ELLIPSIS
+    BW.BGLD..EHE | 2007-12-31T23:59:59.915000Z - ... | 200.0 Hz, 1648 samples
+    BW.BGLD..EHE | 2008-01-01T00:00:08.155000Z - ... | 200.0 Hz, 1648 samples
+    BW.BGLD..EHE | 2008-01-01T00:00:16.395000Z - ... | 200.0 Hz, 824 samples
+    """
+    if isinstance(mseed_object, (str, native_str)):
+        with io.open(mseed_object, 'rb') as fh:
+            for trace in iterMSEED(fh, starttime=starttime, endtime=endtime,
+                                   sourcename=sourcename,
+                                   max_records=max_records, reclen=reclen,
+                                   header_byteorder=header_byteorder,
+                                   **kwargs):
+                yield trace
+        return
+
+    if header_byteorder == "=":
+        header_byteorder = NATIVE_BYTEORDER
+    if header_byteorder in [0, "0", "<"]:
+        endian = "<"
+    elif header_byteorder in [1, "1", ">"]:
+        endian = ">"
+    else:
+        endian = None
+    if reclen is not None and reclen not in VALID_RECORD_LENGTHS:
+        msg = 'Invalid record length.'
+        raise ValueError(msg)
+    kwargs.update({'starttime': starttime, 'endtime': endtime,
+                   'sourcename': sourcename})
+    min_reclen = VALID_RECORD_LENGTHS[0]
+    # Record length of full SEED control headers if any.
+    control_reclen = None
+    # Buffered records, the end time and sampling rate of the last record
+    # for each source name.
+    pending = collections.OrderedDict()
+
+    def _flush(srcname):
+        records = pending.pop(srcname)[0]
+        bfr = io.BytesIO(b''.join(records))
+        return readMSEED(bfr, header_byteorder=endian, **kwargs)
+
+    while True:
+        header = _readExactly(mseed_object, min_reclen)
+        if len(header) < min_reclen:
+            if header:
+                msg = 'Incomplete record at the end of the data ignored.'
+                warnings.warn(msg, InternalMSEEDReadingWarning)
+            break
+        header_np = np.frombuffer(header, dtype=np.int8)
+
+        # Skip full SEED control headers.
+        if header_np[6] in SEED_CONTROL_HEADERS:
+            # The record length is stored in the first record of the volume.
+            if control_reclen is None:
+                try:
+                    control_reclen = pow(2, int(header[19:21]))
+                except ValueError:
+                    control_reclen = 4096
+            _readExactly(mseed_object, control_reclen - min_reclen)
+            continue
+        elif header_np[6] not in MINI_SEED_CONTROL_HEADERS:
+            msg = 'Not a valid (Mini-)SEED file'
+            raise Exception(msg)
+
+        if endian is None:
+            endian = _guessByteorder(header)
+        info = util._getFixedHeaders(header_np, min_reclen, endian)
+        record_length = info['record_length'][0]
+        if record_length == -1:
+            if reclen is None:
+                msg = ('Record without blockette 1000 found. Please specify '
+                       'the record length.')
+                raise ValueError(msg)
+            record_length = reclen
+        record = header + _readExactly(mseed_object,
+                                       record_length - min_reclen)
+        if len(record) < record_length:
+            msg = 'Incomplete record at the end of the data ignored.'
+            warnings.warn(msg, InternalMSEEDReadingWarning)
+            break
+        if not _getRecordSelection(info, starttime, endtime, sourcename)[0]:
+            continue
+
+        srcname = '%s_%s' % (info['seed_id'][0], info['dataquality'][0])
+        rec_start = info['starttime'][0]
+        samp_rate = info['samp_rate'][0]
+        if srcname in pending:
+            _, last_end, last_rate = pending[srcname]
+            # Flush the buffered records on gaps, overlaps and changing
+            # sampling rates.
+            if samp_rate != last_rate or \
+                    abs(rec_start - last_end - 1.0 / samp_rate) > \
+                    0.5 / samp_rate:
+                for trace in _flush(srcname):
+                    yield trace
+        if srcname not in pending:
+            pending[srcname] = [[], None, samp_rate]
+        pending[srcname][0].append(record)
+        pending[srcname][1] = info['endtime'][0]
+        if len(pending[srcname][0]) >= max_records:
+            for trace in _flush(srcname):
+                yield trace
+
+    while pending:
+        for trace in _flush(next(iter(pending))):
+            yield trace
+
+
+def _readExactly(file_object, size):
+    """
+    Reads exactly size bytes from a file-like object unless the end of the
+    data is reached. Needed for objects like sockets which can return less
+    bytes than requested.
+    """
+    chunks = []
+    while size > 0:
+        chunk = file_object.read(size)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def _guessByteorder(header):
+    """
+    Determines the byte order of a Mini-SEED record from its start time.
+
+    :type header: bytes
+    :param header: At least the first 24 bytes of the record.
+    """
+    year, julday = unpack(native_str('>HH'), header[20:24])
+    if 1900 <= year <= 2100 and 1 <= julday <= 366:
+        return '>'
+    return '<'
+
+
+def _getRecordSelection(records, starttime=None, endtime=None,
+                        sourcename=None):
+    """
+    Returns a boolean mask of the records possibly matching a selection.
+
+    The selection is deliberately generous, the exact selection is still done
+    by libmseed.
+
+    :param records: Dictionary or structured array with at least the fields
+        ``seed_id``, ``dataquality``, ``starttime`` and ``endtime`` as e.g.
+        returned by :func:`obspy.mseed.util.getRecordIndex`.
+    """
+    # Allow for rounding errors and slightly differing sampling rates.
+    margin = 1.0
+    mask = np.ones(len(records['starttime']), dtype=np.bool_)
+    if starttime is not None:
+        mask &= records['endtime'] >= starttime.timestamp - margin
+    if endtime is not None:
+        mask &= records['starttime'] <= endtime.timestamp + margin
+    if sourcename is not None:
+        # Mimic the source name matching of libmseed.
+        pattern = sourcename.replace('.', '_') + '_*'
+        srcnames = ['%s_%s' % (_i.replace('.', '_'), _j) for _i, _j in
+                    zip(records['seed_id'][mask],
+                        records['dataquality'][mask])]
+        matches = dict((_i, fnmatch.fnmatchcase(_i, pattern))
+                       for _i in set(srcnames))
+        mask[mask] = [matches[_i] for _i in srcnames]
+    return mask
+
+
+def _selectRecords(bfrNp, record_length, byteorder, starttime=None,
+                   endtime=None, sourcename=None):
+    """
+    Returns the part of a buffer of Mini-SEED records that is needed to
+    satisfy the given selection.
+
+    Records are only copied if the needed records are not stored
+    consecutively.
+
+    :type bfrNp: :class:`numpy.ndarray`
+    :param bfrNp: Buffer starting with the first data record.
+    :returns: Buffer containing the required records or ``None`` if no record
+        matches the selection. The unaltered buffer is returned if the file
+        does not consist of records of the same length.
+    """
+    if len(bfrNp) % record_length:
+        return bfrNp
+    headers = util._getFixedHeaders(bfrNp, record_length, byteorder)
+    if not np.in1d(headers['control_header'],
+                   MINI_SEED_CONTROL_HEADERS).all() or \
+            not np.in1d(headers['record_length'], [-1, record_length]).all():
+        return bfrNp
+
+    indices = np.nonzero(_getRecordSelection(headers, starttime, endtime,
+                                             sourcename))[0]
+    if not len(indices):
+        return None
+    first, last = indices[0], indices[-1]
+    if last - first + 1 == len(indices):
+        # Consecutive records - just pass a view on the buffer.
+        return bfrNp[first * record_length:(last + 1) * record_length]
+    records = bfrNp.reshape((-1, record_length))
+    return np.require(records[indices].ravel(), requirements=['C'])
+
+
+def _readIndexedRecords(filename, starttime=None, endtime=None,
+                        sourcename=None):
+    """
+    Reads only the records matching the selection with the help of the record
+    index of the file.
+
+    :returns: int8 buffer containing the required records or ``None`` if no
+        record matches the selection. The whole file is returned if it can
+        not be indexed.
+    """
+    try:
+        index = util.getRecordIndex(filename)
+    except ValueError:
+        return np.fromfile(filename, dtype=np.int8)
+    index = index[_getRecordSelection(index, starttime, endtime, sourcename)]
+    if not len(index):
+        return None
+    bfrNp = np.empty(index['record_length'].sum(), dtype=np.int8)
+    # Read consecutive records at once.
+    breaks = np.nonzero(index['offset'][1:] !=
+                        index['offset'][:-1] + index['record_length'][:-1])[0]
+    starts = np.concatenate([[0], breaks + 1])
+    ends = np.concatenate([breaks + 1, [len(index)]])
+    position = 0
+    with io.open(filename, 'rb') as fh:
+        for start, end in zip(starts, ends):
+            length = int(index['record_length'][start:end].sum())
+            fh.seek(int(index['offset'][start]), 0)
+            fh.readinto(bfrNp[position:position + length])
+            position += length
+    return bfrNp
+
+
 def writeMSEED(stream, filename, encoding=None, reclen=None, byteorder=None,
                sequence_number=None, flush=True, verbose=0, **_kwargs):
     """
@@ -8,7 +8,8 @@ from obspy import UTCDateTime, Stream, Trace, read
 from obspy.core import AttribDict
 from obspy.core.util import NamedTemporaryFile, CatchOutput
 from obspy.mseed import util
-from obspy.mseed.core import readMSEED, writeMSEED, isMSEED
+from obspy.mseed.core import readMSEED, writeMSEED, isMSEED, iterMSEED, \
+    _selectRecords
 from obspy.mseed.headers import clibmseed, ENCODINGS
 from obspy.mseed.msstruct import _MSStruct
 
@@ -354,6 +355,113 @@ class MSEEDReadingAndWritingTestCase(unittest.TestCase):
         st6 = readMSEED(testfile, sourcename='*.BLA')
         self.assertEqual(len(st6), 0)
 
+    def test_readPartialViaMemoryMap(self):
+        """
+        Reading with use_mmap=True must return the same data as a normal read
+        while only handing the matching records to libmseed.
+        """
+        np.random.seed(815)
+        t = UTCDateTime(2012, 1, 1)
+        st = Stream([Trace(data=np.random.randint(-1000, 1000, 20000).astype(
+            np.int32), header={'station': sta, 'channel': cha,
+                               'starttime': t, 'sampling_rate': 100.0})
+            for sta in ('A', 'B') for cha in ('EHE', 'EHZ')])
+        with NamedTemporaryFile() as tf:
+            tempfile = tf.name
+            st.write(tempfile, format='MSEED', reclen=512)
+            for kwargs in [dict(starttime=t + 50, endtime=t + 60),
+                           dict(starttime=t + 150),
+                           dict(endtime=t + 10),
+                           dict(sourcename='*.B.*.EHZ'),
+                           dict(sourcename='*Z', starttime=t + 20,
+                                endtime=t + 21),
+                           dict(starttime=t + 1000)]:
+                st1 = readMSEED(tempfile, **kwargs)
+                st2 = readMSEED(tempfile, use_mmap=True, **kwargs)
+                self.assertEqual(st1, st2)
+            # Check that only a few records are selected.
+            info = util.getRecordInformation(tempfile)
+            bfr = np.memmap(tempfile, dtype=np.int8, mode='r')
+            selected = _selectRecords(bfr, 512, info['byteorder'],
+                                      starttime=t + 50, endtime=t + 60)
+            self.assertTrue(0 < len(selected) < len(bfr) // 10)
+            self.assertEqual(len(selected) % 512, 0)
+            self.assertEqual(_selectRecords(bfr, 512, info['byteorder'],
+                                            sourcename='*.XYZ'), None)
+
+    def test_readPartialViaRecordIndex(self):
+        """
+        Reading with use_index=True must return the same data as a normal
+        read and store the index next to the file.
+        """
+        np.random.seed(815)
+        t = UTCDateTime(2012, 1, 1)
+        st = Stream([Trace(data=np.random.randint(-1000, 1000, 20000).astype(
+            np.int32), header={'station': sta, 'channel': cha,
+                               'starttime': t, 'sampling_rate': 100.0})
+            for sta in ('A', 'B') for cha in ('EHE', 'EHZ')])
+        with NamedTemporaryFile() as tf:
+            tempfile = tf.name
+            index_file = tempfile + '.index.npz'
+            st.write(tempfile, format='MSEED', reclen=512)
+            try:
+                for kwargs in [dict(starttime=t + 50, endtime=t + 60),
+                               dict(starttime=t + 150),
+                               dict(endtime=t + 10),
+                               dict(sourcename='*.B.*.EHZ'),
+                               dict(sourcename='*Z', starttime=t + 20,
+                                    endtime=t + 21),
+                               dict(starttime=t + 1000)]:
+                    st1 = readMSEED(tempfile, **kwargs)
+                    st2 = readMSEED(tempfile, use_index=True, **kwargs)
+                    self.assertEqual(st1, st2)
+                    self.assertTrue(os.path.exists(index_file))
+            finally:
+                if os.path.exists(index_file):
+                    os.remove(index_file)
+
+    def test_iterMSEED(self):
+        """
+        Iterating over a file must yield the same data as reading it at once.
+        """
+        class ChunkedReader(object):
+            """
+            Only returns a few bytes per call to read() like a socket.
+            """
+            def __init__(self, data):
+                self.bio = io.BytesIO(data)
+
+            def read(self, size=-1):
+                return self.bio.read(min(size, 100))
+
+        for filename in ('BW.BGLD.__.EHE.D.2008.001.first_10_records',
+                         'gaps.mseed', 'two_channels.mseed',
+                         'fullseed.mseed', 'timingquality.mseed'):
+            filename = os.path.join(self.path, 'data', filename)
+            st = readMSEED(filename)
+            for tr in st:
+                del tr.stats.mseed
+            st.merge(fill_value=0).sort()
+            with open(filename, 'rb') as fh:
+                data = fh.read()
+            for source in (filename, ChunkedReader(data)):
+                traces = list(iterMSEED(source, max_records=3))
+                self.assertTrue(all(isinstance(tr, Trace) for tr in traces))
+                st2 = Stream(traces)
+                for tr in st2:
+                    del tr.stats.mseed
+                self.assertEqual(st, st2.merge(fill_value=0).sort())
+
+        # Selections and further arguments are evaluated.
+        filename = os.path.join(self.path, 'data', 'two_channels.mseed')
+        traces = list(iterMSEED(filename, sourcename='*.EHZ', headonly=True))
+        self.assertEqual(len(traces), 1)
+        self.assertEqual(traces[0].stats.channel, 'EHZ')
+        self.assertEqual(len(traces[0].data), 0)
+        traces = list(iterMSEED(filename,
+                                starttime=UTCDateTime(2011, 1, 1)))
+        self.assertEqual(traces, [])
+
     def test_writeIntegers(self):
         """
         Write integer array via L{obspy.mseed.mseed.writeMSEED}.
@@ -111,6 +111,78 @@ class MSEEDUtilTestCase(unittest.TestCase):
         self.assertEqual(info['number_of_records'], 2)
         self.assertEqual(info['excess_bytes'], 0)
 
+    def test_getFixedHeaders(self):
+        """
+        The header information of all records should match the one determined
+        by getRecordInformation().
+        """
+        for filename, reclen in (
+                ('BW.BGLD.__.EHE.D.2008.001.first_10_records', 512),
+                ('timingquality.mseed', 512),
+                ('two_channels.mseed', 512)):
+            filename = os.path.join(self.path, 'data', filename)
+            bfr = np.fromfile(filename, dtype=np.int8)
+            headers = util._getFixedHeaders(bfr, reclen, '>')
+            self.assertEqual(len(headers['npts']), len(bfr) // reclen)
+            self.assertTrue((headers['record_length'] == reclen).all())
+            for i in range(len(headers['npts'])):
+                info = util.getRecordInformation(filename, offset=i * reclen)
+                self.assertAlmostEqual(headers['starttime'][i],
+                                       info['starttime'].timestamp, 5)
+                self.assertAlmostEqual(headers['endtime'][i],
+                                       info['endtime'].timestamp, 5)
+                self.assertEqual(headers['npts'][i], info['npts'])
+                self.assertEqual(headers['samp_rate'][i], info['samp_rate'])
+                self.assertEqual(headers['encoding'][i], info['encoding'])
+        self.assertEqual(headers['seed_id'].tolist(),
+                         ['BW.UH3..EHE', 'BW.UH3..EHZ'])
+        self.assertEqual(headers['dataquality'].tolist(), ['D', 'D'])
+
+    def test_getRecordIndex(self):
+        """
+        Tests building, storing and automatically rebuilding the record index.
+        """
+        filename = os.path.join(self.path, 'data',
+                                'BW.BGLD.__.EHE.D.2008.001.first_10_records')
+        with open(filename, 'rb') as fh:
+            data = fh.read()
+        with NamedTemporaryFile() as tf:
+            tempfile = tf.name
+            index_file = tempfile + '.index.npz'
+            try:
+                with open(tempfile, 'wb') as fh:
+                    fh.write(data)
+                index = util.getRecordIndex(tempfile)
+                self.assertTrue(os.path.exists(index_file))
+                self.assertEqual(index['offset'].tolist(),
+                                 list(range(0, 5120, 512)))
+                self.assertTrue((index['seed_id'] == 'BW.BGLD..EHE').all())
+                self.assertTrue((index['encoding'] == 10).all())
+                self.assertEqual(UTCDateTime(index['starttime'][0]),
+                                 UTCDateTime('2007-12-31T23:59:59.915000Z'))
+                self.assertEqual(UTCDateTime(index['endtime'][-1]),
+                                 UTCDateTime('2008-01-01T00:00:20.510000Z'))
+                # The stored index is reused.
+                with open(index_file, 'rb') as fh:
+                    stored = fh.read()
+                np.testing.assert_array_equal(util.getRecordIndex(tempfile),
+                                              index)
+                with open(index_file, 'rb') as fh:
+                    self.assertEqual(fh.read(), stored)
+                # Changing the file triggers a rebuild.
+                with open(tempfile, 'wb') as fh:
+                    fh.write(data[:1024])
+                index = util.getRecordIndex(tempfile)
+                self.assertEqual(len(index), 2)
+                # Files without a constant record length can not be indexed.
+                with open(tempfile, 'wb') as fh:
+                    fh.write(data[:1000])
+                self.assertRaises(ValueError, util.getRecordIndex, tempfile,
+                                  write=False)
+            finally:
+                if os.path.exists(index_file):
+                    os.remove(index_file)
+
     def test_getDataQuality(self):
         """
         This test reads a self-made Mini-SEED file with set Data Quality Bits.
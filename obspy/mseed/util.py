@@ -9,7 +9,8 @@ from future.utils import native_str
 
 from obspy.mseed.headers import HPTMODULUS, clibmseed, FRAME, SAMPLESIZES, \
     ENDIAN, ENCODINGS, UNSUPPORTED_ENCODINGS, FIXED_HEADER_ACTIVITY_FLAGS, \
-    FIXED_HEADER_DATA_QUAL_FLAGS, FIXED_HEADER_IO_CLOCK_FLAGS
+    FIXED_HEADER_DATA_QUAL_FLAGS, FIXED_HEADER_IO_CLOCK_FLAGS, \
+    VALID_CONTROL_HEADERS, SEED_CONTROL_HEADERS, MINI_SEED_CONTROL_HEADERS
 from obspy import UTCDateTime
 from obspy.core.util import scoreatpercentile
 from struct import pack, unpack
@@ -474,6 +475,280 @@ def _getRecordInformation(file_object, offset=0, endian=None):
     return info
 
 
+# Version of the on-disc record index format. Increase if the layout of the
+# index changes to force rebuilding all existing indices.
+RECORD_INDEX_VERSION = 1
+
+RECORD_INDEX_DTYPE = np.dtype([
+    (native_str('offset'), np.int64),
+    (native_str('record_length'), np.int32),
+    (native_str('starttime'), np.float64),
+    (native_str('endtime'), np.float64),
+    (native_str('npts'), np.int64),
+    (native_str('samp_rate'), np.float64),
+    (native_str('seed_id'), native_str('U17')),
+    (native_str('dataquality'), native_str('U1')),
+    (native_str('encoding'), np.int16)])
+
+
+def getRecordIndex(filename, index_filename=None, write=True):
+    """
+    Returns an index of all records of a Mini-SEED file.
+
+    The index is stored in a sidecar file next to the Mini-SEED file and is
+    reused by subsequent calls as long as size and modification time of the
+    Mini-SEED file do not change. Otherwise it is rebuilt automatically.
+
+    :type filename: str
+    :param filename: Name of the Mini-SEED file. Only files with a constant
+        record length are supported.
+    :type index_filename: str, optional
+    :param index_filename: Name of the index file. Defaults to the name of the
+        Mini-SEED file with ``.index.npz`` appended.
+    :type write: bool, optional
+    :param write: Store a newly built index on disc. Failing to write the
+        index, e.g. in a read-only directory, is silently ignored.
+    :rtype: :class:`numpy.ndarray`
+    :return: Structured array with one item per record with the fields
+        ``offset`` (byte offset in the file), ``record_length``,
+        ``starttime`` and ``endtime`` (as POSIX timestamps, the endtime is the
+        time of the last sample), ``npts``, ``samp_rate``, ``seed_id``,
+        ``dataquality`` and ``encoding``.
+
+    .. rubric:: Example
+
+    >>> from obspy.core.util import getExampleFile
+    >>> filename = getExampleFile("two_channels.mseed")
+    >>> index = getRecordIndex(filename, write=False)
+    >>> print(index['seed_id'])
+    ['BW.UH3..EHE' 'BW.UH3..EHZ']
+    >>> print(index['offset'])
+    [  0 512]
+    >>> print(UTCDateTime(index['starttime'][0]))
+    2010-06-20T00:00:00.279999Z
+    """
+    if index_filename is None:
+        index_filename = filename + '.index.npz'
+    stat = os.stat(filename)
+    if os.path.exists(index_filename):
+        try:
+            with np.load(index_filename) as data:
+                if int(data['version']) == RECORD_INDEX_VERSION and \
+                        int(data['size']) == stat.st_size and \
+                        float(data['mtime']) == stat.st_mtime:
+                    return data['index']
+        except Exception:
+            # Corrupt or incompatible index, just rebuild it.
+            pass
+    index = _buildRecordIndex(filename)
+    if write:
+        try:
+            with open(index_filename, 'wb') as fh:
+                np.savez(fh, index=index, version=RECORD_INDEX_VERSION,
+                         size=stat.st_size, mtime=stat.st_mtime)
+        except (IOError, OSError):
+            pass
+    return index
+
+
+def _buildRecordIndex(filename):
+    """
+    Scans all record headers of a Mini-SEED file and returns the record index.
+
+    See :func:`getRecordIndex` for the layout of the returned array.
+    """
+    info = getRecordInformation(filename)
+    record_length = info['record_length']
+    bfr = np.memmap(filename, dtype=np.int8, mode='r')
+    offset = _getDataRecordOffset(bfr)
+    if (len(bfr) - offset) % record_length:
+        msg = 'Only files with a constant record length can be indexed.'
+        raise ValueError(msg)
+    headers = _getFixedHeaders(bfr[offset:], record_length,
+                               info['byteorder'])
+    if not np.in1d(headers['control_header'],
+                   MINI_SEED_CONTROL_HEADERS).all() or \
+            not np.in1d(headers['record_length'], [-1, record_length]).all():
+        msg = 'Only files with a constant record length can be indexed.'
+        raise ValueError(msg)
+    del bfr
+
+    index = np.empty(len(headers['npts']), dtype=RECORD_INDEX_DTYPE)
+    index['offset'] = offset + np.arange(len(index)) * record_length
+    index['record_length'] = record_length
+    for key in ('starttime', 'endtime', 'npts', 'samp_rate', 'seed_id',
+                'dataquality', 'encoding'):
+        index[key] = headers[key]
+    return index
+
+
+def _getDataRecordOffset(bfrNp):
+    """
+    Returns the offset of the first data record in a buffer.
+
+    Full SEED volumes contain control headers before the first data record
+    which are skipped.
+
+    :type bfrNp: :class:`numpy.ndarray`
+    :param bfrNp: int8 NumPy array containing the (full) SEED file.
+    """
+    # Get the record length
+    try:
+        record_length = pow(2, int(''.join([chr(_i) for _i in bfrNp[19:21]])))
+    except ValueError:
+        record_length = 4096
+
+    offset = 0
+    # 0 to 9 are defined in a row in the ASCII charset.
+    min_ascii = ord('0')
+    # Small function to check whether an array of ASCII values contains only
+    # digits.
+    isdigit = lambda x: True if (x - min_ascii).max() <= 9 else False
+    while True:
+        # This should never happen
+        if (isdigit(bfrNp[offset:offset + 6]) is False) or \
+                (bfrNp[offset + 6] not in VALID_CONTROL_HEADERS):
+            msg = 'Not a valid (Mini-)SEED file'
+            raise Exception(msg)
+        elif bfrNp[offset + 6] in SEED_CONTROL_HEADERS:
+            offset += record_length
+            continue
+        break
+    return offset
+
+
+def _getFixedHeaders(buffer_, record_length, endian):
+    """
+    Parses the headers of all records in a buffer at once without decoding
+    any data.
+
+    The buffer is expected to consist solely of Mini-SEED records of the same
+    length, e.g. a (memory mapped) int8 or uint8 NumPy array. Besides the
+    fixed section of the data header, blockettes 100, 500, 1000 and 1001 are
+    evaluated to get the exact sampling rate, start time, encoding and record
+    length of every record.
+
+    :type buffer_: :class:`numpy.ndarray`
+    :param buffer_: Buffer containing an integer number of records.
+    :type record_length: int
+    :param record_length: Length of each record in bytes.
+    :type endian: str
+    :param endian: Byte order of the headers. Either "<" or ">".
+    :rtype: dict
+    :return: Dictionary of NumPy arrays with one item per record. Keys are
+        ``control_header``, ``seed_id``, ``dataquality``, ``starttime`` and
+        ``endtime`` (as POSIX timestamps, the endtime is the time of the last
+        sample), ``npts``, ``samp_rate``, ``encoding`` and ``record_length``.
+        Encoding and record length are ``-1`` for records without blockette
+        1000.
+    """
+    dtype = np.dtype({
+        'names': [native_str(_i) for _i in (
+            'quality', 'control_header', 'station', 'location', 'channel',
+            'network', 'year', 'julday', 'hour', 'minute', 'second', 'fract',
+            'npts', 'samp_rate_factor', 'samp_rate_mult', 'activity_flags',
+            'time_correction', 'blkt_offset')],
+        'formats': [native_str(_i % endian) if '%' in _i else native_str(_i)
+                    for _i in ('S1', 'u1', 'S5', 'S2', 'S3', 'S2', '%su2',
+                               '%su2', 'u1', 'u1', 'u1', '%su2', '%su2',
+                               '%si2', '%si2', 'u1', '%si4', '%su2')],
+        'offsets': [6, 6, 8, 13, 15, 18, 20, 22, 24, 25, 26, 28, 30, 32, 34,
+                    36, 40, 46],
+        'itemsize': record_length})
+    count = len(buffer_) // record_length
+    buffer_ = buffer_[:count * record_length]
+    headers = np.ndarray(shape=(count,), dtype=dtype, buffer=buffer_)
+    records = buffer_.view(np.uint8).reshape((count, record_length))
+
+    # Days since 1970-01-01 of the first day of the year.
+    days = (headers['year'].astype(np.int64) - 1970).astype('datetime64[Y]')
+    days = days.astype('datetime64[D]').astype(np.int64)
+    days += headers['julday'].astype(np.int64) - 1
+    starttime = days * 86400.0 + headers['hour'] * 3600.0 + \
+        headers['minute'] * 60.0 + headers['second'] + \
+        headers['fract'] * 1E-4
+    # Time corrections are in units of 0.0001 seconds and only have to be
+    # applied if bit 1 of the activity flags is not set.
+    not_applied = (headers['activity_flags'] & 2) == 0
+    starttime[not_applied] += headers['time_correction'][not_applied] * 1E-4
+
+    # Sampling rate according to the SEED manual.
+    factor = headers['samp_rate_factor'].astype(np.float64)
+    mult = headers['samp_rate_mult'].astype(np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        samp_rate = np.select(
+            [(factor > 0) & (mult > 0), (factor > 0) & (mult < 0),
+             (factor < 0) & (mult > 0), (factor < 0) & (mult < 0)],
+            [factor * mult, -factor / mult, -mult / factor,
+             -1.0 / (factor * mult)], default=1.0)
+
+    # Traverse the blockette chains of all records simultaneously.
+    encoding = np.empty(count, dtype=np.int16)
+    encoding.fill(-1)
+    reclen = np.empty(count, dtype=np.int32)
+    reclen.fill(-1)
+
+    def _read(rows, offsets, fmt):
+        size = np.dtype(fmt).itemsize
+        raw = records[rows[:, None], offsets[:, None] + np.arange(size)]
+        return raw.copy().view(native_str(endian + fmt)).ravel()
+
+    rows = np.arange(count)
+    offsets = headers['blkt_offset'].astype(np.int64)
+    # A record can not contain more blockettes than this.
+    for _ in range(record_length // 4):
+        valid = (offsets >= 48) & (offsets + 8 <= record_length)
+        rows, offsets = rows[valid], offsets[valid]
+        if not len(rows):
+            break
+        blkt_type = _read(rows, offsets, 'u2')
+        next_blkt = _read(rows, offsets + 2, 'u2').astype(np.int64)
+        idx = blkt_type == 1000
+        encoding[rows[idx]] = records[rows[idx], offsets[idx] + 4]
+        reclen[rows[idx]] = 2 ** records[rows[idx], offsets[idx] + 6].astype(
+            np.int64)
+        idx = blkt_type == 1001
+        starttime[rows[idx]] += \
+            records[rows[idx], offsets[idx] + 5].view(np.int8) * 1E-6
+        idx = (blkt_type == 500) & (offsets + 19 <= record_length)
+        starttime[rows[idx]] += \
+            records[rows[idx], offsets[idx] + 18].view(np.int8) * 1E-6
+        idx = blkt_type == 100
+        rate = _read(rows[idx], offsets[idx] + 4, 'f4')
+        samp_rate[rows[idx][rate != 0]] = rate[rate != 0]
+        # Only follow increasing offsets to avoid infinite loops.
+        next_blkt[next_blkt <= offsets] = 0
+        offsets = next_blkt
+
+    npts = headers['npts'].astype(np.int64)
+    endtime = starttime + np.maximum(npts - 1, 0) / samp_rate
+
+    seed_id = np.empty(count, dtype=object)
+    ids = np.empty(count, dtype=[(native_str('network'), 'S2'),
+                                 (native_str('station'), 'S5'),
+                                 (native_str('location'), 'S2'),
+                                 (native_str('channel'), 'S3')])
+    for key in ids.dtype.names:
+        ids[key] = headers[key]
+    unique_ids, inverse = np.unique(ids, return_inverse=True)
+    names = ['.'.join(_j.decode('ascii', 'replace').strip() for _j in _i)
+             for _i in unique_ids.tolist()]
+    seed_id[:] = [names[_i] for _i in inverse]
+    dataquality = np.array([_i.decode('ascii', 'replace')
+                            for _i in headers['quality'].tolist()],
+                           dtype=object)
+
+    return {'control_header': headers['control_header'],
+            'seed_id': seed_id,
+            'dataquality': dataquality,
+            'starttime': starttime,
+            'endtime': endtime,
+            'npts': npts,
+            'samp_rate': samp_rate,
+            'encoding': encoding,
+            'record_length': reclen}
+
+
 def _ctypesArray2NumpyArray(buffer_, buffer_elements, sampletype):
     """
     Takes a Ctypes array and its length and type and returns it as a
@@ -56,6 +56,7 @@ def offset(trace, offset=0.0, rtmemory_list=None):  # @UnusedVariable
         msg = "Trace parameter must be an obspy.core.trace.Trace object."
         raise ValueError(msg)
 
+    trace._ensureWritable()
     trace.data += offset
     return trace.data
 
@@ -81,6 +82,7 @@ def scale(trace, factor=1.0, rtmemory_list=None):  # @UnusedVariable
         raise ValueError(msg)
     # XXX not sure how this should be for realtime analysis, here
     # I assume, we do not want to change the underlying dtype
+    trace._ensureWritable()
     trace.data *= np.array(factor, dtype=trace.data.dtype)
     return trace.data
 
@@ -197,10 +197,11 @@ from obspy.signal.filter import bandpass, bandstop, lowpass, highpass, \
 from obspy.signal.rotate import rotate_NE_RT, rotate_RT_NE, rotate_ZNE_LQT, \
     rotate_LQT_ZNE
 from obspy.signal.invsim import cosTaper, cornFreq2Paz, pazToFreqResp, \
-    seisSim, specInv, estimateMagnitude
+    seisSim, specInv, estimateMagnitude, responseCacheInfo, clearResponseCache
 from obspy.signal.cpxtrace import normEnvelope, centroid, instFreq, instBwith
 from obspy.signal.util import utlGeoKm, utlLonLat
-from obspy.signal.cross_correlation import xcorr, xcorr_3C, xcorrPickCorrection
+from obspy.signal.cross_correlation import xcorr, xcorr_3C, \
+    xcorrPickCorrection, TemplateCorrelator, correlateTemplates
 from obspy.signal.freqattributes import cfrequency, bwith, domperiod, logcep
 from obspy.signal.hoctavbands import sonogram
 from obspy.signal.polarization import eigval
@@ -208,7 +209,8 @@ from obspy.signal.spectral_estimation import psd, PPSD
 from obspy.signal.konnoohmachismoothing import konnoOhmachiSmoothing
 from obspy.signal.trigger import recSTALTA, recSTALTAPy, carlSTATrig, \
     classicSTALTA, delayedSTALTA, zDetect, triggerOnset, pkBaer, arPick, \
-    coincidenceTrigger, classicSTALTAPy
+    coincidenceTrigger, classicSTALTAPy, triggerStream, ChunkedRecSTALTA, \
+    ChunkedClassicSTALTA, ChunkedCarlSTATrig, ChunkedTriggerOnset
 
 
 if __name__ == '__main__':
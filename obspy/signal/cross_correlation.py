@@ -28,6 +28,7 @@ import scipy
 from obspy import Trace, Stream
 from obspy.signal.headers import clibsignal
 from obspy.signal import cosTaper
+from obspy.signal.util import nextpow2
 
 
 def xcorr(tr1, tr2, shift_len, full_xcorr=False):
@@ -538,6 +539,256 @@ def templatesMaxSimilarity(st, time, streams_templates):
         return 0
 
 
+def _slidingSums(data, window):
+    """
+    Sums and sums of squares of ``window`` consecutive samples along the last
+    axis of ``data``.
+    """
+    shape = data.shape[:-1] + (1,)
+    csum = np.concatenate((np.zeros(shape), np.cumsum(data, axis=-1)),
+                          axis=-1)
+    csum2 = np.concatenate((np.zeros(shape), np.cumsum(data ** 2, axis=-1)),
+                           axis=-1)
+    return (csum[..., window:] - csum[..., :-window],
+            csum2[..., window:] - csum2[..., :-window])
+
+
+class TemplateCorrelator(object):
+    """
+    Normalized cross correlation of many templates with continuous data in
+    the frequency domain.
+
+    The templates are demeaned and normalized once and their spectra are
+    kept for every FFT length used, so correlating with further data only
+    needs the transforms of the data. Long data is processed in blocks of
+    ``nfft`` samples (overlap-save) and the normalization by the standard
+    deviation of the data under the template is computed with sliding sums.
+    The result is the correlation coefficient of every template with the
+    data at every lag, i.e. the same as :func:`numpy.corrcoef` of the
+    template and the data window starting at this lag. Windows with constant
+    data give a correlation coefficient of zero.
+
+    :type templates: :class:`~numpy.ndarray`
+    :param templates: Templates of equal length, an array of shape
+        ``(ntemplates, npts)`` correlating every template with every channel
+        of the data, or of shape ``(ntemplates, nchannels, npts)`` holding
+        one template per channel of the data (matched filter of
+        multi-component or network data).
+    :type nfft: int, optional
+    :param nfft: Length of the FFT blocks, defaults to the next power of two
+        of eight times the template length but at least 4096 samples. Data
+        shorter than a block uses a correspondingly shorter FFT.
+
+    :meth:`correlate` returns the correlation coefficients for the whole
+    data at once, which needs ``8 * ntemplates * nchannels * npts`` bytes
+    of memory. Continuous data too long for this is given to
+    :meth:`process` in consecutive chunks instead, which keeps the last
+    ``template_len - 1`` samples between the calls and returns the
+    correlation coefficients of every chunk.
+
+    .. rubric:: Example
+
+    >>> np.random.seed(42)
+    >>> data = np.random.randn(3, 10000)
+    >>> templates = data[:, 1000:1200] + np.random.randn(3, 200) * 0.1
+    >>> correlator = TemplateCorrelator(templates[np.newaxis])
+    >>> cc = correlator.correlate(data)
+    >>> cc.shape
+    (1, 3, 9801)
+    >>> network_cc = cc.mean(axis=1)
+    >>> int(network_cc[0].argmax())
+    1000
+    >>> correlator = TemplateCorrelator(templates[np.newaxis])
+    >>> chunks = [correlator.process(chunk)
+    ...           for chunk in np.split(data, [4000, 7000], axis=1)]
+    >>> [chunk.shape[-1] for chunk in chunks]
+    [3801, 3000, 3000]
+    >>> np.allclose(np.concatenate(chunks, axis=-1), cc)
+    True
+    """
+    def __init__(self, templates, nfft=None):
+        templates = np.array(templates, dtype=np.float64)
+        if templates.ndim == 2:
+            templates = templates[:, np.newaxis, :]
+        elif templates.ndim != 3:
+            msg = "templates must be a two- or three-dimensional array"
+            raise ValueError(msg)
+        self.template_len = templates.shape[-1]
+        templates -= templates.mean(axis=-1)[..., np.newaxis]
+        norm = np.sqrt((templates ** 2).sum(axis=-1))
+        # constant templates correlate with nothing
+        norm[norm == 0] = 1.0
+        self._templates = templates / norm[..., np.newaxis]
+        if nfft is None:
+            nfft = nextpow2(max(8 * self.template_len, 4096))
+        if nfft < self.template_len:
+            msg = "nfft must not be shorter than the templates"
+            raise ValueError(msg)
+        self.nfft = nfft
+        self._spectra = {}
+        # last template_len - 1 samples of the data given to process()
+        self._tail = None
+
+    @property
+    def shape(self):
+        """
+        Number of templates and number of channels per template.
+        """
+        return self._templates.shape[:2]
+
+    def _spectrum(self, nfft):
+        """
+        Returns the complex conjugate spectra of the templates for the given
+        FFT length.
+        """
+        try:
+            return self._spectra[nfft]
+        except KeyError:
+            spectrum = np.conj(np.fft.rfft(self._templates, nfft))
+            self._spectra[nfft] = spectrum
+            return spectrum
+
+    def correlate(self, data):
+        """
+        Correlates all templates with the data.
+
+        :type data: :class:`~numpy.ndarray`
+        :param data: Continuous data, one-dimensional or of shape
+            ``(nchannels, npts)``.
+        :rtype: :class:`~numpy.ndarray`
+        :return: Correlation coefficients of shape ``(ntemplates, nchannels,
+            npts - template_len + 1)``, for one-dimensional data of shape
+            ``(ntemplates, npts - template_len + 1)``. Index ``i`` of the last
+            axis corresponds to the template aligned with data sample ``i``.
+        """
+        data, one_channel = self._checkData(data)
+        if data.shape[-1] < self.template_len:
+            msg = "Data must not be shorter than the templates"
+            raise ValueError(msg)
+        cc = self._correlate(data)
+        if one_channel:
+            return cc[:, 0, :]
+        return cc
+
+    def process(self, data):
+        """
+        Correlates all templates with the next chunk of continuous data.
+
+        The last ``template_len - 1`` samples of the data are kept for the
+        next call. Correlating consecutive chunks gives the same correlation
+        coefficients (within rounding errors) as :meth:`correlate` for all
+        chunks put together, while the memory used only depends on the
+        length of a chunk.
+
+        :type data: :class:`~numpy.ndarray`
+        :param data: Next chunk of continuous data, one-dimensional or of
+            shape ``(nchannels, npts)``. All chunks must have the same
+            number of channels.
+        :rtype: :class:`~numpy.ndarray`
+        :return: Correlation coefficients for all lags at which the template
+            ends within this chunk, of shape ``(ntemplates, nchannels,
+            nlags)`` or ``(ntemplates, nlags)`` for one-dimensional data.
+            The first chunk gives ``template_len - 1`` lags less than its
+            number of samples.
+        """
+        data, one_channel = self._checkData(data)
+        if self._tail is not None:
+            if self._tail.shape[0] != data.shape[0]:
+                msg = "Number of channels differs from the previous chunks"
+                raise ValueError(msg)
+            data = np.concatenate((self._tail, data), axis=-1)
+        npts = data.shape[-1]
+        self._tail = data[:, max(npts - self.template_len + 1, 0):].copy()
+        if npts < self.template_len:
+            cc = np.empty(self.shape[:1] + (data.shape[0], 0))
+        else:
+            cc = self._correlate(data)
+        if one_channel:
+            return cc[:, 0, :]
+        return cc
+
+    def _checkData(self, data):
+        """
+        Returns a two-dimensional copy of the data and whether the data has
+        only one channel.
+        """
+        data = np.array(data, dtype=np.float64)
+        one_channel = data.ndim == 1
+        data = np.atleast_2d(data)
+        nchannels = self.shape[1]
+        if nchannels not in (1, data.shape[0]):
+            msg = "Number of channels of templates (%d) and data (%d) differ"
+            raise ValueError(msg % (nchannels, data.shape[0]))
+        return data, one_channel
+
+    def _correlate(self, data):
+        """
+        Returns the correlation coefficients of shape ``(ntemplates,
+        nchannels, npts - template_len + 1)`` for two-dimensional data,
+        which is changed in place.
+        """
+        ntemplates = self.shape[0]
+        npts = data.shape[-1]
+        length = self.template_len
+        nout = npts - length + 1
+        # the mean does not change the correlation, removing it helps the
+        # accuracy of the sliding sums
+        data -= data.mean(axis=-1)[:, np.newaxis]
+        nfft = min(self.nfft, nextpow2(npts))
+        spectrum = self._spectrum(nfft)
+        step = nfft - length + 1
+        cc = np.empty((ntemplates, data.shape[0], nout), dtype=np.float64)
+        for start in range(0, nout, step):
+            num = min(step, nout - start)
+            block = data[:, start:start + num + length - 1]
+            fct = np.fft.irfft(np.fft.rfft(block, nfft) * spectrum, nfft)
+            sum1, sum2 = _slidingSums(block, length)
+            var = sum2 - sum1 ** 2 / length
+            # constant data within the rounding errors of the sums
+            flat = var <= np.finfo(np.float64).eps * length * sum2
+            std = np.sqrt(np.where(flat, 1.0, var))
+            fct = fct[..., :num] / std
+            fct[..., flat] = 0.0
+            cc[..., start:start + num] = fct
+        return cc
+
+
+def correlateTemplates(templates, data, nfft=None):
+    """
+    Normalized cross correlation of many templates with continuous data.
+
+    Shortcut for ``TemplateCorrelator(templates, nfft).correlate(data)``, see
+    :class:`~obspy.signal.cross_correlation.TemplateCorrelator`. Create the
+    correlator once to reuse the template spectra for more data. The
+    correlation coefficients of all templates, channels and lags are
+    returned in one array, use
+    :meth:`~obspy.signal.cross_correlation.TemplateCorrelator.process` to
+    correlate long continuous data chunk by chunk.
+
+    :type templates: :class:`~numpy.ndarray`
+    :param templates: Templates of equal length, of shape ``(ntemplates,
+        npts)`` or ``(ntemplates, nchannels, npts)``.
+    :type data: :class:`~numpy.ndarray`
+    :param data: Continuous data, one-dimensional or of shape
+        ``(nchannels, npts)``.
+    :type nfft: int, optional
+    :param nfft: Length of the FFT blocks.
+    :rtype: :class:`~numpy.ndarray`
+    :return: Correlation coefficients of every template with the data at
+        every lag.
+
+    .. rubric:: Example
+
+    >>> data = np.random.randn(5000)
+    >>> cc = correlateTemplates([data[100:300], data[2000:2200]], data)
+    >>> cc.shape
+    (2, 4801)
+    >>> round(cc[0, 100], 7), round(cc[1, 2000], 7)
+    (1.0, 1.0)
+    """
+    return TemplateCorrelator(templates, nfft).correlate(data)
+
+
 if __name__ == '__main__':
     import doctest
     doctest.testmod(exclude_empty=True)
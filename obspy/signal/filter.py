@@ -21,11 +21,98 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
 
+import threading
 import warnings
+from future import standard_library
+with standard_library.hooks():
+    from collections import OrderedDict
+
 from numpy import array, where, fft
 from scipy.fftpack import hilbert
 from scipy.signal import iirfilter, lfilter, remez, convolve, get_window, \
     cheby2, cheb2ord
+try:
+    from scipy.signal import sosfilt, zpk2sos
+except ImportError:
+    # SciPy < 0.16, use transfer function representation
+    sosfilt = None
+
+
+# maximum number of cached Butterworth filter designs, 0 disables the cache
+FILTER_CACHE_SIZE = 256
+_FILTER_CACHE = OrderedDict()
+_FILTER_CACHE_LOCK = threading.Lock()
+
+
+def _getButterworthFilter(corners, freqs, btype):
+    """
+    Returns the (cached) design of a digital Butterworth filter.
+
+    The design is computed by :func:`scipy.signal.iirfilter` once for every
+    combination of filter type, corners and normalized frequencies. Second
+    order sections are used if supported by SciPy as they are numerically
+    more stable than the transfer function representation for higher
+    filter orders.
+
+    :param corners: Filter corners / order.
+    :param freqs: Normalized corner frequency or tuple of normalized corner
+        frequencies.
+    :param btype: Type of filter, see :func:`scipy.signal.iirfilter`.
+    :return: Array of second order sections or tuple ``(b, a)`` of numerator
+        and denominator polynomials if SciPy does not support second order
+        sections. The returned arrays are read-only.
+    """
+    key = (btype, corners, freqs)
+    with _FILTER_CACHE_LOCK:
+        design = _FILTER_CACHE.pop(key, None)
+        if design is not None:
+            _FILTER_CACHE[key] = design
+            return design
+    if sosfilt is not None:
+        z, p, k = iirfilter(corners, freqs, btype=btype, ftype='butter',
+                            output='zpk')
+        design = zpk2sos(z, p, k)
+        design.flags.writeable = False
+    else:
+        design = iirfilter(corners, freqs, btype=btype, ftype='butter',
+                           output='ba')
+        for coefficients in design:
+            coefficients.flags.writeable = False
+    with _FILTER_CACHE_LOCK:
+        if FILTER_CACHE_SIZE > 0:
+            design = _FILTER_CACHE.setdefault(key, design)
+        while len(_FILTER_CACHE) > max(FILTER_CACHE_SIZE, 0):
+            _FILTER_CACHE.popitem(last=False)
+    return design
+
+
+def _applyButterworthFilter(data, corners, freqs, btype, zerophase):
+    """
+    Applies a digital Butterworth filter along the last axis of the data.
+
+    See :func:`_getButterworthFilter` for the filter parameters.
+
+    :param zerophase: If True, apply filter once forwards and once backwards.
+    :return: Filtered data.
+    """
+    # the filter functions of newer SciPy versions do not accept the
+    # read-only cached arrays, work on writable copies
+    design = _getButterworthFilter(corners, freqs, btype)
+    if sosfilt is not None:
+        sos = design.copy()
+
+        def _filter(x):
+            return sosfilt(sos, x, axis=-1)
+    else:
+        b, a = design[0].copy(), design[1].copy()
+
+        def _filter(x):
+            return lfilter(b, a, x, axis=-1)
+    if zerophase:
+        firstpass = _filter(data)
+        return _filter(firstpass[..., ::-1])[..., ::-1]
+    else:
+        return _filter(data)
 
 
 def bandpass(data, freqmin, freqmax, df, corners=4, zerophase=False):
@@ -34,12 +121,15 @@ def bandpass(data, freqmin, freqmax, df, corners=4, zerophase=False):
 
     Filter data from ``freqmin`` to ``freqmax`` using ``corners``
     corners.
-    The filter uses :func:`scipy.signal.iirfilter` (for design)
-    and :func:`scipy.signal.lfilter` (for applying the filter).
+    The filter uses :func:`scipy.signal.iirfilter` (for design, cached
+    for repeated calls with the same parameters) and
+    :func:`scipy.signal.sosfilt` (for applying the filter as second order
+    sections, :func:`scipy.signal.lfilter` for SciPy < 0.16).
 
 
     :type data: numpy.ndarray
-    :param data: Data to filter.
+    :param data: Data to filter. Two-dimensional arrays are filtered along
+        the last axis, i.e. one row per signal.
     :param freqmin: Pass band low corner frequency.
     :param freqmax: Pass band high corner frequency.
     :param df: Sampling rate in Hz.
@@ -61,13 +151,8 @@ def bandpass(data, freqmin, freqmax, df, corners=4, zerophase=False):
     if low > 1:
         msg = "Selected low corner frequency is above Nyquist."
         raise ValueError(msg)
-    [b, a] = iirfilter(corners, [low, high], btype='band',
-                       ftype='butter', output='ba')
-    if zerophase:
-        firstpass = lfilter(b, a, data)
-        return lfilter(b, a, firstpass[::-1])[::-1]
-    else:
-        return lfilter(b, a, data)
+    return _applyButterworthFilter(data, corners, (low, high), 'band',
+                                   zerophase)
 
 
 def bandstop(data, freqmin, freqmax, df, corners=4, zerophase=False):
@@ -76,11 +161,14 @@ def bandstop(data, freqmin, freqmax, df, corners=4, zerophase=False):
 
     Filter data removing data between frequencies ``freqmin`` and ``freqmax``
     using ``corners`` corners.
-    The filter uses :func:`scipy.signal.iirfilter` (for design)
-    and :func:`scipy.signal.lfilter` (for applying the filter).
+    The filter uses :func:`scipy.signal.iirfilter` (for design, cached
+    for repeated calls with the same parameters) and
+    :func:`scipy.signal.sosfilt` (for applying the filter as second order
+    sections, :func:`scipy.signal.lfilter` for SciPy < 0.16).
 
     :type data: numpy.ndarray
-    :param data: Data to filter.
+    :param data: Data to filter. Two-dimensional arrays are filtered along
+        the last axis, i.e. one row per signal.
     :param freqmin: Stop band low corner frequency.
     :param freqmax: Stop band high corner frequency.
     :param df: Sampling rate in Hz.
@@ -102,13 +190,8 @@ def bandstop(data, freqmin, freqmax, df, corners=4, zerophase=False):
     if low > 1:
         msg = "Selected low corner frequency is above Nyquist."
         raise ValueError(msg)
-    [b, a] = iirfilter(corners, [low, high],
-                       btype='bandstop', ftype='butter', output='ba')
-    if zerophase:
-        firstpass = lfilter(b, a, data)
-        return lfilter(b, a, firstpass[::-1])[::-1]
-    else:
-        return lfilter(b, a, data)
+    return _applyButterworthFilter(data, corners, (low, high), 'bandstop',
+                                   zerophase)
 
 
 def lowpass(data, freq, df, corners=4, zerophase=False):
@@ -117,11 +200,14 @@ def lowpass(data, freq, df, corners=4, zerophase=False):
 
     Filter data removing data over certain frequency ``freq`` using ``corners``
     corners.
-    The filter uses :func:`scipy.signal.iirfilter` (for design)
-    and :func:`scipy.signal.lfilter` (for applying the filter).
+    The filter uses :func:`scipy.signal.iirfilter` (for design, cached
+    for repeated calls with the same parameters) and
+    :func:`scipy.signal.sosfilt` (for applying the filter as second order
+    sections, :func:`scipy.signal.lfilter` for SciPy < 0.16).
 
     :type data: numpy.ndarray
-    :param data: Data to filter.
+    :param data: Data to filter. Two-dimensional arrays are filtered along
+        the last axis, i.e. one row per signal.
     :param freq: Filter corner frequency.
     :param df: Sampling rate in Hz.
     :param corners: Filter corners / order.
@@ -138,13 +224,7 @@ def lowpass(data, freq, df, corners=4, zerophase=False):
         msg = "Selected corner frequency is above Nyquist. " + \
               "Setting Nyquist as high corner."
         warnings.warn(msg)
-    [b, a] = iirfilter(corners, f, btype='lowpass', ftype='butter',
-                       output='ba')
-    if zerophase:
-        firstpass = lfilter(b, a, data)
-        return lfilter(b, a, firstpass[::-1])[::-1]
-    else:
-        return lfilter(b, a, data)
+    return _applyButterworthFilter(data, corners, f, 'lowpass', zerophase)
 
 
 def highpass(data, freq, df, corners=4, zerophase=False):
@@ -153,11 +233,14 @@ def highpass(data, freq, df, corners=4, zerophase=False):
 
     Filter data removing data below certain frequency ``freq`` using
     ``corners`` corners.
-    The filter uses :func:`scipy.signal.iirfilter` (for design)
-    and :func:`scipy.signal.lfilter` (for applying the filter).
+    The filter uses :func:`scipy.signal.iirfilter` (for design, cached
+    for repeated calls with the same parameters) and
+    :func:`scipy.signal.sosfilt` (for applying the filter as second order
+    sections, :func:`scipy.signal.lfilter` for SciPy < 0.16).
 
     :type data: numpy.ndarray
-    :param data: Data to filter.
+    :param data: Data to filter. Two-dimensional arrays are filtered along
+        the last axis, i.e. one row per signal.
     :param freq: Filter corner frequency.
     :param df: Sampling rate in Hz.
     :param corners: Filter corners / order.
@@ -172,13 +255,7 @@ def highpass(data, freq, df, corners=4, zerophase=False):
     if f > 1:
         msg = "Selected corner frequency is above Nyquist."
         raise ValueError(msg)
-    [b, a] = iirfilter(corners, f, btype='highpass', ftype='butter',
-                       output='ba')
-    if zerophase:
-        firstpass = lfilter(b, a, data)
-        return lfilter(b, a, firstpass[::-1])[::-1]
-    else:
-        return lfilter(b, a, data)
+    return _applyButterworthFilter(data, corners, f, 'highpass', zerophase)
 
 
 def envelope(data):
@@ -324,7 +401,8 @@ def integerDecimation(data, decimation_factor):
     New sampling rate is old sampling rate divided by decimation_factor.
 
     :type data: numpy.ndarray
-    :param data: Data to filter.
+    :param data: Data to filter. Two-dimensional arrays are decimated along
+        the last axis, i.e. one row per signal.
     :param decimation_factor: Integer decimation factor
     :return: Downsampled data (array length: old length / decimation_factor)
     """
@@ -333,7 +411,7 @@ def integerDecimation(data, decimation_factor):
         raise TypeError(msg)
 
     # reshape and only use every decimation_factor-th sample
-    data = array(data[::decimation_factor])
+    data = array(data[..., ::decimation_factor])
     return data
 
 
@@ -351,7 +429,8 @@ def lowpassCheby2(data, freq, df, maxorder=12, ba=False,
     values above the stop band frequency are lower than -96dB.
 
     :type data: numpy.ndarray
-    :param data: Data to filter.
+    :param data: Data to filter. Two-dimensional arrays are filtered along
+        the last axis, i.e. one row per signal.
     :param freq: The frequency above which signals are attenuated
         with 95 dB
     :param df: Sampling rate in Hz.
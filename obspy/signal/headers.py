@@ -8,6 +8,7 @@ from future.builtins import *  # NOQA
 from future.utils import native_str
 
 import ctypes as C
+import threading
 import numpy as np
 from obspy.core.util.libnames import _load_CDLL
 
@@ -16,6 +17,9 @@ from obspy.core.util.libnames import _load_CDLL
 clibsignal = _load_CDLL("signal")
 # Import shared libevresp
 clibevresp = _load_CDLL("evresp")
+# evalresp keeps state in global variables, calls into the library must not
+# run concurrently in multiple threads
+clibevresp_lock = threading.Lock()
 
 clibsignal.calcSteer.argtypes = [
     C.c_int, C.c_int, C.c_int, C.c_int, C.c_int, C.c_float,
@@ -60,6 +64,24 @@ clibsignal.recstalta.argtypes = [
     C.c_int, C.c_int, C.c_int]
 clibsignal.recstalta.restype = C.c_void_p
 
+clibsignal.recstalta_2d.argtypes = [
+    np.ctypeslib.ndpointer(dtype=np.float64, ndim=2,
+                           flags=native_str('C_CONTIGUOUS')),
+    np.ctypeslib.ndpointer(dtype=np.float64, ndim=2,
+                           flags=native_str('C_CONTIGUOUS')),
+    C.c_int, C.c_int, C.c_int, C.c_int]
+clibsignal.recstalta_2d.restype = C.c_void_p
+
+clibsignal.recstalta_state.argtypes = [
+    np.ctypeslib.ndpointer(dtype=np.float64, ndim=1,
+                           flags=native_str('C_CONTIGUOUS')),
+    np.ctypeslib.ndpointer(dtype=np.float64, ndim=1,
+                           flags=native_str('C_CONTIGUOUS')),
+    C.c_int, C.c_int, C.c_int,
+    np.ctypeslib.ndpointer(dtype=np.float64, ndim=1,
+                           flags=native_str('C_CONTIGUOUS'))]
+clibsignal.recstalta_state.restype = C.c_void_p
+
 clibsignal.ppick.argtypes = [
     np.ctypeslib.ndpointer(dtype=np.float32, ndim=1,
                            flags=native_str('C_CONTIGUOUS')),
@@ -100,6 +122,28 @@ clibsignal.stalta.argtypes = [
 ]
 clibsignal.stalta.restype = C.c_int
 
+clibsignal.stalta_2d.argtypes = [
+    np.ctypeslib.ndpointer(dtype=head_stalta_t, ndim=1,
+                           flags=native_str('C_CONTIGUOUS')),
+    np.ctypeslib.ndpointer(dtype=np.float64, ndim=2,
+                           flags=native_str('C_CONTIGUOUS')),
+    np.ctypeslib.ndpointer(dtype=np.float64, ndim=2,
+                           flags=native_str('C_CONTIGUOUS')),
+    C.c_int]
+clibsignal.stalta_2d.restype = C.c_int
+
+clibsignal.stalta_state.argtypes = [
+    np.ctypeslib.ndpointer(dtype=head_stalta_t, ndim=1,
+                           flags=native_str('C_CONTIGUOUS')),
+    np.ctypeslib.ndpointer(dtype=np.float64, ndim=1,
+                           flags=native_str('C_CONTIGUOUS')),
+    np.ctypeslib.ndpointer(dtype=np.float64, ndim=1,
+                           flags=native_str('C_CONTIGUOUS')),
+    C.c_int,
+    np.ctypeslib.ndpointer(dtype=np.float64, ndim=1,
+                           flags=native_str('C_CONTIGUOUS'))]
+clibsignal.stalta_state.restype = C.c_int
+
 clibsignal.hermite_interpolation.argtypes = [
     np.ctypeslib.ndpointer(dtype=np.float64, ndim=1,
                            flags=native_str('C_CONTIGUOUS')),
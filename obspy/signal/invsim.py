@@ -23,16 +23,20 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
 from future.utils import native_str
+from future import standard_library
+with standard_library.hooks():
+    from collections import OrderedDict
 
 from obspy.core.util.base import NamedTemporaryFile
 from obspy.signal.detrend import simple as simpleDetrend
-from obspy.signal.headers import clibevresp
+from obspy.signal.headers import clibevresp, clibevresp_lock
 from obspy.signal.util import _npts2nfft
 import ctypes as C
 import math as M
 import numpy as np
 import os
 import scipy.signal
+import threading
 from obspy.signal import util
 import warnings
 
@@ -44,6 +48,89 @@ import warnings
 WOODANDERSON = {'poles': [-6.283 + 4.7124j, -6.283 - 4.7124j],
                 'zeros': [0 + 0j], 'gain': 1.0, 'sensitivity': 2080}
 
+# maximum memory in bytes used by cached instrument frequency responses, 0
+# disables the cache
+RESPONSE_CACHE_SIZE = 64 * 1024 ** 2
+_RESPONSE_CACHE = OrderedDict()
+_RESPONSE_CACHE_LOCK = threading.Lock()
+_RESPONSE_CACHE_INFO = {'hits': 0, 'misses': 0, 'nbytes': 0}
+
+
+def _getCachedResponse(key, func):
+    """
+    Returns the (cached) frequency response computed by ``func()``.
+
+    The arrays returned by ``func`` are kept for every key, the least
+    recently used responses are dropped if the cached arrays use more than
+    :const:`RESPONSE_CACHE_SIZE` bytes.
+
+    :param key: Hashable key identifying the response, e.g. the response
+        parameters, sampling interval, number of FFT points and output units.
+    :param func: Function computing the response, returns an array or a
+        tuple of arrays.
+    :return: Copy of the cached arrays, the caller may change them in place.
+    """
+    with _RESPONSE_CACHE_LOCK:
+        value = _RESPONSE_CACHE.pop(key, None)
+        if value is not None:
+            _RESPONSE_CACHE[key] = value
+            _RESPONSE_CACHE_INFO['hits'] += 1
+        else:
+            _RESPONSE_CACHE_INFO['misses'] += 1
+    if value is None:
+        value = func()
+        arrays = value if isinstance(value, tuple) else (value,)
+        nbytes = sum(array.nbytes for array in arrays)
+        with _RESPONSE_CACHE_LOCK:
+            if key not in _RESPONSE_CACHE and nbytes <= RESPONSE_CACHE_SIZE:
+                _RESPONSE_CACHE[key] = value
+                _RESPONSE_CACHE_INFO['nbytes'] += nbytes
+            while _RESPONSE_CACHE_INFO['nbytes'] > RESPONSE_CACHE_SIZE:
+                _, old = _RESPONSE_CACHE.popitem(last=False)
+                old = old if isinstance(old, tuple) else (old,)
+                _RESPONSE_CACHE_INFO['nbytes'] -= \
+                    sum(array.nbytes for array in old)
+    if isinstance(value, tuple):
+        return tuple(array.copy() for array in value)
+    return value.copy()
+
+
+def responseCacheInfo():
+    """
+    Returns statistics of the cache of instrument frequency responses used by
+    :func:`~obspy.signal.invsim.pazToFreqResp` and
+    :meth:`~obspy.station.response.Response.get_evalresp_response`.
+
+    :rtype: dict
+    :return: Number of ``hits`` and ``misses``, number of cached responses
+        (``size``) and the memory used by them in bytes (``nbytes``).
+
+    .. rubric:: Example
+
+    >>> clearResponseCache()
+    >>> h = pazToFreqResp(WOODANDERSON['poles'], WOODANDERSON['zeros'], 1.0,
+    ...                   0.01, 1024)
+    >>> h = pazToFreqResp(WOODANDERSON['poles'], WOODANDERSON['zeros'], 1.0,
+    ...                   0.01, 1024)
+    >>> info = responseCacheInfo()
+    >>> print(info['hits'], info['misses'], info['size'])
+    1 1 1
+    """
+    with _RESPONSE_CACHE_LOCK:
+        info = dict(_RESPONSE_CACHE_INFO)
+        info['size'] = len(_RESPONSE_CACHE)
+    return info
+
+
+def clearResponseCache():
+    """
+    Removes all cached instrument frequency responses and resets the
+    statistics returned by :func:`~obspy.signal.invsim.responseCacheInfo`.
+    """
+    with _RESPONSE_CACHE_LOCK:
+        _RESPONSE_CACHE.clear()
+        _RESPONSE_CACHE_INFO.update(hits=0, misses=0, nbytes=0)
+
 
 def cosTaper(npts, p=0.1, freqs=None, flimit=None, halfcosine=True,
              sactaper=False):
@@ -234,23 +321,25 @@ def evalresp(t_samp, nfft, filename, date, station='*', channel='*',
             date.formatSEED().encode('ascii', 'strict'))
         fn = C.create_string_buffer(tempfile.encode('ascii', 'strict'))
         nfreqs = C.c_int(freqs.shape[0])
-        res = clibevresp.evresp(sta, cha, net, locid, datime, unts, fn,
-                                freqs, nfreqs, rtyp, vbs, start_stage,
-                                stop_stage, stdio_flag, C.c_int(0))
-        # optimizing performance, see
-        # http://wiki.python.org/moin/PythonSpeed/PerformanceTips
-        try:
-            nfreqs, rfreqs, rvec = res[0].nfreqs, res[0].freqs, res[0].rvec
-        except ValueError:
-            msg = "evalresp failed to calculate a response."
-            raise ValueError(msg)
-        h = np.empty(nfreqs, dtype=np.complex128)
-        f = np.empty(nfreqs, dtype=np.float64)
-        for i in range(nfreqs):
-            h[i] = rvec[i].real + rvec[i].imag * 1j
-            f[i] = rfreqs[i]
-        clibevresp.free_response(res)
-        del nfreqs, rfreqs, rvec, res
+        with clibevresp_lock:
+            res = clibevresp.evresp(sta, cha, net, locid, datime, unts, fn,
+                                    freqs, nfreqs, rtyp, vbs, start_stage,
+                                    stop_stage, stdio_flag, C.c_int(0))
+            # optimizing performance, see
+            # http://wiki.python.org/moin/PythonSpeed/PerformanceTips
+            try:
+                nfreqs, rfreqs, rvec = \
+                    res[0].nfreqs, res[0].freqs, res[0].rvec
+            except ValueError:
+                msg = "evalresp failed to calculate a response."
+                raise ValueError(msg)
+            h = np.empty(nfreqs, dtype=np.complex128)
+            f = np.empty(nfreqs, dtype=np.float64)
+            for i in range(nfreqs):
+                h[i] = rvec[i].real + rvec[i].imag * 1j
+                f[i] = rfreqs[i]
+            clibevresp.free_response(res)
+            del nfreqs, rfreqs, rvec, res
     if freq:
         return h, f
     return h
@@ -288,6 +377,9 @@ def pazToFreqResp(poles, zeros, scale_fac, t_samp, nfft, freq=False):
     :rtype: :class:`numpy.ndarray` complex128
     :return: Frequency response of PAZ of length nfft
 
+    The responses are cached, see
+    :func:`~obspy.signal.invsim.responseCacheInfo`.
+
     .. note::
         In order to plot/calculate the phase you need to multiply the
         complex part by -1. This results from the different definition of
@@ -300,16 +392,25 @@ def pazToFreqResp(poles, zeros, scale_fac, t_samp, nfft, freq=False):
         negative values in order to get a plot from [0, 2pi]:
         where(phi<0,phi+2*pi,phi); plot(f,phi)
     """
-    n = nfft // 2
-    b, a = scipy.signal.ltisys.zpk2tf(zeros, poles, scale_fac)
-    # a has to be a list for the scipy.signal.freqs() call later but zpk2tf()
-    # strangely returns it as an integer.
-    if not isinstance(a, np.ndarray) and a == 1.0:
-        a = [1.0]
-    fy = 1 / (t_samp * 2.0)
-    # start at zero to get zero for offset / DC of fft
-    f = np.linspace(0, fy, n + 1)
-    _w, h = scipy.signal.freqs(b, a, f * 2 * np.pi)
+    def _calc():
+        n = nfft // 2
+        b, a = scipy.signal.ltisys.zpk2tf(zeros, poles, scale_fac)
+        # a has to be a list for the scipy.signal.freqs() call later but
+        # zpk2tf() strangely returns it as an integer.
+        if not isinstance(a, np.ndarray) and a == 1.0:
+            a = [1.0]
+        fy = 1 / (t_samp * 2.0)
+        # start at zero to get zero for offset / DC of fft
+        f = np.linspace(0, fy, n + 1)
+        _w, h = scipy.signal.freqs(b, a, f * 2 * np.pi)
+        return h, f
+
+    # the response only depends on these values, it is computed once for
+    # all traces with the same instrument, sampling rate and length
+    key = ('paz', tuple(complex(p) for p in poles),
+           tuple(complex(z) for z in zeros), float(scale_fac), float(t_samp),
+           int(nfft))
+    h, f = _getCachedResponse(key, _calc)
     if freq:
         return h, f
     return h
@@ -365,7 +466,9 @@ def seisSim(data, samp_rate, paz_remove=None, paz_simulate=None,
     Simulate/Correct seismometer.
 
     :type data: NumPy :class:`~numpy.ndarray`
-    :param data: Seismogram, detrend before hand (e.g. zero mean)
+    :param data: Seismogram, detrend before hand (e.g. zero mean).
+        Two-dimensional arrays are processed row by row, i.e. one row per
+        seismogram with the same instrument response.
     :type samp_rate: float
     :param samp_rate: Sample Rate of Seismogram
     :type paz_remove: dict, None
@@ -460,10 +563,10 @@ def seisSim(data, samp_rate, paz_remove=None, paz_simulate=None,
     # Translated from PITSA: spr_resg.c
     delta = 1.0 / samp_rate
     #
-    ndat = len(data)
+    ndat = data.shape[-1]
     data = data.astype(np.float64)
     if zero_mean:
-        data -= data.mean()
+        data -= data.mean(axis=-1)[..., np.newaxis]
     if taper:
         if sacsim:
             data *= cosTaper(ndat, taper_fraction,
@@ -519,9 +622,9 @@ def seisSim(data, samp_rate, paz_remove=None, paz_simulate=None,
         data *= pazToFreqResp(paz_simulate['poles'], paz_simulate['zeros'],
                               paz_simulate['gain'], delta, nfft)
 
-    data[-1] = abs(data[-1]) + 0.0j
+    data[..., -1] = abs(data[..., -1]) + 0.0j
     # transform data back into the time domain
-    data = np.fft.irfft(data)[0:ndat]
+    data = np.fft.irfft(data)[..., 0:ndat]
     if pitsasim:
         # linear detrend
         data = simpleDetrend(data)
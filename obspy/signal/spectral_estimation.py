@@ -27,10 +27,13 @@ import pickle
 import math
 import bisect
 import bz2
+import itertools
 import numpy as np
+from scipy import sparse
 from obspy import Trace, Stream
 from obspy.core.util import getMatplotlibVersion
 from obspy.signal import cosTaper
+from obspy.signal.invsim import seisSim
 from obspy.signal.util import prevpow2
 
 
@@ -225,6 +228,47 @@ def welch_window(N):
     return taper
 
 
+def _detrend_linear(data):
+    """
+    Removes the least squares line from the data along the last axis, i.e.
+    the same as :func:`matplotlib.mlab.detrend_linear` for every row.
+    """
+    x = np.arange(data.shape[-1], dtype=np.float64)
+    x -= x.mean()
+    mean = data.mean(axis=-1)[..., np.newaxis]
+    slope = (data * x).sum(axis=-1)[..., np.newaxis] / (x ** 2).sum()
+    return data - mean - slope * x
+
+
+def _batch_psd(data, NFFT, Fs, noverlap=0):
+    """
+    Computes the psd of every row of data in a single FFT call.
+
+    Gives the same result as :func:`psd` with ``detrend=mlab.detrend_linear``
+    and ``window=fft_taper`` for each row, i.e. Welch's method with
+    overlapping segments of length NFFT (NFFT has to be even).
+
+    :type data: :class:`~numpy.ndarray`
+    :param data: Two-dimensional array, one row per time series.
+    :returns: Array of shape ``(len(data), NFFT // 2 + 1)`` with the onesided
+        psd of each row.
+    """
+    data = np.ascontiguousarray(data, dtype=np.float64)
+    step = NFFT - noverlap
+    count = (data.shape[-1] - noverlap) // step
+    # all overlapping segments of all rows as view on the data
+    segments = np.lib.stride_tricks.as_strided(
+        data, shape=(data.shape[0], count, NFFT),
+        strides=(data.strides[0], step * data.strides[1], data.strides[1]))
+    window = fft_taper(np.ones(NFFT))
+    spec = np.fft.rfft(_detrend_linear(segments) * window, axis=-1)
+    spec = (spec.real ** 2 + spec.imag ** 2).mean(axis=1)
+    spec /= Fs * (window ** 2).sum()
+    # onesided, DC and Nyquist frequency appear only once
+    spec[:, 1:-1] *= 2.0
+    return spec
+
+
 class PPSD():
     """
     Class to compile probabilistic power spectral densities for one combination
@@ -551,6 +595,10 @@ class PPSD():
         # merge depending on skip_on_gaps set during __init__
         stream.merge(self.merge_method, fill_value=0)
 
+        # number of segments processed at once, limits the memory used for
+        # long segments
+        batch_size = max(1, 2 ** 21 // self.len)
+
         for tr in stream:
             # the following check should not be necessary due to the select()..
             if not self.__sanity_check(tr):
@@ -559,6 +607,7 @@ class PPSD():
                 continue
             t1 = tr.stats.starttime
             t2 = tr.stats.endtime
+            times = []
             while t1 + self.ppsd_length <= t2:
                 if self.__check_time_present(t1):
                     msg = "Already covered time spans detected (e.g. %s), " + \
@@ -566,97 +615,217 @@ class PPSD():
                     msg = msg % t1
                     warnings.warn(msg)
                 else:
-                    # throw warnings if trace length is different
-                    # than ppsd_length..!?!
-                    slice = tr.slice(t1, t1 + self.ppsd_length)
-                    # XXX not good, should be working in place somehow
-                    # XXX how to do it with the padding, though?
-                    success = self.__process(slice)
-                    if success:
-                        self.__insert_used_time(t1)
-                        if verbose:
-                            print(t1)
-                        changed = True
+                    times.append(t1)
                 t1 += (1 - self.overlap) * self.ppsd_length  # advance
 
-            # enforce time limits, pad zeros if gaps
-            # tr.trim(t, t+PPSD_LENGTH, pad=True)
+            for i in range(0, len(times), batch_size):
+                for t in self.__process(tr, times[i:i + batch_size]):
+                    self.__insert_used_time(t)
+                    if verbose:
+                        print(t)
+                    changed = True
         return changed
 
-    def __process(self, tr):
+    def merge(self, other):
+        """
+        Adds the histogram and time information of another PPSD of the same
+        station and with the same processing parameters.
+
+        This allows to compile a PPSD of long time spans in parallel, e.g. one
+        PPSD per day in separate processes (PPSD objects can be pickled),
+        merged into a single PPSD at the end.
+
+        :type other: :class:`~obspy.signal.spectral_estimation.PPSD`
+        :param other: PPSD to add, not changed by the merge.
+
+        .. rubric:: Example
+
+        >>> from multiprocessing import Pool  # doctest: +SKIP
+        >>> def daily_ppsd(filename):  # doctest: +SKIP
+        ...     st = read(filename)
+        ...     ppsd = PPSD(st[0].stats, paz)
+        ...     ppsd.add(st)
+        ...     return ppsd
+        >>> ppsds = Pool().map(daily_ppsd, filenames)  # doctest: +SKIP
+        >>> ppsd = ppsds[0]  # doctest: +SKIP
+        >>> for other in ppsds[1:]:  # doctest: +SKIP
+        ...     ppsd.merge(other)
+        """
+        self.__check_ppsd_length()
+        other.__check_ppsd_length()
+        for attr in ('id', 'sampling_rate', 'ppsd_length', 'overlap',
+                     'is_rotational_data', 'nfft', 'nlap'):
+            if getattr(self, attr) != getattr(other, attr):
+                msg = "Can not merge PPSDs with different %s." % attr
+                raise ValueError(msg)
+        if not np.array_equal(self.period_bins, other.period_bins) or \
+                not np.array_equal(self.spec_bins, other.spec_bins):
+            msg = "Can not merge PPSDs with different binning."
+            raise ValueError(msg)
+        # same check as when adding data
+        for t in other.times_used:
+            if self.__check_time_present(t):
+                msg = "Can not merge PPSDs covering the same time " + \
+                      "span (e.g. %s)." % t
+                raise ValueError(msg)
+        if other.hist_stack is not None:
+            if self.hist_stack is None:
+                self.hist_stack = other.hist_stack.copy()
+                self.xedges = other.xedges
+                self.yedges = other.yedges
+            else:
+                self.hist_stack += other.hist_stack
+        for t in other.times_used:
+            self.__insert_used_time(t)
+        self.times_data += other.times_data
+        self.times_gaps += other.times_gaps
+
+    def __get_paz(self, starttime):
+        """
+        Returns the instrument response for a segment starting at the given
+        time, preferably from the parser object. Returns ``None`` if no
+        response is available.
         """
-        Processes a segment of data and adds the information to the
-        PPSD histogram. If Trace is compatible (station, channel, ...) has to
-        checked beforehand.
-
-        :type tr: :class:`~obspy.core.trace.Trace`
-        :param tr: Compatible Trace with data of one PPSD segment
-        :returns: True if segment was successfully added to histogram, False
-                otherwise.
-        """
-        # XXX DIRTY HACK!!
-        if len(tr) == self.len + 1:
-            tr.data = tr.data[:-1]
-        # one last check..
-        if len(tr) != self.len:
-            msg = "Got a piece of data with wrong length. Skipping"
-            warnings.warn(msg)
-            print(len(tr), self.len)
-            return False
-        # being paranoid, only necessary if in-place operations would follow
-        tr.data = tr.data.astype(np.float64)
-        # if trace has a masked array we fill in zeros
-        try:
-            tr.data[tr.data.mask] = 0.0
-        # if it is no masked array, we get an AttributeError
-        # and have nothing to do
-        except AttributeError:
-            pass
-
-        # get instrument response preferably from parser object
         try:
-            paz = self.parser.getPAZ(self.id, datetime=tr.stats.starttime)
+            return self.parser.getPAZ(self.id, datetime=starttime)
         except Exception as e:
             if self.parser is not None:
                 msg = "Error getting response from parser:\n%s: %s\n" \
                       "Skipping time segment(s)."
                 msg = msg % (e.__class__.__name__, e.message)
                 warnings.warn(msg)
-                return False
-            paz = self.paz
-        if paz is None:
-            msg = "Missing poles and zeros information for response " \
-                  "removal. Skipping time segment(s)."
-            warnings.warn(msg)
-            return False
+                return None
+            return self.paz
+
+    def __get_octave_matrix(self):
+        """
+        Returns the sparse matrix averaging the psd values (ordered by
+        period) in every octave period bin.
+
+        The matrix is set up once and not pickled.
+        """
+        try:
+            return self.__octave_matrix
+        except AttributeError:
+            pass
+        rows, columns, weights = [], [], []
+        for i, (per_left, per_right) in enumerate(zip(
+                self.per_octaves_left, self.per_octaves_right)):
+            index = np.where((per_left <= self.per) &
+                             (self.per <= per_right))[0]
+            rows.append(np.repeat(i, len(index)))
+            columns.append(index)
+            weights.append(np.repeat(1.0 / max(len(index), 1), len(index)))
+        self.__octave_matrix = sparse.csr_matrix(
+            (np.concatenate(weights),
+             (np.concatenate(rows), np.concatenate(columns))),
+            shape=(len(self.per_octaves), len(self.per)))
+        # bins without psd values, their mean is undefined
+        self.__octave_empty = np.array([len(c) == 0 for c in columns])
+        return self.__octave_matrix
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_PPSD__octave_matrix', None)
+        state.pop('_PPSD__octave_empty', None)
+        return state
+
+    def __process(self, tr, times):
+        """
+        Processes segments of data and adds the information to the
+        PPSD histogram. If Trace is compatible (station, channel, ...) has to
+        checked beforehand.
+
+        All segments are processed at once: the instrument correction, the
+        psd of all segments and the averaging over the octave period bins are
+        done on two-dimensional arrays with one row per segment.
+
+        :type tr: :class:`~obspy.core.trace.Trace`
+        :param tr: Compatible Trace with data of all segments
+        :type times: list of :class:`~obspy.core.utcdatetime.UTCDateTime`
+        :param times: Start times of the segments of length ``ppsd_length``
+        :returns: List of start times of the segments successfully added to
+                the histogram.
+        """
+        segments = []
+        for t in times:
+            # throw warnings if trace length is different
+            # than ppsd_length..!?!
+            data = tr.slice(t, t + self.ppsd_length).data
+            # XXX DIRTY HACK!!
+            if len(data) == self.len + 1:
+                data = data[:-1]
+            # one last check..
+            if len(data) != self.len:
+                msg = "Got a piece of data with wrong length. Skipping"
+                warnings.warn(msg)
+                print(len(data), self.len)
+                continue
+            data = data.astype(np.float64)
+            # if trace has a masked array we fill in zeros
+            if isinstance(data, np.ma.masked_array):
+                data = data.filled(0.0)
+            segments.append((t, data))
+        if not segments:
+            return []
+
+        # get instrument response preferably from parser object, consecutive
+        # segments with the same response are processed together
+        pazs = [self.__get_paz(t) for t, _ in segments]
+
+        used = []
+        for paz, group in itertools.groupby(zip(pazs, segments),
+                                            key=lambda x: x[0]):
+            group = [segment for _, segment in group]
+            if paz is None:
+                msg = "Missing poles and zeros information for response " \
+                      "removal. Skipping time segment(s)."
+                warnings.warn(msg)
+                continue
+            self.__process_segments(np.array([data for _, data in group]),
+                                    paz)
+            used.extend(t for t, _ in group)
+        return used
+
+    def __process_segments(self, data, paz):
+        """
+        Adds segments of data with the same instrument response to the
+        histogram.
+
+        :type data: :class:`~numpy.ndarray`
+        :param data: Two-dimensional array with one segment per row.
+        :type paz: dict
+        :param paz: Response information of instrument.
+        """
         # restitution:
         # mcnamara apply the correction at the end in freq-domain,
         # does it make a difference?
         # probably should be done earlier on bigger chunk of data?!
         if self.is_rotational_data:
             # in case of rotational data just remove sensitivity
-            tr.data /= paz['sensitivity']
+            data /= paz['sensitivity']
         else:
-            tr.simulate(paz_remove=paz, remove_sensitivity=True,
-                        paz_simulate=None, simulate_sensitivity=False)
+            data = seisSim(data, self.sampling_rate, paz_remove=paz,
+                           paz_simulate=None, remove_sensitivity=True,
+                           simulate_sensitivity=False)
 
         # go to acceleration, do nothing for rotational data:
         if self.is_rotational_data:
             pass
         else:
-            tr.data = np.gradient(tr.data, self.delta)
-
-        # use our own wrapper for mlab.psd to have consistent results on all
-        # matplotlib versions
-        spec, _freq = psd(tr.data, self.nfft, self.sampling_rate,
-                          detrend=mlab.detrend_linear, window=fft_taper,
+            try:
+                data = np.gradient(data, self.delta, axis=-1)
+            except TypeError:
+                # NumPy < 1.11 has no axis keyword and computes the gradient
+                # along all axes
+                data = np.gradient(data, 1.0, self.delta)[-1]
+
+        spec = _batch_psd(data, self.nfft, self.sampling_rate,
                           noverlap=self.nlap)
 
-        # leave out first entry (offset)
-        spec = spec[1:]
-
+        # leave out first entry (offset) and
         # working with the periods not frequencies later so reverse spectrum
-        spec = spec[::-1]
+        spec = spec[:, :0:-1]
 
         # avoid calculating log of zero
         idx = spec < dtiny
@@ -666,18 +835,13 @@ class PPSD():
         spec = np.log10(spec)
         spec *= 10
 
-        spec_octaves = []
-        # do this for the whole period range and append the values to our lists
-        for per_left, per_right in zip(self.per_octaves_left,
-                                       self.per_octaves_right):
-            specs = spec[(per_left <= self.per) & (self.per <= per_right)]
-            spec_center = specs.mean()
-            spec_octaves.append(spec_center)
-        spec_octaves = np.array(spec_octaves)
+        # mean of the psd values in every octave period bin
+        spec_octaves = self.__get_octave_matrix().dot(spec.T).T
+        spec_octaves[:, self.__octave_empty] = np.nan
 
         hist, self.xedges, self.yedges = np.histogram2d(
-            self.per_octaves,
-            spec_octaves, bins=(self.period_bins, self.spec_bins))
+            np.tile(self.per_octaves, len(spec_octaves)),
+            spec_octaves.ravel(), bins=(self.period_bins, self.spec_bins))
 
         try:
             # we have to make sure manually that the bins are always the same!
@@ -686,7 +850,6 @@ class PPSD():
         except TypeError:
             # only during first run initialize stack with first histogram
             self.hist_stack = hist
-        return True
 
     def get_percentile(self, percentile=50, hist_cum=None):
         """
@@ -25,3 +25,41 @@ void recstalta(double *a, double *charfct, int ndat, int nsta, int nlta) {
 
     return;
 }
+
+
+/* Recursive STA/LTA of nrows signals of ndat samples each, stored row by
+ * row in a. */
+void recstalta_2d(double *a, double *charfct, int nrows, int ndat, int nsta,
+                  int nlta) {
+    int i;
+
+    for (i=0;i<nrows;i++) {
+        recstalta(a + (size_t)i * ndat, charfct + (size_t)i * ndat, ndat,
+                  nsta, nlta);
+    }
+
+    return;
+}
+
+
+/* Recursive STA/LTA of a chunk of a longer signal. state holds the STA and
+ * LTA after the previous chunk and is updated. charfct is not muted at the
+ * start of the signal. */
+void recstalta_state(double *a, double *charfct, int ndat, int nsta,
+                     int nlta, double *state) {
+    int i;
+    double csta = 1./((double)nsta);
+    double clta = 1./((double)nlta);
+    double sta = state[0];
+    double lta = state[1];
+
+    for (i=0;i<ndat;i++) {
+        sta = csta * pow(a[i],2) + (1-csta)*sta;
+        lta = clta * pow(a[i],2) + (1-clta)*lta;
+        charfct[i] = sta/lta;
+    }
+    state[0] = sta;
+    state[1] = lta;
+
+    return;
+}
@@ -6,6 +6,7 @@
 #---------------------------------------------------------------------*/
 
 #include <math.h>
+#include <stddef.h>
 
 #define OPTIMIZED_VERSION
 
@@ -72,3 +73,78 @@ int stalta(const headS *head, const double *data, double *charfct)
 
     return 0;
 }
+
+
+/* Classic STA/LTA of nrows signals of head->N samples each, stored row by
+ * row in data. */
+int stalta_2d(const headS *head, const double *data, double *charfct,
+              int nrows)
+{
+    int i;
+    int errcode;
+
+    for (i = 0; i < nrows; ++i) {
+        errcode = stalta(head, data + (size_t)i * head->N,
+                         charfct + (size_t)i * head->N);
+        if (errcode != 0) {
+            return errcode;
+        }
+    }
+
+    return 0;
+}
+
+
+/* Classic STA/LTA of a chunk of head->N samples of a longer signal. data
+ * holds nhist samples preceding the chunk (at least min(Nlta, number of
+ * samples processed so far)) followed by the chunk. state holds STA, LTA
+ * and the number of samples processed so far (counted up to Nlta) and is
+ * updated. The result is the same as for the whole signal. */
+int stalta_state(const headS *head, const double *data, double *charfct,
+                 int nhist, double *state)
+{
+    int j;
+    double sta = state[0];
+    double lta = state[1];
+    int pos = (int) state[2];
+    double buf;
+    const double frac = (double) head->Nlta / (double) head->Nsta;
+    const double *x = data + nhist;
+
+    if (head->Nsta >= head->Nlta) {
+        return 1;
+    }
+
+    for (j = 0; j < head->N; ++j) {
+        if (pos < head->Nsta) {
+            sta += pow(x[j], 2);
+            charfct[j] = 0.;
+        }
+        else if (pos < head->Nlta) {
+            if (pos == head->Nsta) {
+                lta = sta;
+            }
+            buf = pow(x[j], 2);
+            lta += buf;
+            sta += buf - pow(x[j - head->Nsta], 2);
+            charfct[j] = 0.;
+            if (pos == head->Nlta - 1) {
+                charfct[j] = sta / lta * frac;
+            }
+        }
+        else {
+            buf = pow(x[j], 2);
+            sta += buf - pow(x[j - head->Nsta], 2);
+            lta += buf - pow(x[j - head->Nlta], 2);
+            charfct[j] = sta / lta * frac;
+        }
+        if (pos < head->Nlta) {
+            ++pos;
+        }
+    }
+    state[0] = sta;
+    state[1] = lta;
+    state[2] = (double) pos;
+
+    return 0;
+}
@@ -6,10 +6,12 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
 
+import numpy as np
 import os
 import unittest
 from obspy import read, UTCDateTime
-from obspy.signal.cross_correlation import xcorrPickCorrection
+from obspy.signal.cross_correlation import xcorrPickCorrection, \
+    TemplateCorrelator, correlateTemplates
 
 
 class CrossCorrelationTestCase(unittest.TestCase):
@@ -51,6 +53,75 @@ class CrossCorrelationTestCase(unittest.TestCase):
         self.assertEqual(tr1, tr1_copy)
         self.assertEqual(tr2, tr2_copy)
 
+    def test_templateCorrelator(self):
+        """
+        Frequency domain correlation of several templates with multi-channel
+        data gives the correlation coefficients at every lag, also when the
+        data is processed in several blocks.
+        """
+        np.random.seed(815)
+        data = np.random.randn(3, 2000) * 100 + 1e4
+        data[1, 500:900] = 7.0
+        templates = np.random.randn(4, 3, 150)
+        templates[0] = data[:, 1000:1150]
+
+        def corrcoef(template, data):
+            cc = np.zeros(len(data) - len(template) + 1)
+            for i in range(len(cc)):
+                window = data[i:i + len(template)]
+                if window.std() > 0:
+                    cc[i] = np.corrcoef(template, window)[0, 1]
+            return cc
+
+        correlator = TemplateCorrelator(templates)
+        self.assertEqual(correlator.shape, (4, 3))
+        cc = correlator.correlate(data)
+        self.assertEqual(cc.shape, (4, 3, 1851))
+        for i in range(4):
+            for j in range(3):
+                np.testing.assert_allclose(
+                    cc[i, j], corrcoef(templates[i, j], data[j]), atol=1e-6)
+        self.assertAlmostEqual(cc[0].mean(axis=0).max(), 1.0)
+        self.assertEqual(cc[0].mean(axis=0).argmax(), 1000)
+        # processing in several blocks
+        np.testing.assert_allclose(
+            TemplateCorrelator(templates, nfft=256).correlate(data), cc,
+            atol=1e-6)
+        # every template with every channel
+        cc = correlateTemplates(templates[:, 0], data, nfft=512)
+        self.assertEqual(cc.shape, (4, 3, 1851))
+        np.testing.assert_allclose(cc[2, 1], corrcoef(templates[2, 0],
+                                                      data[1]), atol=1e-6)
+        cc = correlateTemplates(templates[:, 0], data[0])
+        self.assertEqual(cc.shape, (4, 1851))
+        self.assertRaises(ValueError, correlator.correlate, data[:2])
+        self.assertRaises(ValueError, correlator.correlate, data[:, :100])
+
+    def test_templateCorrelatorChunks(self):
+        """
+        Correlating continuous data chunk by chunk gives the same result as
+        correlating all data at once.
+        """
+        np.random.seed(815)
+        data = np.random.randn(3, 3000) + 1e3
+        templates = np.random.randn(2, 3, 150)
+        templates[1] = data[:, 2000:2150]
+        expected = TemplateCorrelator(templates).correlate(data)
+        correlator = TemplateCorrelator(templates, nfft=256)
+        chunks = np.split(data, [100, 101, 1000, 1100, 2990], axis=1)
+        cc = [correlator.process(chunk) for chunk in chunks]
+        self.assertEqual([c.shape[-1] for c in cc],
+                         [0, 0, 851, 100, 1890, 10])
+        np.testing.assert_allclose(np.concatenate(cc, axis=-1), expected,
+                                   atol=1e-6)
+        self.assertRaises(ValueError, correlator.process, data[:2])
+        # one-dimensional data
+        correlator = TemplateCorrelator(templates[:, 0])
+        cc = [correlator.process(chunk) for chunk in np.split(data[0], 3)]
+        np.testing.assert_allclose(
+            np.concatenate(cc, axis=-1),
+            correlateTemplates(templates[:, 0], data[0]), atol=1e-6)
+
 
 def suite():
     return unittest.makeSuite(CrossCorrelationTestCase, 'test')
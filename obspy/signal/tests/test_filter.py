@@ -8,7 +8,10 @@ from __future__ import (absolute_import, division, print_function,
 from future.builtins import *  # NOQA
 
 from obspy.signal import bandpass, lowpass, highpass
-from obspy.signal.filter import envelope, lowpassCheby2
+from obspy.signal.filter import envelope, lowpassCheby2, \
+    _getButterworthFilter, sosfilt
+from obspy.core.util.decorator import skipIf
+from obspy.signal import filter as signal_filter
 import os
 import unittest
 import gzip
@@ -251,6 +254,83 @@ class FilterTestCase(unittest.TestCase):
         # be 0 (1dB ripple) before filter ramp
         self.assertTrue(h_db[freq < 25].min() > -1)
 
+    def test_filterDesignCache(self):
+        """
+        Filter designs are computed once per parameter set and stay valid.
+        """
+        signal_filter._FILTER_CACHE.clear()
+        design = _getButterworthFilter(4, (0.1, 0.2), 'band')
+        self.assertTrue(_getButterworthFilter(4, (0.1, 0.2), 'band') is
+                        design)
+        self.assertFalse(_getButterworthFilter(6, (0.1, 0.2), 'band') is
+                         design)
+        self.assertEqual(len(signal_filter._FILTER_CACHE), 2)
+        # cached arrays can not be modified by accident
+        arrays = [design] if sosfilt is not None else design
+        for array in arrays:
+            self.assertRaises(ValueError, array.__setitem__, 0, 0)
+        # least recently used designs are removed first
+        size = signal_filter.FILTER_CACHE_SIZE
+        try:
+            signal_filter.FILTER_CACHE_SIZE = 2
+            _getButterworthFilter(4, (0.1, 0.2), 'band')
+            _getButterworthFilter(4, 0.1, 'lowpass')
+            self.assertEqual(list(signal_filter._FILTER_CACHE.keys()),
+                             [('band', 4, (0.1, 0.2)), ('lowpass', 4, 0.1)])
+            # a size of 0 disables the cache
+            signal_filter.FILTER_CACHE_SIZE = 0
+            filtered = lowpass(np.arange(100.0), 1.0, df=10.0)
+            np.testing.assert_array_equal(
+                lowpass(np.arange(100.0), 1.0, df=10.0), filtered)
+            self.assertEqual(len(signal_filter._FILTER_CACHE), 0)
+        finally:
+            signal_filter.FILTER_CACHE_SIZE = size
+            signal_filter._FILTER_CACHE.clear()
+
+    def test_filterRepeatedCall(self):
+        """
+        Repeated filtering with the same parameters uses the cached design
+        and gives the same result.
+        """
+        signal_filter._FILTER_CACHE.clear()
+        np.random.seed(815)
+        data = np.random.randn(500)
+        first = bandpass(data, 1.0, 5.0, df=20.0)
+        second = bandpass(data, 1.0, 5.0, df=20.0)
+        self.assertEqual(len(signal_filter._FILTER_CACHE), 1)
+        np.testing.assert_array_equal(first, second)
+        np.testing.assert_array_equal(
+            bandpass(data, 1.0, 5.0, df=20.0, zerophase=True),
+            bandpass(data, 1.0, 5.0, df=20.0, zerophase=True))
+
+    def test_filterTwoDimensional(self):
+        """
+        Each row of a two-dimensional array is filtered on its own.
+        """
+        np.random.seed(815)
+        data = np.random.randn(3, 500)
+        for func, args in ((bandpass, (1.0, 5.0)), (lowpass, (5.0,)),
+                           (highpass, (1.0,))):
+            for zerophase in (False, True):
+                filtered = func(data, *args, df=20.0, zerophase=zerophase)
+                self.assertEqual(filtered.shape, data.shape)
+                for row, row_filtered in zip(data, filtered):
+                    np.testing.assert_array_equal(
+                        func(row, *args, df=20.0, zerophase=zerophase),
+                        row_filtered)
+
+    @skipIf(sosfilt is None, 'SciPy is too old')
+    def test_bandpassHighOrderNarrowBand(self):
+        """
+        High order narrow band filters at low frequencies are stable when
+        applied as second order sections.
+        """
+        np.random.seed(815)
+        data = np.random.randn(5000)
+        filtered = bandpass(data, 0.05, 0.2, df=100.0, corners=12)
+        self.assertTrue(np.all(np.isfinite(filtered)))
+        self.assertTrue(np.abs(filtered).max() < np.abs(data).max())
+
 
 def suite():
     return unittest.makeSuite(FilterTestCase, 'test')
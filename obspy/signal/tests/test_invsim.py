@@ -12,8 +12,10 @@ from obspy import Trace, UTCDateTime, read
 from obspy.core.util.base import NamedTemporaryFile
 from obspy.core.util.misc import CatchOutput
 from obspy.sac import attach_paz
+from obspy.signal import invsim
 from obspy.signal.invsim import seisSim, estimateMagnitude, evalresp
-from obspy.signal.invsim import cosTaper
+from obspy.signal.invsim import cosTaper, pazToFreqResp, responseCacheInfo, \
+    clearResponseCache
 from obspy.signal.headers import clibevresp
 
 import io
@@ -483,6 +485,39 @@ class InvSimTestCase(unittest.TestCase):
                   0.98398301, 0.96128491]
         self.assertTrue(np.allclose(yi, yi_ref, rtol=1e-7, atol=0))
 
+    def test_responseCache(self):
+        """
+        Frequency responses are computed once and evicted when the cache
+        exceeds its size.
+        """
+        clearResponseCache()
+        args = (PAZ_WOOD_ANDERSON['poles'], PAZ_WOOD_ANDERSON['zeros'],
+                PAZ_WOOD_ANDERSON['gain'], 0.01)
+        h, f = pazToFreqResp(*args, nfft=1024, freq=True)
+        h[:] = 0.0
+        h2, f2 = pazToFreqResp(*args, nfft=1024, freq=True)
+        self.assertEqual(len(h2), 513)
+        self.assertTrue(np.all(h2[1:] != 0.0))
+        np.testing.assert_array_equal(f, f2)
+        info = responseCacheInfo()
+        self.assertEqual((info['hits'], info['misses'], info['size']),
+                         (1, 1, 1))
+        self.assertEqual(info['nbytes'], h2.nbytes + f2.nbytes)
+        # least recently used responses are dropped
+        size = invsim.RESPONSE_CACHE_SIZE
+        try:
+            invsim.RESPONSE_CACHE_SIZE = 3 * info['nbytes']
+            for delta in (0.02, 0.03, 0.04):
+                pazToFreqResp(*args[:3], t_samp=delta, nfft=1024)
+            pazToFreqResp(*args, nfft=1024)
+            info = responseCacheInfo()
+            self.assertEqual((info['hits'], info['misses'], info['size']),
+                             (1, 5, 3))
+            self.assertTrue(info['nbytes'] <= invsim.RESPONSE_CACHE_SIZE)
+        finally:
+            invsim.RESPONSE_CACHE_SIZE = size
+            clearResponseCache()
+
 
 def suite():
     return unittest.makeSuite(InvSimTestCase, 'test')
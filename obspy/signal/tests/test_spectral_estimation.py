@@ -205,6 +205,65 @@ class PsdTestCase(unittest.TestCase):
             np.testing.assert_array_equal(ppsd_loaded.period_bins,
                                           binning['period_bins'])
 
+    def test_PPSD_merge(self):
+        """
+        Merging PPSDs of consecutive time spans gives the same histogram as
+        a single PPSD of the whole data.
+        """
+        file_histogram = os.path.join(
+            self.path,
+            'BW.KW1._.EHZ.D.2011.090_downsampled__ppsd_hist_stack.npy')
+        result_hist = np.load(file_histogram)
+        tr, paz = _get_sample_data()
+        t = tr.stats.starttime
+        ppsd = PPSD(tr.stats, paz, db_bins=(-200, -50, 0.5))
+        ppsd.add(tr.slice(t, t + 5400))
+        ppsd2 = PPSD(tr.stats, paz, db_bins=(-200, -50, 0.5))
+        ppsd2.add(tr.slice(t + 3600, tr.stats.endtime))
+        self.assertEqual(len(ppsd.times), 2)
+        self.assertEqual(len(ppsd2.times), 2)
+        ppsd.merge(ppsd2)
+        self.assertEqual(ppsd.times, [t, t + 1800, t + 3600, t + 5400])
+        np.testing.assert_array_equal(ppsd.hist_stack, result_hist)
+        # no time span must be contained twice
+        self.assertRaises(ValueError, ppsd.merge, ppsd2)
+        # processing parameters have to match
+        ppsd3 = PPSD(tr.stats, paz, db_bins=(-200, -50, 1.0))
+        self.assertRaises(ValueError, ppsd.merge, ppsd3)
+
+    def test_PPSD_changing_response(self):
+        """
+        The response is checked for every segment, also if it only changes
+        between the first and the last segment of a trace.
+        """
+        tr, paz = _get_sample_data()
+        t = tr.stats.starttime
+        paz2 = dict(paz, sensitivity=paz['sensitivity'] * 10)
+
+        class Parser(object):
+            def getPAZ(self, seed_id, datetime):
+                return paz2 if datetime == t + 1800 else paz
+
+        with warnings.catch_warnings(record=True):
+            warnings.simplefilter('ignore', UserWarning)
+            ppsd = PPSD(tr.stats, parser=Parser(),
+                        db_bins=(-200, -50, 0.5))
+        ppsd.add(tr)
+        self.assertEqual(ppsd.times, [t, t + 1800, t + 3600, t + 5400])
+        expected = PPSD(tr.stats, paz, db_bins=(-200, -50, 0.5))
+        expected.add(tr.slice(t, t + 3600))
+        for paz_, t1, t2 in ((paz2, t + 1800, t + 5400),
+                             (paz, t + 3600, tr.stats.endtime)):
+            other = PPSD(tr.stats, paz_, db_bins=(-200, -50, 0.5))
+            other.add(tr.slice(t1, t2))
+            expected.merge(other)
+        self.assertEqual(expected.times, ppsd.times)
+        np.testing.assert_array_equal(ppsd.hist_stack, expected.hist_stack)
+        # a different response changes the result
+        np.testing.assert_raises(AssertionError,
+                                 np.testing.assert_array_equal,
+                                 ppsd.hist_stack, _get_ppsd().hist_stack)
+
 
 def suite():
     return unittest.makeSuite(PsdTestCase, 'test')
@@ -9,7 +9,9 @@ from future.builtins import *  # NOQA
 from ctypes import ArgumentError
 from obspy import read, Stream, UTCDateTime
 from obspy.signal import recSTALTA, recSTALTAPy, triggerOnset, pkBaer, \
-    coincidenceTrigger, arPick, classicSTALTA, classicSTALTAPy
+    coincidenceTrigger, arPick, classicSTALTA, classicSTALTAPy, \
+    triggerStream, carlSTATrig, ChunkedRecSTALTA, ChunkedClassicSTALTA, \
+    ChunkedCarlSTATrig, ChunkedTriggerOnset
 from obspy.signal.util import clibsignal
 import gzip
 import numpy as np
@@ -422,6 +424,94 @@ class TriggerTestCase(unittest.TestCase):
         ref = np.array([0.38012302, 0.37704431, 0.47674533, 0.67992292])
         self.assertTrue(np.allclose(ref, c2[99:103]))
 
+    def test_STALTA2D(self):
+        """
+        Two-dimensional data is processed row by row.
+        """
+        nsta, nlta = 5, 10
+        data = self.data.reshape((10, -1))
+        for func in (recSTALTA, classicSTALTA):
+            charfct = func(data, nsta, nlta)
+            self.assertEqual(charfct.shape, data.shape)
+            for row, cft in zip(data, charfct):
+                np.testing.assert_array_equal(cft[1:],
+                                              func(row, nsta, nlta)[1:])
+
+    def test_triggerStream(self):
+        """
+        Triggering a whole stream gives the same results as triggering each
+        trace on its own.
+        """
+        st = read().filter('highpass', freq=1.0)
+        st += st.copy()
+        for tr in st[3:]:
+            tr.stats.station = 'COPY'
+            tr.data = tr.data * 2.0
+        for trigger_type in ('recstalta', 'classicstalta'):
+            expected = []
+            for tr in st.copy():
+                tr.trigger(trigger_type, sta=0.5, lta=4)
+                expected.append((tr, triggerOnset(tr.data, 3.0, 1.5,
+                                                  max_len=500)))
+            st2 = st.copy()
+            onsets = triggerStream(st2, trigger_type, 3.0, 1.5,
+                                   max_trigger_length=5.0, workers=2,
+                                   sta=0.5, lta=4)
+            self.assertEqual(len(onsets), len(st2))
+            for tr, triggers, (tr_expected, triggers_expected) in zip(
+                    st2, onsets, expected):
+                np.testing.assert_allclose(tr.data[1:],
+                                           tr_expected.data[1:],
+                                           rtol=1e-12)
+                np.testing.assert_array_equal(triggers, triggers_expected)
+
+    def test_chunkedTriggers(self):
+        """
+        Triggers processing the data in chunks give the same results as on
+        the whole trace.
+        """
+        nsta, nlta = 50, 500
+        data = self.data[:20000]
+        chunks = np.split(data, [1, 7, 300, 1000, 1000, 12345])
+        for chunked, func, args in (
+                (ChunkedRecSTALTA, recSTALTA, ()),
+                (ChunkedClassicSTALTA, classicSTALTA, ()),
+                (ChunkedCarlSTATrig, carlSTATrig, (0.8, 0.8))):
+            trigger = chunked(nsta, nlta, *args)
+            charfct = np.concatenate([trigger.process(chunk)
+                                      for chunk in chunks])
+            self.assertEqual(trigger.npts, len(data))
+            np.testing.assert_array_equal(charfct,
+                                          func(data, nsta, nlta, *args))
+        self.assertRaises(ValueError, ChunkedClassicSTALTA, 10, 10)
+
+    def test_chunkedTriggerOnset(self):
+        """
+        Trigger onsets of a characteristic function given in chunks are the
+        same as for the whole characteristic function.
+        """
+        charfct = recSTALTA(self.data[:20000], 5, 10)
+        for max_len, max_len_delete in ((9e99, False), (20, False),
+                                        (9e99, True), (20, True)):
+            expected = triggerOnset(charfct, 1.5, 0.8, max_len,
+                                    max_len_delete)
+            trigger = ChunkedTriggerOnset(1.5, 0.8, max_len, max_len_delete)
+            picks = [trigger.process(chunk)
+                     for chunk in np.array_split(charfct, 7)]
+            picks.append(trigger.finish())
+            picks = np.concatenate([p.reshape(-1, 2) for p in picks])
+            np.testing.assert_array_equal(picks, expected)
+        # a trigger still on at the end is dropped
+        for max_len in (9e99, 20):
+            trigger = ChunkedTriggerOnset(2.0, 1.0, max_len, True)
+            picks = [trigger.process([0, 3, 3, 0]),
+                     trigger.process([0, 3, 3, 3]), trigger.finish()]
+            picks = np.concatenate([p.reshape(-1, 2) for p in picks])
+            np.testing.assert_array_equal(picks, [[1, 2]])
+            np.testing.assert_array_equal(
+                triggerOnset(np.array([0, 3, 3, 0, 0, 3, 3, 3]), 2.0, 1.0,
+                             max_len, True), [[1, 2]])
+
 
 def suite():
     return unittest.makeSuite(TriggerTestCase, 'test')
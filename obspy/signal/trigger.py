@@ -34,6 +34,7 @@ import ctypes as C
 from collections import deque
 import numpy as np
 from obspy import UTCDateTime
+from obspy.core.stream import _mapParallel
 from obspy.signal.headers import clibsignal, head_stalta_t
 from obspy.signal.cross_correlation import templatesMaxSimilarity
 
@@ -46,7 +47,9 @@ def recSTALTA(a, nsta, nlta):
 
     :note: This version directly uses a C version via CTypes
     :type a: :class:`numpy.ndarray`, dtype=float64
-    :param a: Seismic Trace, numpy.ndarray dtype float64
+    :param a: Seismic Trace, numpy.ndarray dtype float64. Two-dimensional
+        arrays are processed row by row in a single call of the C function,
+        i.e. one row per channel.
     :type nsta: int
     :param nsta: Length of short time average window in samples
     :type nlta: int
@@ -58,10 +61,13 @@ def recSTALTA(a, nsta, nlta):
     """
     # be nice and adapt type if necessary
     a = np.ascontiguousarray(a, np.float64)
-    ndat = len(a)
-    charfct = np.empty(ndat, dtype=np.float64)
+    charfct = np.empty(a.shape, dtype=np.float64)
     # do not use pointer here:
-    clibsignal.recstalta(a, charfct, ndat, nsta, nlta)
+    if a.ndim == 2:
+        clibsignal.recstalta_2d(a, charfct, a.shape[0], a.shape[1], nsta,
+                                nlta)
+    else:
+        clibsignal.recstalta(a, charfct, len(a), nsta, nlta)
     return charfct
 
 
@@ -173,7 +179,8 @@ def classicSTALTA(a, nsta, nlta):
     Fast version written in C.
 
     :type a: NumPy :class:`~numpy.ndarray`
-    :param a: Seismic Trace
+    :param a: Seismic Trace. Two-dimensional arrays are processed row by row
+        in a single call of the C function, i.e. one row per channel.
     :type nsta: int
     :param nsta: Length of short time average window in samples
     :type nlta: int
@@ -184,13 +191,16 @@ def classicSTALTA(a, nsta, nlta):
     data = a
     # initialize C struct / NumPy structured array
     head = np.empty(1, dtype=head_stalta_t)
-    head[:] = (len(data), nsta, nlta)
+    head[:] = (np.shape(data)[-1], nsta, nlta)
     # ensure correct type and contiguous of data
     data = np.ascontiguousarray(data, dtype=np.float64)
     # all memory should be allocated by python
-    charfct = np.empty(len(data), dtype=np.float64)
+    charfct = np.empty(data.shape, dtype=np.float64)
     # run and check the error-code
-    errcode = clibsignal.stalta(head, data, charfct)
+    if data.ndim == 2:
+        errcode = clibsignal.stalta_2d(head, data, charfct, data.shape[0])
+    else:
+        errcode = clibsignal.stalta(head, data, charfct)
     if errcode != 0:
         raise Exception('ERROR %d stalta: len(data) < nlta' % errcode)
     return charfct
@@ -344,7 +354,7 @@ def triggerOnset(charfct, thres1, thres2, max_len=9e99, max_len_delete=False):
     #
     on = deque([ind1[0]])
     of = deque([-1])
-    of.extend(ind2[np.diff(ind2) > 1].tolist())
+    of.extend(ind2[:-1][np.diff(ind2) > 1].tolist())
     on.extend(ind1[np.where(np.diff(ind1) > 1)[0] + 1].tolist())
     # include last pick if trigger is on or drop it
     if max_len_delete:
@@ -361,6 +371,9 @@ def triggerOnset(charfct, thres1, thres2, max_len=9e99, max_len_delete=False):
             on.popleft()
         while of[0] < on[0]:
             of.popleft()
+        if of[0] == 1e99:
+            # trigger still on at the end of the data, drop it
+            break
         if of[0] - on[0] > max_len:
             if max_len_delete:
                 on.popleft()
@@ -370,6 +383,326 @@ def triggerOnset(charfct, thres1, thres2, max_len=9e99, max_len_delete=False):
     return np.array(pick, dtype=np.int64)
 
 
+class ChunkedRecSTALTA(object):
+    """
+    Recursive STA/LTA of a signal given in consecutive chunks, e.g. from a
+    real time data stream.
+
+    The short and long time averages are kept from one call of
+    :meth:`process` to the next, so the characteristic functions of all
+    chunks put together are identical to the result of
+    :func:`~obspy.signal.trigger.recSTALTA` for the whole signal (if it has
+    more than ``nlta`` samples).
+
+    :type nsta: int
+    :param nsta: Length of short time average window in samples
+    :type nlta: int
+    :param nlta: Length of long time average window in samples
+
+    .. rubric:: Example
+
+    >>> data = np.random.randn(1000)
+    >>> trigger = ChunkedRecSTALTA(5, 10)
+    >>> charfct = np.concatenate([trigger.process(chunk)
+    ...                           for chunk in np.array_split(data, 3)])
+    >>> np.array_equal(charfct, recSTALTA(data, 5, 10))
+    True
+    """
+    def __init__(self, nsta, nlta):
+        self.nsta = nsta
+        self.nlta = nlta
+        # number of samples processed so far
+        self.npts = 0
+        self._state = np.zeros(2, dtype=np.float64)
+
+    def process(self, a):
+        """
+        Computes the characteristic function of the next chunk.
+
+        :type a: NumPy :class:`~numpy.ndarray`
+        :param a: Next samples of the seismic trace
+        :rtype: NumPy :class:`~numpy.ndarray`, dtype=float64
+        :return: Characteristic function of recursive STA/LTA for the chunk
+        """
+        a = np.ascontiguousarray(a, np.float64)
+        charfct = np.zeros(len(a), dtype=np.float64)
+        # as in recSTALTA the first sample of the signal is not used
+        start = 1 if self.npts == 0 else 0
+        if len(a) > start:
+            clibsignal.recstalta_state(a[start:], charfct[start:],
+                                       len(a) - start, self.nsta, self.nlta,
+                                       self._state)
+        charfct[:max(0, self.nlta - self.npts)] = 0.0
+        self.npts += len(a)
+        return charfct
+
+
+class ChunkedClassicSTALTA(object):
+    """
+    Classic STA/LTA of a signal given in consecutive chunks, e.g. from a
+    real time data stream.
+
+    The running sums and the last ``nlta`` samples are kept from one call of
+    :meth:`process` to the next, so the characteristic functions of all
+    chunks put together are identical to the result of
+    :func:`~obspy.signal.trigger.classicSTALTA` for the whole signal.
+
+    :type nsta: int
+    :param nsta: Length of short time average window in samples
+    :type nlta: int
+    :param nlta: Length of long time average window in samples
+    """
+    def __init__(self, nsta, nlta):
+        if nsta >= nlta:
+            raise ValueError('nsta must be smaller than nlta')
+        self.nsta = nsta
+        self.nlta = nlta
+        # number of samples processed so far
+        self.npts = 0
+        self._head = np.empty(1, dtype=head_stalta_t)
+        self._state = np.zeros(3, dtype=np.float64)
+        self._history = np.empty(0, dtype=np.float64)
+
+    def process(self, a):
+        """
+        Computes the characteristic function of the next chunk.
+
+        :type a: NumPy :class:`~numpy.ndarray`
+        :param a: Next samples of the seismic trace
+        :rtype: NumPy :class:`~numpy.ndarray`, dtype=float64
+        :return: Characteristic function of classic STA/LTA for the chunk
+        """
+        data = np.concatenate((self._history,
+                               np.asarray(a, dtype=np.float64).ravel()))
+        npts = len(data) - len(self._history)
+        self._head[:] = (npts, self.nsta, self.nlta)
+        charfct = np.empty(npts, dtype=np.float64)
+        errcode = clibsignal.stalta_state(self._head, data, charfct,
+                                          len(self._history), self._state)
+        if errcode != 0:
+            raise Exception('ERROR %d stalta: nsta >= nlta' % errcode)
+        self._history = data[-self.nlta:].copy()
+        self.npts += npts
+        return charfct
+
+
+def _movingSum(history, data, n):
+    """
+    Sums of ``n`` consecutive samples ending at every sample of ``data``.
+
+    :param history: The ``n`` samples preceding ``data``.
+    :return: The sums and the last ``n`` samples as history of the next call.
+    """
+    ext = np.concatenate((history, data))
+    out = np.zeros(len(data), dtype=np.float64)
+    for i in range(n):
+        out += ext[i:i + len(data)]
+    return out, ext[len(ext) - n:]
+
+
+class ChunkedCarlSTATrig(object):
+    """
+    carlSTATrig characteristic function of a signal given in consecutive
+    chunks, e.g. from a real time data stream.
+
+    The moving averages are continued from one call of :meth:`process` to
+    the next, the characteristic functions of all chunks put together match
+    the result of :func:`~obspy.signal.trigger.carlSTATrig` for the whole
+    signal.
+
+    :type nsta: int
+    :param nsta: Length of short time average window in samples
+    :type nlta: int
+    :param nlta: Length of long time average window in samples
+    :type ratio: float
+    :param ratio: as ratio gets smaller, carlSTATrig gets more sensitive
+    :type quiet: float
+    :param quiet: as quiet gets smaller, carlSTATrig gets more sensitive
+    """
+    def __init__(self, nsta, nlta, ratio, quiet):
+        self.nsta = nsta
+        self.nlta = nlta
+        self.ratio = ratio
+        self.quiet = quiet
+        # number of samples processed so far
+        self.npts = 0
+        self._a = np.zeros(nsta)
+        self._sta = np.zeros(nlta)
+        self._diff = np.zeros(nsta)
+        self._star = np.zeros(nlta)
+        self._lta = 0.0
+
+    def process(self, a):
+        """
+        Computes the characteristic function of the next chunk.
+
+        :type a: NumPy :class:`~numpy.ndarray`
+        :param a: Next samples of the seismic trace
+        :rtype: NumPy :class:`~numpy.ndarray`, dtype=float64
+        :return: Characteristic function of CarlStaTrig for the chunk
+        """
+        a = np.asarray(a, dtype=np.float64)
+        if len(a) == 0:
+            return np.empty(0, dtype=np.float64)
+        # index of the samples in the whole signal
+        index = np.arange(self.npts, self.npts + len(a))
+        sta, self._a = _movingSum(self._a, a, self.nsta)
+        sta[index < self.nsta] = 0.0
+        sta /= self.nsta
+        lta, self._sta = _movingSum(self._sta, sta, self.nlta)
+        lta[index < self.nlta] = 0.0
+        lta /= self.nlta
+        # the long time average is delayed by one sample
+        lta = np.concatenate(([self._lta], lta))
+        self._lta = lta[-1]
+        lta = lta[:-1]
+        star, self._diff = _movingSum(self._diff, abs(a - lta), self.nsta)
+        star[index < self.nsta] = 0.0
+        star /= self.nsta
+        ltar, self._star = _movingSum(self._star, star, self.nlta)
+        ltar[index < self.nlta] = 0.0
+        ltar /= self.nlta
+        eta = star - (self.ratio * ltar) - abs(sta - lta) - self.quiet
+        eta[:max(0, self.nlta - self.npts)] = -1.0
+        self.npts += len(a)
+        return eta
+
+
+class ChunkedTriggerOnset(object):
+    """
+    Trigger on and off times of a characteristic function given in
+    consecutive chunks, e.g. from
+    :class:`~obspy.signal.trigger.ChunkedRecSTALTA`.
+
+    Every call of :meth:`process` returns the triggers which are completed
+    by the new chunk, :meth:`finish` returns the remaining trigger at the end
+    of the signal. All triggers put together are the same as the result of
+    :func:`~obspy.signal.trigger.triggerOnset` for the whole characteristic
+    function. The on and off times are given as sample index counted from
+    the start of the first chunk.
+
+    :type thres1: float
+    :param thres1: Value above which trigger (of characteristic function)
+                   is activated (higher threshold)
+    :type thres2: float
+    :param thres2: Value below which trigger (of characteristic function)
+        is deactivated (lower threshold)
+    :type max_len: int
+    :param max_len: Maximum length of triggered event in samples. A new
+                    event will be triggered as soon as the signal reaches
+                    again above thres1.
+    :type max_len_delete: bool
+    :param max_len_delete: Do not write events longer than max_len into
+                           report file.
+    """
+    def __init__(self, thres1, thres2, max_len=9e99, max_len_delete=False):
+        self.thres1 = thres1
+        self.thres2 = thres2
+        self.max_len = max_len
+        self.max_len_delete = max_len_delete
+        # number of samples processed so far
+        self.npts = 0
+        self._on = deque()
+        self._of = deque()
+        self._prev_off = -1
+        # last sample of the previous chunk above thres1 resp. thres2
+        self._above1 = False
+        self._above2 = False
+        # index of the last sample above thres2
+        self._last2 = None
+        # end of a period above thres2 not yet followed by another one
+        self._pending = None
+
+    def process(self, charfct):
+        """
+        Searches the next chunk of the characteristic function for triggers.
+
+        :type charfct: NumPy :class:`~numpy.ndarray`
+        :param charfct: Next samples of the characteristic function
+        :rtype: NumPy :class:`~numpy.ndarray`
+        :return: Array of trigger on and off times in samples completed by
+            this chunk
+        """
+        charfct = np.asarray(charfct)
+        if len(charfct) == 0:
+            return self._pick()
+        above1 = charfct > self.thres1
+        above2 = charfct > self.thres2
+        # starts of periods above thres1 are trigger on candidates
+        before1 = np.concatenate(([self._above1], above1[:-1]))
+        self._on.extend((np.where(above1 & ~before1)[0] +
+                         self.npts).tolist())
+        # ends of periods above thres2 are trigger off candidates, the end
+        # at the last sample is only known with the next chunk
+        after2 = np.concatenate((above2[1:], [True]))
+        ends = (np.where(above2 & ~after2)[0] + self.npts).tolist()
+        if self._above2 and not above2[0]:
+            ends.insert(0, self.npts - 1)
+        ind2 = np.where(above2)[0]
+        if self.max_len_delete:
+            # as in triggerOnset only ends followed by another sample above
+            # thres2 are used
+            if self._pending is not None and len(ind2):
+                self._of.append(self._pending)
+                self._pending = None
+            if ends:
+                last2 = ind2[-1] + self.npts if len(ind2) else -1
+                self._of.extend([end for end in ends if end < last2])
+                if ends[-1] >= last2:
+                    self._pending = ends[-1]
+        else:
+            self._of.extend(ends)
+        if len(ind2):
+            self._last2 = ind2[-1] + self.npts
+        self._above1 = bool(above1[-1])
+        self._above2 = bool(above2[-1])
+        self.npts += len(charfct)
+        return self._pick()
+
+    def finish(self):
+        """
+        Returns the remaining trigger at the end of the signal.
+
+        Without ``max_len_delete`` a trigger which is still on is closed at
+        the last sample above thres2, otherwise it is dropped.
+
+        :rtype: NumPy :class:`~numpy.ndarray`
+        :return: Array of trigger on and off times in samples
+        """
+        if not self.max_len_delete and self._last2 is not None:
+            self._of.append(self._last2)
+        picks = self._pick()
+        self._on.clear()
+        self._of.clear()
+        return picks
+
+    def _pick(self):
+        """
+        Pairs trigger on and off candidates as far as possible.
+        """
+        picks = []
+        while self._on:
+            on = self._on[0]
+            if on <= self._prev_off:
+                self._on.popleft()
+                continue
+            while self._of and self._of[0] < on:
+                self._of.popleft()
+            if not self._of:
+                break
+            off = self._of[0]
+            if off - on > self.max_len:
+                if self.max_len_delete:
+                    self._on.popleft()
+                    self._prev_off = off
+                    continue
+                off = on + self.max_len
+            picks.append([on, off])
+            self._prev_off = off
+            self._on.popleft()
+        return np.array(picks, dtype=np.int64)
+
+
 def pkBaer(reltrc, samp_int, tdownmax, tupevent, thr1, thr2, preset_len,
            p_dur):
     """
@@ -498,12 +831,70 @@ def plotTrigger(trace, cft, thr_on, thr_off, show=True):
         plt.show()
 
 
+def triggerStream(stream, trigger_type, thr_on, thr_off,
+                  max_trigger_length=1e6, delete_long_trigger=False,
+                  workers=None, **options):
+    """
+    Apply a trigger and :func:`triggerOnset` to all traces of a stream.
+
+    The characteristic functions of all traces with the same sampling rate
+    and number of samples are computed in a single call of the C routine for
+    the ``'recstalta'`` and ``'classicstalta'`` triggers, see
+    :meth:`~obspy.core.stream.Stream.trigger`. The C routines release the
+    global interpreter lock, so these calls and the evaluation of the trigger
+    thresholds run in parallel if ``workers`` is given.
+
+    :type stream: :class:`~obspy.core.stream.Stream`
+    :param stream: Stream containing waveform data for all channels. The
+        data is replaced by the characteristic functions in place.
+    :param trigger_type: String that specifies which trigger is applied (e.g.
+        ``'recstalta'``), see :meth:`obspy.core.trace.Trace.trigger`. If set
+        to ``None`` the data is supposed to be a precomputed characteristic
+        function.
+    :type trigger_type: str or None
+    :type thr_on: float
+    :param thr_on: Threshold for switching the trigger on.
+    :type thr_off: float
+    :param thr_off: Threshold for switching the trigger off.
+    :type max_trigger_length: int or float
+    :param max_trigger_length: Maximum trigger length in seconds, see
+        ``max_len`` of :func:`triggerOnset`.
+    :type delete_long_trigger: bool, optional
+    :param delete_long_trigger: Remove triggers longer than
+        ``max_trigger_length``, see ``max_len_delete`` of
+        :func:`triggerOnset`.
+    :type workers: int, optional
+    :param workers: Number of threads processing the traces concurrently.
+    :param options: Necessary keyword arguments for the respective trigger,
+        e.g. ``sta`` and ``lta`` in seconds.
+    :rtype: list
+    :returns: Trigger on and off samples as returned by :func:`triggerOnset`
+        for every trace of the stream.
+
+    .. rubric:: Example
+
+    >>> from obspy import read
+    >>> st = read().filter('highpass', freq=1.0)
+    >>> onsets = triggerStream(st, 'recstalta', 3.0, 1.5, sta=0.5, lta=4)
+    >>> len(onsets)
+    3
+    """
+    if trigger_type is not None:
+        stream.trigger(trigger_type, workers=workers, **options)
+
+    def onsets(tr):
+        max_len = int(max_trigger_length * tr.stats.sampling_rate + 0.5)
+        return triggerOnset(tr.data, thr_on, thr_off, max_len=max_len,
+                            max_len_delete=delete_long_trigger)
+    return _mapParallel(onsets, stream.traces, workers)
+
+
 def coincidenceTrigger(trigger_type, thr_on, thr_off, stream,
                        thr_coincidence_sum, trace_ids=None,
                        max_trigger_length=1e6, delete_long_trigger=False,
                        trigger_off_extension=0, details=False,
                        event_templates={}, similarity_threshold=0.7,
-                       **options):
+                       workers=None, **options):
     """
     Perform a network coincidence trigger.
 
@@ -599,6 +990,9 @@ def coincidenceTrigger(trigger_type, thr_on, thr_off, stream,
         trigger list. A common threshold can be set for all stations (float) or
         a dictionary mapping station names to float values for each station.
     :type similarity_threshold: float or dict
+    :type workers: int, optional
+    :param workers: Number of threads computing the single station triggers
+        concurrently, see :func:`triggerStream`.
     :rtype: list
     :returns: List of event triggers sorted chronologically.
     """
@@ -616,19 +1010,20 @@ def coincidenceTrigger(trigger_type, thr_on, thr_off, stream,
 
     # the single station triggering
     triggers = []
-    # prepare kwargs for triggerOnset
-    kwargs = {'max_len_delete': delete_long_trigger}
+    traces = []
     for tr in st:
         if tr.id not in trace_ids:
             msg = "At least one trace's ID was not found in the " + \
                   "trace ID list and was disregarded (%s)" % tr.id
             warnings.warn(msg, UserWarning)
             continue
-        if trigger_type is not None:
-            tr.trigger(trigger_type, **options)
-        kwargs['max_len'] = int(max_trigger_length * tr.stats.sampling_rate
-                                + 0.5)
-        tmp_triggers = triggerOnset(tr.data, thr_on, thr_off, **kwargs)
+        traces.append(tr)
+    st.traces = traces
+    all_triggers = triggerStream(st, trigger_type, thr_on, thr_off,
+                                 max_trigger_length=max_trigger_length,
+                                 delete_long_trigger=delete_long_trigger,
+                                 workers=workers, **options)
+    for tr, tmp_triggers in zip(st, all_triggers):
         for on, off in tmp_triggers:
             try:
                 cft_peak = tr.data[on:off].max()
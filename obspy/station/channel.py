@@ -198,6 +198,7 @@ class Channel(BaseNode):
     @location_code.setter
     def location_code(self, value):
         self._location_code = value.strip()
+        BaseNode._modification_count += 1
 
     @property
     def longitude(self):
@@ -13,15 +13,17 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
 
-from pkg_resources import load_entry_point
 import obspy
 from obspy.core.util.base import ComparingObject
 from obspy.core.util.decorator import map_example_filename
-from obspy.core.util.base import ENTRY_POINTS, _readFromPlugin
+from obspy.core.util.base import ENTRY_POINTS, _readFromPlugin, \
+    _getPluginFunction
 from obspy.station.stationxml import SOFTWARE_MODULE, SOFTWARE_URI
 from obspy.station.network import Network
+from obspy.station.util import BaseNode
 import textwrap
 import warnings
+import bisect
 import copy
 import fnmatch
 import numpy as np
@@ -35,7 +37,7 @@ def _createExampleInventory():
 
 
 @map_example_filename("path_or_file_object")
-def read_inventory(path_or_file_object=None, format=None):
+def read_inventory(path_or_file_object=None, format=None, **kwargs):
     """
     Function to read inventory files.
 
@@ -44,11 +46,171 @@ def read_inventory(path_or_file_object=None, format=None):
         object will be returned.
     :type format: str, optional
     :param format: Format of the file to read (e.g. ``"STATIONXML"``).
+
+    Additional keyword arguments are passed to the format specific reading
+    function, e.g. the ``level`` and selection criteria of
+    :func:`~obspy.station.stationxml.read_StationXML`.
     """
     if path_or_file_object is None:
         # if no pathname or URL specified, return example catalog
         return _createExampleInventory()
-    return _readFromPlugin("inventory", path_or_file_object, format=format)[0]
+    return _readFromPlugin("inventory", path_or_file_object, format=format,
+                           **kwargs)[0]
+
+
+class _InventoryIndex(object):
+    """
+    Index of all channels of an inventory by SEED ID and epoch.
+
+    The channels are sorted by SEED ID and start time. The running maximum
+    of the end times of all epochs of a SEED ID allows to stop the search
+    for epochs overlapping a time window at the first epoch whose
+    predecessors all ended before the window.
+
+    The found entries are tuples ``(position, network, station, channel)``
+    where ``position`` gives the order of the channel in the inventory. The
+    index remembers the lists of networks, stations and channels it was
+    built from and their lengths to detect added, removed and replaced
+    lists, and the modification count of the nodes to detect changed codes
+    and epochs.
+    """
+    # margin in seconds around searched time windows, UTCDateTime
+    # comparisons are rounded to microseconds
+    MARGIN = 1e-3
+
+    def __init__(self, inventory):
+        self.modification_count = BaseNode._modification_count
+        self.networks = (inventory.networks, len(inventory.networks))
+        # (network code, ) and (network code, station code) mapped to the
+        # stations/channels lists of all matching networks/stations
+        self.lists = {}
+        records = []
+        for net in inventory.networks:
+            self.lists.setdefault((net.code,), []).append(
+                (net, "stations", net.stations, len(net.stations)))
+            for sta in net.stations:
+                self.lists.setdefault((net.code, sta.code), []).append(
+                    (sta, "channels", sta.channels, len(sta.channels)))
+                for cha in sta.channels:
+                    start = cha.start_date
+                    start = -np.inf if start is None else start.timestamp
+                    records.append(((net.code, sta.code, cha.location_code,
+                                     cha.code), start, len(records), net, sta,
+                                    cha))
+        records.sort(key=lambda record: record[:3])
+
+        # network code -> station code -> (location code, channel code) ->
+        # slice of the sorted channels
+        self.tree = {}
+        self.entries = []
+        self.starts = []
+        self.max_ends = []
+        self.ends = []
+        key = channels = first = max_end = None
+        for record in records:
+            if record[0] != key:
+                if key is not None:
+                    channels[key[2:]] = (first, len(self.entries))
+                key = record[0]
+                channels = self.tree.setdefault(key[0], {}).setdefault(
+                    key[1], {})
+                first = len(self.entries)
+                max_end = -np.inf
+            end = record[-1].end_date
+            end = np.inf if end is None else end.timestamp
+            max_end = max(max_end, end)
+            self.entries.append(record[2:])
+            self.starts.append(record[1])
+            self.ends.append(end)
+            self.max_ends.append(max_end)
+        if key is not None:
+            channels[key[2:]] = (first, len(self.entries))
+
+    def is_valid(self, inventory, path=None):
+        """
+        Checks if the inventory was changed since the index was built.
+
+        :type path: tuple
+        :param path: Only check the lists of networks/stations with the given
+            network code (and station code) for added or removed items,
+            e.g. ``("BW", "RJOB")``.
+        """
+        if self.modification_count != BaseNode._modification_count:
+            return False
+        networks, length = self.networks
+        if inventory.networks is not networks or len(networks) != length:
+            return False
+        if path is None:
+            lists = self.lists.values()
+        else:
+            lists = [self.lists.get(path[:i], []) for i in (1, 2)]
+        for items in lists:
+            for obj, attr, items_, length in items:
+                if getattr(obj, attr) is not items_ or \
+                        len(items_) != length:
+                    return False
+        return True
+
+    def _find(self, first, last, starttime, endtime):
+        """
+        Returns the entries between ``first`` and ``last`` whose epochs may
+        overlap the given time window.
+
+        Times of ``None`` leave the window open on that side. The entries
+        are only selected by timestamps, callers have to check the returned
+        candidates with the usual UTCDateTime comparisons.
+        """
+        t1 = -np.inf if starttime is None else \
+            starttime.timestamp - self.MARGIN
+        t2 = np.inf if endtime is None else endtime.timestamp + self.MARGIN
+        i = bisect.bisect_right(self.starts, t2, first, last)
+        found = []
+        while i > first and self.max_ends[i - 1] >= t1:
+            i -= 1
+            if self.ends[i] >= t1:
+                found.append(self.entries[i])
+        return found
+
+    def find(self, network, station, location, channel, starttime=None,
+             endtime=None):
+        """
+        Returns the entries of all channels with the given codes whose
+        epochs may overlap the given time window in inventory order.
+        """
+        try:
+            first, last = self.tree[network][station][(location, channel)]
+        except KeyError:
+            return []
+        return sorted(self._find(first, last, starttime, endtime))
+
+    def select(self, network=None, station=None, location=None,
+               channel=None, starttime=None, endtime=None):
+        """
+        Same as :meth:`find` but the codes may contain UNIX style wildcards
+        as in :meth:`Inventory.select`. ``None`` matches any code.
+        """
+        matches = {}
+
+        def _match(code, pattern):
+            if pattern is None:
+                return True
+            key = (code, pattern)
+            if key not in matches:
+                matches[key] = fnmatch.fnmatch(code.upper(), pattern.upper())
+            return matches[key]
+
+        found = []
+        for net, stations in self.tree.items():
+            if not _match(net, network):
+                continue
+            for sta, channels in stations.items():
+                if not _match(sta, station):
+                    continue
+                for (loc, cha), (first, last) in channels.items():
+                    if _match(loc, location) and _match(cha, channel):
+                        found.extend(
+                            self._find(first, last, starttime, endtime))
+        return sorted(found)
 
 
 class Inventory(ComparingObject):
@@ -56,7 +218,16 @@ class Inventory(ComparingObject):
     The root object of the Inventory->Network->Station->Channel hierarchy.
 
     In essence just a container for one or more networks.
+
+    :meth:`get_response`, :meth:`get_coordinates` and :meth:`select` use an
+    index of all channels by SEED ID and epoch. It is built on the first
+    lookup and rebuilt after networks, stations or channels were added,
+    removed or had their codes or epochs changed. Replacing single items of
+    the lists of networks/stations/channels (e.g. ``net.stations[0] = sta``)
+    is not detected, assign a new list instead.
     """
+    _index = None
+
     def __init__(self, networks, source, sender=None, created=None,
                  module=SOFTWARE_MODULE, module_uri=SOFTWARE_URI):
         """
@@ -114,6 +285,33 @@ class Inventory(ComparingObject):
     def __getitem__(self, index):
         return self.networks[index]
 
+    def __eq__(self, other):
+        if not isinstance(other, Inventory):
+            return False
+        return self.__getstate__() == other.__getstate__()
+
+    def __getstate__(self):
+        # the index refers to the original objects and is rebuilt if needed
+        state = self.__dict__.copy()
+        state.pop("_index", None)
+        return state
+
+    def _get_index(self, path=None):
+        """
+        Returns the channel index, rebuilding it if the inventory changed.
+
+        :type path: tuple
+        :param path: Network code (and station code) of the lookup, only the
+            networks/stations with these codes are checked for added or
+            removed items.
+        :rtype: :class:`_InventoryIndex`
+        """
+        index = self._index
+        if index is None or not index.is_valid(self, path):
+            index = _InventoryIndex(self)
+            self._index = index
+        return index
+
     def get_contents(self):
         """
         Returns a dictionary containing the contents of the object.
@@ -183,9 +381,8 @@ class Inventory(ComparingObject):
             # get format specific entry point
             format_ep = ENTRY_POINTS['inventory_write'][format]
             # search writeFormat method for given entry point
-            writeFormat = load_entry_point(
-                format_ep.dist.key,
-                'obspy.plugin.inventory.%s' % (format_ep.name), 'writeFormat')
+            writeFormat = _getPluginFunction('inventory', format_ep,
+                                             'writeFormat')
         except (IndexError, ImportError, KeyError):
             msg = "Writing format \"%s\" is not supported. Supported types: %s"
             raise TypeError(msg % (format,
@@ -231,16 +428,14 @@ class Inventory(ComparingObject):
         :rtype: :class:`~obspy.station.response.Response`
         :returns: Response for time series specified by input arguments.
         """
-        network, _, _, _ = seed_id.split(".")
-
-        responses = []
-        for net in self.networks:
-            if net.code != network:
-                continue
-            try:
-                responses.append(net.get_response(seed_id, datetime))
-            except:
-                pass
+        network, station, location, channel = seed_id.split(".")
+        index = self._get_index((network, station))
+        channels = index.find(network, station, location, channel,
+                              datetime, datetime)
+        responses = [cha.response for _, _, _, cha in channels
+                     if (cha.start_date is None or cha.start_date <= datetime)
+                     and (cha.end_date is None or cha.end_date >= datetime)
+                     and cha.response is not None]
         if len(responses) > 1:
             msg = "Found more than one matching response. Returning first."
             warnings.warn(msg)
@@ -261,16 +456,27 @@ class Inventory(ComparingObject):
         :return: Dictionary containing coordinates (latitude, longitude,
             elevation)
         """
-        network, _, _, _ = seed_id.split(".")
-
+        network, station, location, channel = seed_id.split(".")
+        index = self._get_index((network, station))
         coordinates = []
-        for net in self.networks:
-            if net.code != network:
+        for _, net, sta, cha in index.find(network, station, location,
+                                           channel, datetime, datetime):
+            if net.start_date and net.start_date > datetime:
                 continue
-            try:
-                coordinates.append(net.get_coordinates(seed_id, datetime))
-            except:
-                pass
+            if net.end_date and net.end_date < datetime:
+                continue
+            # check datetime only if given
+            if datetime and any(
+                    node.start_date and node.start_date > datetime or
+                    node.end_date and node.end_date < datetime
+                    for node in (sta, cha)):
+                continue
+            # if channel latitude or longitude is not given use station
+            coordinates.append({
+                'latitude': cha.latitude or sta.latitude,
+                'longitude': cha.longitude or sta.longitude,
+                'elevation': cha.elevation,
+                'local_depth': cha.depth})
         if len(coordinates) > 1:
             msg = "Found more than one matching coordinates. Returning first."
             warnings.warn(msg)
@@ -343,6 +549,16 @@ class Inventory(ComparingObject):
             themselves but have no matching child elements (stations/channels)
             will be included in the result.
         """
+        if not keep_empty:
+            networks = self._select_channels(
+                network=network, station=station, location=location,
+                channel=channel, time=time, starttime=starttime,
+                endtime=endtime, sampling_rate=sampling_rate)
+            inv = copy.copy(self)
+            inv.networks = networks
+            return inv
+
+        # networks/stations without matching channels are not in the index
         networks = []
         for net in self.networks:
             # skip if any given criterion is not matched
@@ -359,13 +575,62 @@ class Inventory(ComparingObject):
                 station=station, location=location, channel=channel, time=time,
                 starttime=starttime, endtime=endtime,
                 sampling_rate=sampling_rate, keep_empty=keep_empty)
-            if not keep_empty and not net_.stations:
-                continue
             networks.append(net_)
         inv = copy.copy(self)
         inv.networks = networks
         return inv
 
+    def _select_channels(self, network=None, station=None, location=None,
+                         channel=None, time=None, starttime=None,
+                         endtime=None, sampling_rate=None):
+        """
+        Returns shallow copies of the networks and stations with the channels
+        matching the given criteria (see :meth:`select`) looked up in the
+        channel index.
+        """
+        check_times = any([t is not None for t in (time, starttime, endtime)])
+        # time window every matching epoch has to overlap
+        times = [t for t in (time, starttime) if t is not None]
+        t1 = max(times) if times else None
+        times = [t for t in (time, endtime) if t is not None]
+        t2 = min(times) if times else None
+
+        # group matching channels by network and station in original order
+        groups = []
+        index = self._get_index()
+        for _, net, sta, cha in index.select(network, station, location,
+                                             channel, t1, t2):
+            if check_times and not all(
+                    node.is_active(time=time, starttime=starttime,
+                                   endtime=endtime)
+                    for node in (net, sta, cha)):
+                continue
+            if sampling_rate is not None:
+                if not cha.sample_rate:
+                    msg = ("Omitting channel that has no sampling rate "
+                           "specified.")
+                    warnings.warn(msg)
+                    continue
+                if float(sampling_rate) != cha.sample_rate:
+                    continue
+            if not groups or groups[-1][0] is not net:
+                groups.append((net, []))
+            stations = groups[-1][1]
+            if not stations or stations[-1][0] is not sta:
+                stations.append((sta, []))
+            stations[-1][1].append(cha)
+
+        networks = []
+        for net, stations in groups:
+            net_ = copy.copy(net)
+            net_.stations = []
+            for sta, channels in stations:
+                sta_ = copy.copy(sta)
+                sta_.channels = channels
+                net_.stations.append(sta_)
+            networks.append(net_)
+        return networks
+
     def plot(self, projection='cyl', resolution='l',
              continent_fill_color='0.9', water_fill_color='1.0', marker="v",
              size=15**2, label=True, color='blue', color_per_network=False,
@@ -15,6 +15,8 @@ from future.builtins import *  # NOQA
 
 import warnings
 import ctypes as C
+import hashlib
+import pickle
 import numpy as np
 from math import pi
 from copy import deepcopy
@@ -741,9 +743,14 @@ class Response(ComparingObject):
             used (disregarding all later stages).
         :rtype: tuple of two arrays
         :returns: frequency response and corresponding frequencies
+
+        .. note::
+            The responses are cached, channels with identical responses and
+            the same sampling rate and number of FFT points share the result
+            of a single evalresp call (see
+            :func:`~obspy.signal.invsim.responseCacheInfo`).
         """
-        import obspy.signal.evrespwrapper as ew
-        from obspy.signal.headers import clibevresp
+        from obspy.signal.invsim import _getCachedResponse
 
         out_units = output.upper()
         if out_units not in ("DISP", "VEL", "ACC"):
@@ -751,6 +758,28 @@ class Response(ComparingObject):
                    "or 'ACC'") % output
             raise ValueError(msg)
 
+        def _calc():
+            return self._evalresp_response(t_samp, nfft, out_units,
+                                           start_stage, end_stage)
+
+        # identical responses of different channels have the same pickle
+        try:
+            fingerprint = hashlib.sha1(pickle.dumps(self, protocol=2))
+        except Exception:
+            return _calc()
+        key = ('evalresp', fingerprint.digest(), float(t_samp), int(nfft),
+               out_units, start_stage, end_stage)
+        return _getCachedResponse(key, _calc)
+
+    def _evalresp_response(self, t_samp, nfft, out_units, start_stage=None,
+                           end_stage=None):
+        """
+        Computes the frequency response using evalresp, see
+        :meth:`get_evalresp_response`.
+        """
+        import obspy.signal.evrespwrapper as ew
+        from obspy.signal.headers import clibevresp, clibevresp_lock
+
         # Whacky. Evalresp uses a global variable and uses that to scale the
         # response if it encounters any unit that is not SI.
         scale_factor = [1.0]
@@ -1058,34 +1087,37 @@ class Response(ComparingObject):
         output = np.empty(len(freqs), dtype=np.complex128)
         out_units = C.c_char_p(out_units.encode('ascii', 'strict'))
 
-        # Set global variables
-        if self.resource_id:
-            clibevresp.curr_file.value = self.resource_id.encode('utf-8')
-        else:
-            clibevresp.curr_file.value = None
+        with clibevresp_lock:
+            # Set global variables
+            if self.resource_id:
+                clibevresp.curr_file.value = \
+                    self.resource_id.encode('utf-8')
+            else:
+                clibevresp.curr_file.value = None
 
-        try:
-            rc = clibevresp._obspy_check_channel(C.byref(chan))
-            if rc:
-                e, m = ew.ENUM_ERROR_CODES[rc]
-                raise e('check_channel: ' + m)
-
-            rc = clibevresp._obspy_norm_resp(C.byref(chan), -1, 0)
-            if rc:
-                e, m = ew.ENUM_ERROR_CODES[rc]
-                raise e('norm_resp: ' + m)
-
-            rc = clibevresp._obspy_calc_resp(C.byref(chan), freqs, len(freqs),
-                                             output, out_units, -1, 0, 0)
-            if rc:
-                e, m = ew.ENUM_ERROR_CODES[rc]
-                raise e('calc_resp: ' + m)
-
-            # XXX: Check if this is really not needed.
-            # output *= scale_factor[0]
-
-        finally:
-            clibevresp.curr_file.value = None
+            try:
+                rc = clibevresp._obspy_check_channel(C.byref(chan))
+                if rc:
+                    e, m = ew.ENUM_ERROR_CODES[rc]
+                    raise e('check_channel: ' + m)
+
+                rc = clibevresp._obspy_norm_resp(C.byref(chan), -1, 0)
+                if rc:
+                    e, m = ew.ENUM_ERROR_CODES[rc]
+                    raise e('norm_resp: ' + m)
+
+                rc = clibevresp._obspy_calc_resp(C.byref(chan), freqs,
+                                                 len(freqs), output,
+                                                 out_units, -1, 0, 0)
+                if rc:
+                    e, m = ew.ENUM_ERROR_CODES[rc]
+                    raise e('calc_resp: ' + m)
+
+                # XXX: Check if this is really not needed.
+                # output *= scale_factor[0]
+
+            finally:
+                clibevresp.curr_file.value = None
 
         return output, freqs
 
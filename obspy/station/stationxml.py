@@ -13,6 +13,8 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
 
+import fnmatch
+import gzip
 import inspect
 import io
 from lxml import etree
@@ -36,6 +38,9 @@ SOFTWARE_MODULE = "ObsPy %s" % obspy.__version__
 SOFTWARE_URI = "http://www.obspy.org"
 SCHEMA_VERSION = "1.0"
 
+# Levels of detail when reading StationXML files.
+LEVELS = ["network", "station", "channel", "response"]
+
 
 def is_StationXML(path_or_file_object):
     """
@@ -83,16 +88,149 @@ def validate_StationXML(path_or_object):
     return (True, ())
 
 
-def read_StationXML(path_or_file_object):
+def read_StationXML(path_or_file_object, level="response", network=None,
+                    station=None, location=None, channel=None,
+                    starttime=None, endtime=None):
     """
     Function reading a StationXML file.
 
-    :param path_or_file_object: File name or file like object.
+    The file is parsed incrementally. Every channel, station and network is
+    converted to an object as soon as its element is complete and the
+    element is freed afterwards, so the memory used does not depend on the
+    size of the file. Elements not matching the given level and criteria
+    are skipped without creating any objects.
+
+    Networks/stations are omitted if criteria for stations/channels are
+    given and none of their stations/channels match, even if these are not
+    read because of the level.
+
+    .. note::
+        Pass ``format="STATIONXML"`` to
+        :func:`~obspy.station.inventory.read_inventory` to skip the format
+        detection, it validates the whole file in memory.
+
+    :param path_or_file_object: File name or file like object. Files may be
+        gzip compressed.
+    :type level: str
+    :param level: Level of detail to read, one of ``"network"``,
+        ``"station"``, ``"channel"`` or ``"response"`` (default).
+    :type network: str
+    :param network: Only read networks with matching codes.
+    :type station: str
+    :param station: Only read stations with matching codes.
+    :type location: str
+    :param location: Only read channels with matching location codes.
+    :type channel: str
+    :param channel: Only read channels with matching codes.
+    :type starttime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+    :param starttime: Only read networks/stations/channels active at or
+        after given point in time.
+    :type endtime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+    :param endtime: Only read networks/stations/channels active before or
+        at given point in time.
+
+    The codes may contain UNIX style wildcards as in
+    :meth:`~obspy.station.inventory.Inventory.select`.
+
+    .. rubric:: Example
+
+    >>> from obspy import read_inventory
+    >>> inv = read_inventory("/path/to/BW_GR_misc.xml.gz",
+    ...                      format="STATIONXML", level="channel",
+    ...                      station="W*", channel="?HZ")
+    >>> print(inv.get_contents()["channels"])  # doctest: +ELLIPSIS
+    ['GR.WET..BHZ', 'GR.WET..HHZ', 'GR.WET..LHZ']
+    >>> print(inv[0][0][0].response)
+    None
     """
-    root = etree.parse(path_or_file_object).getroot()
-    namespace = root.nsmap[None]
-
-    _ns = lambda tagname: "{%s}%s" % (namespace, tagname)
+    level = level.lower()
+    if level not in LEVELS:
+        msg = "level must be one of %s." % ", ".join(LEVELS)
+        raise ValueError(msg)
+    depth = LEVELS.index(level)
+
+    def _matches(element, code, pattern):
+        if pattern is not None and not fnmatch.fnmatch(
+                (element.get(code) or "").strip().upper(), pattern.upper()):
+            return False
+        if starttime is not None:
+            end_date = _attr2obj(element, "endDate", obspy.UTCDateTime)
+            if end_date is not None and starttime > end_date:
+                return False
+        if endtime is not None:
+            start_date = _attr2obj(element, "startDate", obspy.UTCDateTime)
+            if start_date is not None and endtime < start_date:
+                return False
+        return True
+
+    def _free(element):
+        element.clear()
+        parent = element.getparent()
+        if parent is not None:
+            parent.remove(element)
+
+    file_object = path_or_file_object
+    if not hasattr(path_or_file_object, "read"):
+        file_object = open(path_or_file_object, "rb")
+        if file_object.read(2) == b"\x1f\x8b":
+            file_object.close()
+            file_object = gzip.open(path_or_file_object, "rb")
+        else:
+            file_object.seek(0)
+    try:
+        root = _ns = None
+        networks = []
+        for event, element in etree.iterparse(file_object,
+                                              events=("start", "end")):
+            if root is None:
+                root = element
+                namespace = root.nsmap[None]
+                _ns = lambda tagname: "{%s}%s" % (namespace, tagname)
+                tags = dict((name, _ns(name)) for name in (
+                    "Network", "Station", "Channel", "Response"))
+            tag = element.tag
+            if event == "start":
+                if tag == tags["Network"]:
+                    net_ok = _matches(element, "code", network)
+                    stations, has_station = [], False
+                elif tag == tags["Station"]:
+                    sta_ok = net_ok and _matches(element, "code", station)
+                    channels, has_channel = [], False
+                elif tag == tags["Channel"]:
+                    cha_ok = sta_ok and \
+                        _matches(element, "locationCode", location) and \
+                        _matches(element, "code", channel)
+                    has_channel = has_channel or cha_ok
+                continue
+            if tag == tags["Response"]:
+                # read with the channel
+                if not cha_ok or depth < 3:
+                    _free(element)
+            elif tag == tags["Channel"]:
+                if cha_ok and depth >= 2:
+                    channels.append(_read_channel(element, _ns))
+                _free(element)
+            elif tag == tags["Station"]:
+                if sta_ok and (has_channel or
+                               location is None and channel is None):
+                    has_station = True
+                    if depth >= 1:
+                        # the channel elements are already removed
+                        sta = _read_station(element, _ns)
+                        sta.channels = channels
+                        stations.append(sta)
+                _free(element)
+            elif tag == tags["Network"]:
+                if net_ok and (has_station or station is None and
+                               location is None and channel is None):
+                    # the station elements are already removed
+                    net = _read_network(element, _ns)
+                    net.stations = stations
+                    networks.append(net)
+                _free(element)
+    finally:
+        if file_object is not path_or_file_object:
+            file_object.close()
 
     # Source and Created field must exist in a StationXML.
     source = root.find(_ns("Source")).text
@@ -103,10 +241,6 @@ def read_StationXML(path_or_file_object):
     module = _tag2obj(root, _ns("Module"), str)
     module_uri = _tag2obj(root, _ns("ModuleURI"), str)
 
-    networks = []
-    for network in root.findall(_ns("Network")):
-        networks.append(_read_network(network, _ns))
-
     inv = obspy.station.Inventory(networks=networks, source=source,
                                   sender=sender, created=created,
                                   module=module, module_uri=module_uri)
@@ -13,6 +13,7 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
 
+import copy
 import unittest
 import os
 import numpy as np
@@ -143,6 +144,76 @@ class InventoryTestCase(unittest.TestCase):
         # 3 - unknown SEED ID should raise exception
         self.assertRaises(Exception, inv.get_coordinates, 'BW.RJOB..XXX')
 
+    def test_lookup_index(self):
+        """
+        Lookups use an index of all channel epochs which is rebuilt after
+        the inventory was changed.
+        """
+        def channel(code, start, end, response):
+            return Channel(code=code, location_code='', latitude=0.0,
+                           longitude=0.0, elevation=0.0, depth=0.0,
+                           start_date=start, end_date=end,
+                           response=Response(response))
+
+        t1 = UTCDateTime(2000, 1, 1)
+        t2 = UTCDateTime(2005, 1, 1)
+        t3 = UTCDateTime(2010, 1, 1)
+        # epochs are not sorted by time
+        channels = [channel('BHZ', t2, t3, 'B'), channel('BHZ', t1, t2, 'A'),
+                    channel('BHZ', t3, None, 'C'), channel('HHZ', t1, t3, 'H')]
+        station = Station(code='ABC', latitude=0.0, longitude=0.0,
+                          elevation=0.0, channels=channels)
+        inv = Inventory(networks=[Network('XX', stations=[station])],
+                        source='TEST')
+        for time, expected in ((t1 + 10, 'A'), (t2 + 10, 'B'),
+                               (t3 + 10, 'C'), (UTCDateTime(), 'C')):
+            response = inv.get_response('XX.ABC..BHZ', time)
+            self.assertEqual(response.resource_id, expected)
+        # end dates are inclusive
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            response = inv.get_response('XX.ABC..BHZ', t2)
+        self.assertEqual(response.resource_id, 'B')
+        self.assertEqual(len(w), 1)
+        self.assertRaises(Exception, inv.get_response, 'XX.ABC..BHZ',
+                          t1 - 10)
+        self.assertRaises(Exception, inv.get_response, 'XX.ABC..HHZ',
+                          t3 + 10)
+        index = inv._get_index()
+        self.assertTrue(inv._get_index() is index)
+        # select keeps the order of the channels
+        selected = inv.select(channel='BHZ', starttime=t2 + 10)
+        self.assertEqual(
+            [cha.response.resource_id for cha in selected[0][0]], ['B', 'C'])
+        self.assertEqual(
+            len(inv.select(channel='?HZ', endtime=t1 + 10)[0][0].channels), 2)
+        self.assertEqual(inv.select(station='X*').networks, [])
+        self.assertTrue(inv._get_index() is index)
+        # changed epochs and codes
+        channels[2].end_date = t3 + 100
+        self.assertRaises(Exception, inv.get_response, 'XX.ABC..BHZ',
+                          t3 + 1000)
+        channels[3].location_code = '00'
+        response = inv.get_response('XX.ABC.00.HHZ', t2)
+        self.assertEqual(response.resource_id, 'H')
+        # added channels, stations and networks
+        channels.append(channel('LHZ', t1, None, 'L'))
+        response = inv.get_response('XX.ABC..LHZ', t2)
+        self.assertEqual(response.resource_id, 'L')
+        station = Station(code='DEF', latitude=0.0, longitude=0.0,
+                          elevation=0.0, channels=[channel('BHZ', t1, None,
+                                                           'D')])
+        inv[0].stations.append(station)
+        response = inv.get_response('XX.DEF..BHZ', t2)
+        self.assertEqual(response.resource_id, 'D')
+        inv += Network('YY', stations=[station])
+        response = inv.get_response('YY.DEF..BHZ', t2)
+        self.assertEqual(response.resource_id, 'D')
+        station.channels = []
+        self.assertRaises(Exception, inv.get_response, 'YY.DEF..BHZ', t2)
+        # the index is not part of copies and comparisons
+        self.assertEqual(copy.deepcopy(inv), inv)
+
     @skipIf(not (HAS_COMPARE_IMAGE and HAS_BASEMAP),
             'nose not installed, matplotlib too old or basemap not installed')
     def test_location_plot_cylindrical(self):
@@ -13,11 +13,13 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
 
+from copy import deepcopy
 import inspect
 import numpy as np
 from math import pi
 from obspy import UTCDateTime
-from obspy.signal.invsim import evalresp
+from obspy.signal.invsim import evalresp, responseCacheInfo, \
+    clearResponseCache
 from obspy.station import read_inventory
 from obspy.xseed import Parser
 from obspy.station.response import _pitick2latex
@@ -162,6 +164,26 @@ class ResponseTest(unittest.TestCase):
                               inv[0][0][0].response.get_evalresp_response,
                               t_samp, nfft, output="DISP")
 
+    def test_evalresp_cache(self):
+        """
+        Identical responses are only evaluated once for the same sampling
+        interval, number of FFT points and output units.
+        """
+        clearResponseCache()
+        resp = read_inventory()[0][0][0].response
+        resp2 = deepcopy(resp)
+        h, f = resp.get_evalresp_response(0.01, 1024, output="VEL")
+        h2, f2 = resp2.get_evalresp_response(0.01, 1024, output="VEL")
+        np.testing.assert_array_equal(h, h2)
+        np.testing.assert_array_equal(f, f2)
+        self.assertEqual(responseCacheInfo()['hits'], 1)
+        resp2.get_evalresp_response(0.01, 1024, output="ACC")
+        resp2.response_stages[0].stage_gain *= 2
+        resp2.get_evalresp_response(0.01, 1024, output="VEL")
+        info = responseCacheInfo()
+        self.assertEqual((info['hits'], info['misses']), (1, 3))
+        clearResponseCache()
+
 
 def suite():
     return unittest.makeSuite(ResponseTest, 'test')
@@ -622,6 +622,56 @@ class StationXMLTestCase(unittest.TestCase):
         self._assert_station_xml_equality(file_buffer,
                                           expected_xml_file_buffer)
 
+    def test_reading_levels_and_selection(self):
+        """
+        Reading only parts of a StationXML file gives the same result as
+        selecting them after reading the whole file.
+        """
+        filename = os.path.join(self.data_dir, "BW_GR_misc.xml.gz")
+        full = obspy.station.read_inventory(filename, format="stationxml")
+        # file objects work as well
+        with open(os.path.join(self.data_dir, "BW_RJOB.xml"), "rb") as fh:
+            inv = obspy.station.read_inventory(fh, format="stationxml")
+        self.assertEqual(inv.get_contents()["stations"],
+                         ["BW.RJOB (Jochberg, Bavaria, BW-Net)"])
+
+        t = obspy.UTCDateTime(2007, 7, 1)
+        kwargs = dict(network="?W", channel="EH[ZN]", starttime=t,
+                      endtime=t + 86400)
+        expected = full.select(**kwargs)
+        inv = obspy.station.read_inventory(filename, format="stationxml",
+                                           **kwargs)
+        self.assertEqual(inv.networks, expected.networks)
+        self.assertEqual(inv.get_contents()["channels"],
+                         ["BW.RJOB..EHN", "BW.RJOB..EHZ"])
+        self.assertTrue(inv[0][0][0].response is not None)
+
+        inv = obspy.station.read_inventory(filename, format="stationxml",
+                                           level="channel", **kwargs)
+        self.assertEqual(inv.get_contents(), expected.get_contents())
+        self.assertTrue(inv[0][0][0].response is None)
+        self.assertEqual(inv[0][0][0].code, expected[0][0][0].code)
+
+        inv = obspy.station.read_inventory(filename, format="stationxml",
+                                           level="station", **kwargs)
+        self.assertEqual(inv.get_contents()["stations"],
+                         expected.get_contents()["stations"])
+        self.assertEqual(inv.get_contents()["channels"], [])
+
+        # networks and stations without matching channels are omitted
+        inv = obspy.station.read_inventory(filename, format="stationxml",
+                                           level="network", channel="LH?")
+        self.assertEqual([net.code for net in inv], ["GR"])
+        self.assertEqual(inv[0].stations, [])
+        inv = obspy.station.read_inventory(filename, format="stationxml",
+                                           level="network")
+        self.assertEqual([net.code for net in inv], ["GR", "BW"])
+        self.assertEqual(inv.source, full.source)
+        self.assertEqual(inv.created, full.created)
+
+        self.assertRaises(ValueError, obspy.station.read_inventory,
+                          filename, format="stationxml", level="stage")
+
 
 def suite():
     return unittest.makeSuite(StationXMLTestCase, "test")
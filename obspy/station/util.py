@@ -29,6 +29,10 @@ class BaseNode(ComparingObject):
 
     The parent class for the network, station and channel classes.
     """
+    # number of changes of the codes and epochs of all networks, stations
+    # and channels, lookup indices built before a change are rebuilt
+    _modification_count = 0
+
     def __init__(self, code, description=None, comments=None, start_date=None,
                  end_date=None, restricted_status=None, alternate_code=None,
                  historical_code=None):
@@ -72,6 +76,25 @@ class BaseNode(ComparingObject):
             msg = "A Code is required"
             raise ValueError(msg)
         self._code = str(value).strip()
+        BaseNode._modification_count += 1
+
+    @property
+    def start_date(self):
+        return self._start_date
+
+    @start_date.setter
+    def start_date(self, value):
+        self._start_date = value
+        BaseNode._modification_count += 1
+
+    @property
+    def end_date(self):
+        return self._end_date
+
+    @end_date.setter
+    def end_date(self, value):
+        self._end_date = value
+        BaseNode._modification_count += 1
 
     @property
     def alternate_code(self):